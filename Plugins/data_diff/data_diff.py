@@ -1,8 +1,10 @@
 PLUGIN_NAME = "Data Diff"
-PLUGIN_VERSION = "1.8"
+PLUGIN_VERSION = "1.10"
 PLUGIN_DESCRIPTION = "Porównuje dwa foldery data: TXT (diff), JSON, sprite, filtry, popupy"
 PLUGIN_AUTHOR = "Precell & ChatGPT"
 PLUGIN_OK = True
+PLUGIN_MENU = "Pluginy"
+PLUGIN_ACTION = "Data Diff"
 
 import os
 import struct
@@ -14,6 +16,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QSettings
 from PyQt5.QtGui import QColor
 
+from jobs import job_service
 from diff_txt_popup import DiffTextPopup
 from diff_json_popup import DiffJsonPopup
 from diff_sprite_popup import SpriteDiffPopup
@@ -29,7 +32,12 @@ DIFF_COLOR_NUMBER = "#bbbbbb"
 COLOR_ORG_DIFF = QColor("#8a2121")
 COLOR_MOD_DIFF = QColor("#26712b")
 
+def run_plugin(main_window):
+    # Wywoływane przy pierwszym (i każdym kolejnym) kliknięciu akcji w menu
+    show_data_diff_dialog(main_window)
+
 def register_plugin(main_window):
+    # Dla starszych loaderów, które importują wtyczki przy starcie
     if hasattr(main_window, "plugins_menu"):
         main_window.plugins_menu.addAction(
             PLUGIN_NAME,
@@ -76,6 +84,9 @@ class DataDiffDialog(QDialog):
         self.setMinimumSize(1000, 620)
         layout = QVBoxLayout(self)
 
+        # Porównanie folderów idzie w tle, we wspólnej puli zadań programu
+        self.jobs = getattr(parent, "jobs", None) or job_service()
+        self.compare_task = None
         self.settings = QSettings("d2rtools", "data_diff_plugin")
         self.org_folder = self.settings.value("org_folder", "")
         self.mod_folder = self.settings.value("mod_folder", "")
@@ -96,6 +107,9 @@ class DataDiffDialog(QDialog):
         folder_row.addWidget(self.lbl_mod)
         layout.addLayout(folder_row)
 
+        self.lbl_status = QLabel("")
+        layout.addWidget(self.lbl_status)
+
         self.btn_org.clicked.connect(self.choose_org)
         self.btn_mod.clicked.connect(self.choose_mod)
 
@@ -199,9 +213,32 @@ class DataDiffDialog(QDialog):
             )
 
     def try_compare(self):
-        self.all_changes = compare_data_folders(self.org_folder, self.mod_folder)
+        if self.compare_task is not None:
+            self.compare_task.cancel()
+        self.lbl_status.setText("Porównywanie folderów...")
+        org_folder, mod_folder = self.org_folder, self.mod_folder
+
+        def work(task):
+            return compare_data_folders(org_folder, mod_folder, task.is_cancelled)
+        task = self.jobs.create(work, "Data Diff", parent=self)
+        task.done.connect(lambda changes, t=task: self.on_compare_finished(t, changes))
+        task.failed.connect(lambda msg: self.lbl_status.setText(f"Błąd porównania: {msg}"))
+        self.compare_task = task
+        task.start()
+
+    def on_compare_finished(self, task, changes):
+        if task is not self.compare_task:
+            return
+        self.compare_task = None
+        self.lbl_status.setText(f"Różnic: {len(changes)}")
+        self.all_changes = changes
         self.apply_filters()
 
+    def done(self, result):
+        if self.compare_task is not None:
+            self.compare_task.cancel()
+        super().done(result)
+
     def apply_filters(self):
         typ = self.type_filter.currentText()
         ext = self.ext_filter.currentText()
@@ -293,7 +330,7 @@ class DataDiffDialog(QDialog):
             ).exec_()
             return
 
-def compare_data_folders(org_folder, mod_folder):
+def compare_data_folders(org_folder, mod_folder, is_cancelled=None):
     changes = []
     org_files = {}
     mod_files = {}
@@ -306,6 +343,8 @@ def compare_data_folders(org_folder, mod_folder):
             rel = os.path.relpath(os.path.join(root, f), mod_folder)
             mod_files[rel] = os.path.join(root, f)
     for rel_path, mod_path in mod_files.items():
+        if is_cancelled and is_cancelled():
+            return changes
         if rel_path not in org_files:
             changes.append(("Nowy plik", rel_path, ""))
         else:
@@ -1,4 +1,3 @@
-import json
 import os
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QSplitter, QWidget,
@@ -8,13 +7,15 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QRect, QSize
 from PyQt5.QtGui import QColor, QPainter, QFont, QTextFormat, QTextCursor, QTextDocument
 
+import json_codec
+from document_cache import document_cache
+
 def read_json_lines(filename):
     if not filename or not os.path.isfile(filename):
         return ["(Brak pliku)"]
     try:
-        with open(filename, "r", encoding="utf-8-sig") as f:
-            data = json.load(f)
-        text = json.dumps(data, ensure_ascii=False, indent=2)
+        data = document_cache.json(filename)
+        text = json_codec.dumps(data, ensure_ascii=False, indent=2)
         return text.splitlines()
     except Exception as e:
         return [f"(Błąd wczytywania JSON: {e})"]
@@ -8,6 +8,11 @@ from PyQt5.QtGui import QColor, QFont
 from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSignal, pyqtSlot
 import re
 
+from jobs import job_service, JobCancelled, PRIORITY_HIGH
+from disk_cache import disk_cache
+
+TXT_DISK_KIND = "txt-diff-1"
+
 DIFF_COLOR_CHANGED_BG = QColor(255, 255, 0)       # Żółty - zmiana komórki
 DIFF_COLOR_REMOVED_BG = QColor(255, 100, 100)     # Czerwony - usunięta/dodana linia
 DIFF_COLOR_DEFAULT_BG = QColor(255, 255, 255)     # Biały - brak zmian
@@ -20,6 +25,7 @@ def load_txt_as_list(path, progress_callback=None, label_callback=None):
     """
     Wczytuje plik tekstowy do listy list.
     Każdy wiersz pliku staje się listą pól rozdzielonych tabulatorami.
+    Wynik pochodzi z cache na dysku, jeśli plik się nie zmienił.
     
     Args:
         path: Ścieżka do pliku lub None.
@@ -29,16 +35,21 @@ def load_txt_as_list(path, progress_callback=None, label_callback=None):
     Returns:
         Lista list zawierająca dane z pliku, lub pusta lista jeśli path jest None.
     """
-    data = []
     # Dodanie zabezpieczenia przed None
     if path is None:
-        return data
-        
+        return []
+    return disk_cache.load(path, TXT_DISK_KIND,
+                           lambda p: _parse_txt_as_list(p, progress_callback, label_callback))
+
+def _parse_txt_as_list(path, progress_callback=None, label_callback=None):
     encodings = ['utf-8-sig', 'utf-8', 'cp1252', 'iso-8859-1']
-    line_count = 0
     size = os.path.getsize(path)
-    read_bytes = 0
+    error = None
     for encoding in encodings:
+        # Każde kodowanie od zera – bez wierszy z poprzedniej, nieudanej próby
+        data = []
+        line_count = 0
+        read_bytes = 0
         try:
             with open(path, encoding=encoding) as f:
                 for line in f:
@@ -54,8 +65,12 @@ def load_txt_as_list(path, progress_callback=None, label_callback=None):
                         if label_callback:
                             label_callback(f"Wczytywanie pliku: {os.path.basename(path)} ({line_count} linii)")
             break
-        except Exception:
-            continue
+        except JobCancelled:
+            raise  # przerwany odczyt nie może trafić do cache
+        except Exception as e:
+            error = e
+    else:
+        raise ValueError(f"Nie udało się wczytać pliku {os.path.basename(path)}: {error}")
     if data:
         header_len = len(data[0])
         for i in range(len(data)):
@@ -144,40 +159,41 @@ class LoadingDialog(QDialog):
         self.loaded_org = None
         self.loaded_mod = None
 
-        QTimer.singleShot(100, self.load_files)
-
-    def update_progress(self, value, total):
-        percent = int(100 * value / total) if total > 0 else 0
-        self.progress.setValue(percent)
-        QApplication.processEvents()
-
-    def update_label(self, txt):
-        self.info_label.setText(txt)
-        QApplication.processEvents()
-
-    def load_files(self):
-        # Wczytywanie pliku oryginalnego, jeśli istnieje
-        if self.org_file is not None:
-            self.update_label(f"Wczytywanie pliku oryginalnego: {os.path.basename(self.org_file)}")
-            self.update_progress(0, 1)
-            self.loaded_org = load_txt_as_list(self.org_file, self.update_progress, self.update_label)
-            self.update_progress(100, 100)
-        else:
-            self.update_label("Brak pliku oryginalnego")
-            self.loaded_org = []
-
-        # Wczytywanie pliku zmodyfikowanego, jeśli istnieje
-        if self.mod_file is not None:
-            self.update_label(f"Wczytywanie pliku zmodyfikowanego: {os.path.basename(self.mod_file)}")
-            self.update_progress(0, 1)
-            self.loaded_mod = load_txt_as_list(self.mod_file, self.update_progress, self.update_label)
-            self.update_progress(100, 100)
-        else:
-            self.update_label("Brak pliku zmodyfikowanego")
-            self.loaded_mod = []
-            
+        # Wczytywanie w tle (wspólna pula programu) – okno odświeża się samo
+        self.task = job_service().create(self.load_files, "Wczytywanie TXT", PRIORITY_HIGH, self)
+        self.task.progress.connect(self.progress.setValue)
+        self.task.partial.connect(self.info_label.setText)
+        self.task.done.connect(self.on_loaded)
+        self.task.failed.connect(lambda msg: self.info_label.setText(f"Błąd wczytywania: {msg}"))
+        self.task.start()
+
+    def load_files(self, task):
+        """Wykonywane w wątku zadania – z oknem rozmawia tylko przez sygnały."""
+        def update_progress(value, total):
+            task.check_cancelled()
+            task.progress.emit(int(100 * value / total) if total > 0 else 0)
+
+        loaded = []
+        for path, what in ((self.org_file, "oryginalnego"), (self.mod_file, "zmodyfikowanego")):
+            if path is None:
+                task.partial.emit(f"Brak pliku {what}")
+                loaded.append([])
+                continue
+            task.partial.emit(f"Wczytywanie pliku {what}: {os.path.basename(path)}")
+            task.progress.emit(0)
+            loaded.append(load_txt_as_list(path, update_progress, task.partial.emit))
+            task.check_cancelled()
+            task.progress.emit(100)
+        return loaded
+
+    def on_loaded(self, loaded):
+        self.loaded_org, self.loaded_mod = loaded
         self.accept()
 
+    def reject(self):
+        self.task.cancel()
+        super().reject()
+
 class TableModel(QAbstractTableModel):
     def __init__(self, data_rows, headers, compare_rows=None, only_diff=False, 
                  search_text="", whole_words=False, parent=None):
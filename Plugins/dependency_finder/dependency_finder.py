@@ -1,22 +1,75 @@
 PLUGIN_NAME = "Znajdź zależności"
-PLUGIN_VERSION = "1.3"
+PLUGIN_VERSION = "1.9"
 PLUGIN_DESCRIPTION = "Skanuje folder moda (.mpq) i wyszukuje po ID/Key we wszystkich plikach JSON oraz TXT. Zapamiętuje ostatnio używany mod. Wyniki pokazują nr linii!"
 PLUGIN_AUTHOR = "Precell i ChatGPT"
 PLUGIN_OK = True
+PLUGIN_MENU = "Opcje"
+PLUGIN_ACTION = "Znajdź zależności w modzie"
 
 from PyQt5.QtWidgets import QMenuBar, QAction
 import os
-import json
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QLineEdit, QPushButton, QLabel, QListWidget, QListWidgetItem, QHBoxLayout, QFileDialog, QMessageBox
+    QDialog, QVBoxLayout, QLineEdit, QPushButton, QLabel, QListWidget, QListWidgetItem, QHBoxLayout, QFileDialog, QMessageBox,
+    QSpinBox
 )
 from PyQt5.QtCore import Qt, QSettings
 
+from document_cache import document_cache
+from id_index import id_index
+from jobs import job_service, PRIORITY_HIGH, PRIORITY_LOW
+from strings_lint import STRINGS_DIR, find_strings_files
+
+# Indeks id/Key (id_index) zbudowany dla folderu moda. Gdy to folder otwarty
+# w programie, program sam aktualizuje w nim zmienione pliki, a zdarzenia
+# (main_window.events) mówią, czy to wciąż ten folder – kolejne otwarcia
+# okna nie przeglądają folderu od nowa.
+_warm = {"folder": None, "dialog": None, "events": None}
+
+def _same_folder(a, b):
+    return bool(a and b) and os.path.normcase(os.path.normpath(a)) == os.path.normcase(os.path.normpath(b))
+
+def _is_strings_file(folder, path):
+    # Jak find_strings_files: JSON w local/lng/strings albo w samym folderze moda
+    directory = os.path.dirname(path)
+    return path.lower().endswith(".json") and (directory.endswith(STRINGS_DIR) or _same_folder(directory, folder))
+
+def _watch_events(main_window):
+    events = getattr(main_window, "events", None)  # starsze wersje programu nie mają zdarzeń
+    if events is None or _warm["events"] is events:
+        return
+    from event_bus import FolderChanged
+    _warm["events"] = events
+    events.subscribe(FolderChanged, _on_folder_changed)
+
+def _on_folder_changed(event):
+    folder = _warm["folder"]
+    if folder is None:
+        return
+    if not _same_folder(event.folder, folder):
+        _warm["folder"] = None  # inny folder w programie – zmiany nie są już widoczne
+        return
+    # id_index aktualizuje sam program (MainWindow.on_files_changed) – tu
+    # tylko odświeżenie stanu w otwartym oknie
+    if event.paths is None:
+        return
+    prefix = os.path.normpath(folder) + os.sep
+    if any(p.startswith(prefix) and _is_strings_file(folder, p) for p in event.paths):
+        _index_updated()
+
+def _index_updated():
+    dialog = _warm["dialog"]
+    if dialog is not None:
+        dialog.update_index_status()
+
 class DependencyFinderDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Znajdź zależności w modzie")
         self.setMinimumWidth(620)
+        # Wspólna pula zadań programu (starsze wersje nie mają main_window.jobs)
+        self.jobs = getattr(parent, "jobs", None) or job_service()
+        self.main_window = parent
+        self.search_task = None
 
         layout = QVBoxLayout(self)
 
@@ -59,17 +112,124 @@ class DependencyFinderDialog(QDialog):
         self.results_list.setSelectionMode(QListWidget.ExtendedSelection)
         layout.addWidget(self.results_list)
 
+        # Indeks id/Key wszystkich plików strings – sprawdzanie od razu przy wpisywaniu
+        self.index_label = QLabel("")
+        layout.addWidget(self.index_label)
+        index_row = QHBoxLayout()
+        self.range_spin = QSpinBox()
+        self.range_spin.setRange(1, 100000)
+        self.range_spin.setPrefix("Ile id: ")
+        index_row.addWidget(self.range_spin)
+        self.free_btn = QPushButton("Następny wolny zakres")
+        self.free_btn.clicked.connect(self.show_free_range)
+        index_row.addWidget(self.free_btn)
+        self.duplicates_btn = QPushButton("Duplikaty id/Key")
+        self.duplicates_btn.clicked.connect(self.show_duplicates)
+        index_row.addWidget(self.duplicates_btn)
+        layout.addLayout(index_row)
+        self.id_input.textChanged.connect(self.update_index_status)
+        self.key_input.textChanged.connect(self.update_index_status)
+        self.index_ready = False
+        self.index_task = None
+        _warm["dialog"] = self
+        self.refresh_index()
+
     def choose_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Wybierz folder moda (.mpq)")
         if folder and folder.lower().endswith('.mpq'):
             self.mod_folder = folder
             self.settings.setValue("last_mod_folder", folder)
             self.folder_label.setText(f"Mod: <b>{os.path.basename(folder)}</b>")
+            self.refresh_index()
         else:
             QMessageBox.warning(self, "Błąd", "Folder nie ma rozszerzenia .mpq!")
             self.mod_folder = None
             self.folder_label.setText("Brak wybranego folderu moda")
 
+    def refresh_index(self):
+        """Buduje/odświeża indeks w tle – czytane są tylko zmienione pliki."""
+        if not self.mod_folder:
+            self.index_label.setText("")
+            return
+        if self.index_task is not None:
+            self.index_task.cancel()
+        if _same_folder(_warm["folder"], self.mod_folder):
+            self.index_ready = True  # aktualny dzięki zdarzeniom programu
+            self.update_index_status()
+            return
+        _warm["folder"] = None
+        self.index_ready = False
+        self.index_label.setText("Indeksowanie id/Key...")
+        folder = self.mod_folder
+
+        def work(task):
+            id_index.refresh(find_strings_files(folder), task.is_cancelled)
+        task = self.jobs.create(work, "Indeks id/Key", PRIORITY_LOW, self)
+        task.done.connect(lambda _, t=task: self.on_index_ready(t))
+        task.failed.connect(lambda msg: self.index_label.setText(f"Błąd indeksu: {msg}"))
+        self.index_task = task
+        task.start()
+
+    def on_index_ready(self, task):
+        if task is not self.index_task:
+            return
+        self.index_task = None
+        self.index_ready = True
+        if _warm["events"] is not None and _same_folder(getattr(self.main_window, "folder", None), self.mod_folder):
+            _warm["folder"] = self.mod_folder
+        self.update_index_status()
+
+    def _where(self, places):
+        return ", ".join(
+            f"{os.path.relpath(path, self.mod_folder)} [wpis {row + 1}]" for path, row in places
+        )
+
+    def update_index_status(self):
+        if not self.index_ready:
+            return
+        parts = []
+        search_id = self.id_input.text().strip()
+        search_key = self.key_input.text().strip()
+        if search_id:
+            entry_id = int(search_id) if search_id.isdigit() else search_id
+            parts.append(f"ID {search_id}: {'zajęte' if id_index.is_id_used(entry_id) else 'wolne'}")
+        if search_key:
+            parts.append(f"Key {search_key}: {'zajęty' if id_index.is_key_used(search_key) else 'wolny'}")
+        if not parts:
+            parts.append(f"Zindeksowano plików strings: {len(id_index.files)}")
+        self.index_label.setText(" | ".join(parts))
+
+    def show_free_range(self):
+        if not self.index_ready:
+            return
+        count = self.range_spin.value()
+        start = id_index.next_free_range(count)
+        self.results_list.clear()
+        self.result_label.setText(f"Wolne id: {start} – {start + count - 1}")
+        self.id_input.setText(str(start))
+
+    def show_duplicates(self):
+        if not self.index_ready:
+            return
+        self.results_list.clear()
+        duplicate_ids = id_index.duplicate_ids()
+        duplicate_keys = id_index.duplicate_keys()
+        self.result_label.setText(
+            f"Duplikaty: id – {len(duplicate_ids)}, Key – {len(duplicate_keys)}"
+        )
+        for entry_id in duplicate_ids:
+            self.results_list.addItem(QListWidgetItem(f"id {entry_id}: {self._where(id_index.locate_id(entry_id))}"))
+        for key in duplicate_keys:
+            self.results_list.addItem(QListWidgetItem(f"Key {key}: {self._where(id_index.locate_key(key))}"))
+
+    def done(self, result):
+        if self.index_task is not None:
+            self.index_task.cancel()
+        if _warm["dialog"] is self:
+            _warm["dialog"] = None
+        self.cancel_search()
+        super().done(result)
+
     def do_search(self):
         self.results_list.clear()
         self.result_label.setText("")
@@ -82,63 +242,122 @@ class DependencyFinderDialog(QDialog):
             self.result_label.setText("Wpisz ID lub Key (lub oba) do wyszukania!")
             return
 
-        found = []
-        for root, dirs, files in os.walk(self.mod_folder):
-            for filename in files:
-                path = os.path.join(root, filename)
-                rel_path = os.path.relpath(path, self.mod_folder)
-                # JSON — teraz 100% pewne szukanie numeru linii!
-                if filename.lower().endswith(".json"):
-                    try:
-                        with open(path, encoding="utf-8-sig") as f:
-                            text_lines = f.readlines()
-                        with open(path, encoding="utf-8-sig") as f:
-                            data = json.load(f)
-                        for i, entry in enumerate(data):
-                            match = False
-                            idstr = str(entry.get("id", ""))
-                            keystr = str(entry.get("Key", ""))
-                            if search_id and idstr == search_id:
-                                match = True
-                            if search_key and keystr == search_key:
-                                match = True
-                            if match:
-                                # Szukaj linii zawierającej id lub key
-                                line_no = "?"
-                                search_terms = []
-                                if search_id:
-                                    search_terms.append(f'"id": {idstr}')
-                                if search_key:
-                                    search_terms.append(f'"Key": "{keystr}"')
-                                for idx, line in enumerate(text_lines):
-                                    if any(term in line for term in search_terms):
-                                        line_no = idx + 1
-                                        break
-                                found.append(f"{rel_path} [JSON, linia {line_no}]")
-                    except Exception:
-                        continue
-
-                # TXT
-                if filename.lower().endswith(".txt"):
-                    try:
-                        with open(path, encoding="utf-8") as f:
-                            for idx, line in enumerate(f, 1):
-                                if (search_id and search_id in line) or (search_key and search_key in line):
-                                    found.append(f"{rel_path} [TXT, linia {idx}]")
-                    except Exception:
-                        continue
-
-        if not found:
+        self.cancel_search()
+        self.search_btn.setEnabled(False)
+        self.result_label.setText("Szukanie...")
+        folder = self.mod_folder
+
+        def work(task):
+            count = 0
+            for item in find_dependencies(folder, search_id, search_key, task.is_cancelled):
+                task.partial.emit(item)
+                count += 1
+            return count
+        task = self.jobs.create(work, "Znajdź zależności", PRIORITY_HIGH, self)
+        task.partial.connect(lambda item, t=task: self.on_result_found(t, item))
+        task.done.connect(lambda count, t=task: self.on_search_finished(t, count))
+        task.failed.connect(lambda msg: self.result_label.setText(f"Błąd: {msg}"))
+        task.finished.connect(lambda t=task: self.search_btn.setEnabled(self.search_task in (None, t)))
+        self.search_task = task
+        task.start()
+
+    def on_result_found(self, task, item):
+        if task is not self.search_task:
+            return
+        self.results_list.addItem(QListWidgetItem(item))
+        self.result_label.setText(f"Szukanie... wyników: {self.results_list.count()}")
+
+    def on_search_finished(self, task, count):
+        if task is not self.search_task:
+            return
+        self.search_task = None
+        if not count:
             self.result_label.setText("Nie znaleziono zależności dla podanych kryteriów.")
         else:
-            self.result_label.setText(f"Znaleziono {len(found)} wyników:")
-            for item in found:
-                self.results_list.addItem(QListWidgetItem(item))
+            self.result_label.setText(f"Znaleziono {count} wyników:")
+
+    def cancel_search(self):
+        if self.search_task is not None:
+            self.search_task.cancel()
+            self.search_task = None
+
+def find_dependencies(mod_folder, search_id, search_key, is_cancelled=None):
+    """
+    Szuka ID/Key we wszystkich plikach JSON i TXT moda.
+
+    Yields:
+        Opisy trafień: "ścieżka [JSON|TXT, linia N]"
+    """
+    for root, dirs, files in os.walk(mod_folder):
+        if is_cancelled and is_cancelled():
+            return
+        for filename in files:
+            path = os.path.join(root, filename)
+            rel_path = os.path.relpath(path, mod_folder)
+            # JSON – wpisy z DocumentCache (wspólne z zakładkami); tekst pliku
+            # czytany tylko wtedy, gdy są trafienia – do numerów linii
+            if filename.lower().endswith(".json"):
+                try:
+                    table, offsets, _ = document_cache.strings(path, copy=False)
+                    keys = table.keys
+                    rows = []
+                    for row in range(len(table)):
+                        entry_id = table.get_id(row)
+                        key = keys[row]
+                        idstr = "" if entry_id is None else str(entry_id)
+                        keystr = "" if key is None else str(key)
+                        if (search_id and idstr == search_id) or (search_key and keystr == search_key):
+                            rows.append((row, idstr, keystr))
+                    if rows:
+                        with open(path, "rb") as f:
+                            raw = f.read()
+                    for row, idstr, keystr in rows:
+                        # Szukaj linii zawierającej id lub key
+                        search_terms = []
+                        if search_id:
+                            search_terms.append(f'"id": {idstr}')
+                        if search_key:
+                            search_terms.append(f'"Key": "{keystr}"')
+                        line_no = _entry_line(raw, offsets, row, search_terms)
+                        yield f"{rel_path} [JSON, linia {line_no}]"
+                except Exception:
+                    continue
+
+            # TXT
+            if filename.lower().endswith(".txt"):
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        for idx, line in enumerate(f, 1):
+                            if (search_id and search_id in line) or (search_key and search_key in line):
+                                yield f"{rel_path} [TXT, linia {idx}]"
+                except Exception:
+                    continue
+
+def _entry_line(raw, offsets, row, search_terms):
+    """Numer linii pola id/Key wpisu (1-based) albo "?"."""
+    terms = [term.encode("utf-8") for term in search_terms]
+    if offsets is not None:
+        start = offsets.bases[row]
+        end = start + offsets.sizes[row]
+    else:
+        start, end = 0, len(raw)  # nietypowy układ pliku – pierwsza linia z id lub Key
+    positions = [pos for pos in (raw.find(term, start, end) for term in terms) if pos != -1]
+    if positions:
+        return raw.count(b"\n", 0, min(positions)) + 1
+    return raw.count(b"\n", 0, start) + 1 if offsets is not None else "?"
+
+def run_plugin(main_window):
+    # Wywoływane po kliknięciu akcji w menu (wtyczka importowana dopiero wtedy)
+    _watch_events(main_window)
+    dlg = DependencyFinderDialog(main_window)
+    dlg.exec_()
 
 def register_plugin(main_window):
+    # Dla starszych loaderów, które importują wtyczki przy starcie
+    _watch_events(main_window)
+
     def open_dialog():
-        dlg = DependencyFinderDialog(main_window)
-        dlg.exec_()
+        run_plugin(main_window)
     menubar = main_window.findChild(QMenuBar)
     if menubar:
         options_menu = None
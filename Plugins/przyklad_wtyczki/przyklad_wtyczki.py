@@ -1,8 +1,13 @@
 PLUGIN_NAME = "Przykładowa wtyczka"
-PLUGIN_VERSION = "0.1"
+PLUGIN_VERSION = "0.2"
 PLUGIN_DESCRIPTION = "To tylko testowa wtyczka – jeśli ją widzisz, system ładowania działa."
 PLUGIN_AUTHOR = "TwojNick"
 PLUGIN_OK = True
 
 def register_plugin(main_window):
-    print("Wtyczka testowa została załadowana!") 
+    print("Wtyczka testowa została załadowana!")
+    # Zdarzenia programu (starsze wersje nie mają main_window.events)
+    events = getattr(main_window, "events", None)
+    if events is not None:
+        from event_bus import FileSaved
+        events.subscribe(FileSaved, lambda event: print(f"Wtyczka testowa: zapisano {event.path}"))
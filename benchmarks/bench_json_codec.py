@@ -0,0 +1,82 @@
+"""
+Porównanie parsowania plików strings: json (stdlib) kontra json_codec.
+
+Użycie (z katalogu głównego repozytorium):
+    python benchmarks/bench_json_codec.py <folder moda albo pliki .json> [-n POWTÓRZENIA]
+
+Dla każdego pliku: czas json.loads, json_codec.loads i pełnego wczytania
+do StringTable (StringsFileReader) obiema drogami, oraz sprawdzenie, że
+zapis (dump_entries) daje identyczne bajty.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec
+from json_patch import dump_entries
+from json_stream import read_strings_file
+from strings_lint import find_strings_files
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def read_with_stdlib(path):
+    # Wymusza drogę bez szybkiego parsera (strumieniowe raw_decode)
+    saved = json_codec.orjson
+    json_codec.orjson = None
+    try:
+        return read_strings_file(path)
+    finally:
+        json_codec.orjson = saved
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark json_codec na plikach strings.")
+    parser.add_argument("paths", nargs="+", help="folder moda albo pliki JSON")
+    parser.add_argument("-n", "--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        files.extend(find_strings_files(path) if os.path.isdir(path) else [path])
+    if not files:
+        print("Brak plików JSON")
+        return 2
+
+    print(f"Parser json_codec: {json_codec.BACKEND}")
+    print(f"{'plik':30} {'MB':>6} {'json':>8} {'codec':>8} {'x':>5} {'wczyt.json':>11} {'wczyt.codec':>12} {'x':>5}  zapis")
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for path in files:
+        with open(path, "rb") as f:
+            raw = f.read()
+        t_std = best_time(lambda: json.loads(raw.decode("utf-8-sig")), args.repeat)
+        t_codec = best_time(lambda: json_codec.loads(raw), args.repeat)
+        t_read_std = best_time(lambda: read_with_stdlib(path), args.repeat)
+        t_read_codec = best_time(lambda: read_strings_file(path), args.repeat)
+        for i, t in enumerate((t_std, t_codec, t_read_std, t_read_codec)):
+            totals[i] += t
+
+        # Zapis musi być identyczny bez względu na parser
+        table_std = read_with_stdlib(path)[0]
+        table_codec = read_strings_file(path)[0]
+        same = dump_entries(table_std.iter_entries())[0] == dump_entries(table_codec.iter_entries())[0]
+
+        print(f"{os.path.basename(path)[:30]:30} {len(raw) / 1e6:6.1f} "
+              f"{t_std:8.3f} {t_codec:8.3f} {t_std / t_codec:5.1f} "
+              f"{t_read_std:11.3f} {t_read_codec:12.3f} {t_read_std / t_read_codec:5.1f}  "
+              f"{'identyczny' if same else 'RÓŻNY'}")
+    print(f"{'razem':30} {'':>6} {totals[0]:8.3f} {totals[1]:8.3f} {totals[0] / totals[1]:5.1f} "
+          f"{totals[2]:11.3f} {totals[3]:12.3f} {totals[2] / totals[3]:5.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
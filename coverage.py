@@ -0,0 +1,132 @@
+"""
+Pokrycie tłumaczeń: dla każdego pliku strings i języka liczba wpisów
+brakujących, pustych i identycznych z enUS.
+"""
+from document_cache import document_cache
+from json_patch import file_signature
+
+BASE_LANG = "enUS"
+
+MISSING = "missing"
+EMPTY = "empty"
+SAME = "same"
+KINDS = (MISSING, EMPTY, SAME)
+
+def load_table(path):
+    # Tabela wspólna z cache – tylko do odczytu
+    return document_cache.strings(path, copy=False)[0]
+
+def table_coverage(table, base=BASE_LANG):
+    """
+    Liczy pokrycie jednym przejściem po każdej kolumnie.
+
+    Returns:
+        {"entries": liczba wpisów, "languages": {język: {missing, empty, same}}}
+    """
+    base_values = table.column(base)
+    languages = {}
+    for lang in table.columns:
+        values = table.column(lang)
+        same = 0
+        if lang != base:
+            same = sum(1 for v, b in zip(values, base_values) if v and v == b)
+        languages[lang] = {
+            MISSING: values.count(None),
+            EMPTY: values.count(""),
+            SAME: same,
+        }
+    return {"entries": len(table), "languages": languages}
+
+def coverage_rows(table, lang, kind, base=BASE_LANG):
+    """Numery wierszy danego rodzaju (do podglądu szczegółów)."""
+    values = table.column(lang)
+    if kind == MISSING:
+        return [row for row, v in enumerate(values) if v is None]
+    if kind == EMPTY:
+        return [row for row, v in enumerate(values) if v == ""]
+    if lang == base:
+        return []
+    base_values = table.column(base)
+    return [row for row, (v, b) in enumerate(zip(values, base_values)) if v and v == b]
+
+def language_counts(result, lang):
+    """Liczby dla języka; język nieobecny w pliku – wszystkie wpisy brakują."""
+    counts = result["languages"].get(lang)
+    if counts is None:
+        return {MISSING: result["entries"], EMPTY: 0, SAME: 0}
+    return counts
+
+def all_languages(results):
+    """Języki ze wszystkich plików; enUS pierwszy, reszta alfabetycznie."""
+    langs = set()
+    for result in results.values():
+        langs.update(result["languages"])
+    return sorted(langs, key=lambda lang: (lang != BASE_LANG, lang))
+
+class CoverageCache:
+    """Wyniki pokrycia plików zapamiętane według (rozmiar, mtime)."""
+    def __init__(self):
+        self._results = {}  # ścieżka -> (sygnatura, wynik)
+
+    def get(self, path):
+        cached = self._results.get(path)
+        try:
+            signature = file_signature(path)
+        except OSError:
+            return None
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        return None
+
+    def paths(self):
+        return list(self._results)
+
+    def update_file(self, path):
+        """
+        Przelicza zapamiętany wynik jednego pliku po zmianie na dysku (pliki
+        spoza cache są pomijane – policzy je najbliższy skan).
+
+        Returns:
+            True, jeśli wynik się zmienił albo został usunięty.
+        """
+        if path not in self._results:
+            return False
+        if self.get(path) is not None:
+            return False
+        try:
+            signature = file_signature(path)
+            result = table_coverage(load_table(path))
+        except (OSError, ValueError, AttributeError):
+            del self._results[path]
+            return True
+        self._results[path] = (signature, result)
+        return True
+
+    def scan(self, paths, is_cancelled=None, progress=None):
+        """
+        Wyniki dla plików; przeliczane są tylko pliki zmienione od ostatniego skanu.
+        Pliki, których nie da się wczytać, są pomijane (komunikat na konsoli).
+
+        Returns:
+            {ścieżka: wynik table_coverage}
+        """
+        results = {}
+        for n, path in enumerate(paths):
+            if is_cancelled and is_cancelled():
+                break
+            result = self.get(path)
+            if result is None:
+                try:
+                    signature = file_signature(path)
+                    result = table_coverage(load_table(path))
+                except (OSError, ValueError, AttributeError) as e:
+                    print(f"Pominięto {path}: {e}")
+                    continue
+                self._results[path] = (signature, result)
+            results[path] = result
+            if progress:
+                progress(n + 1)
+        return results
+
+# Wspólny cache – ponowne otwarcie raportu przelicza tylko zmienione pliki
+coverage_cache = CoverageCache()
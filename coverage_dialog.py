@@ -0,0 +1,179 @@
+import os
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QProgressBar, QPushButton, QComboBox, QAbstractItemView, QHeaderView
+)
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt
+
+from coverage import (
+    BASE_LANG, MISSING, EMPTY, SAME, coverage_cache, coverage_rows,
+    language_counts, all_languages, load_table
+)
+from jobs import Job
+from strings_lint import find_strings_files
+
+KIND_LABELS = {
+    MISSING: "Brakujące",
+    EMPTY: "Puste",
+    SAME: f"Jak {BASE_LANG}",
+}
+
+class CoverageDialog(QDialog):
+    """
+    Macierz pokrycia tłumaczeń: wiersze – pliki strings, kolumny – języki.
+    Komórka: brakujące / puste / identyczne z enUS; dwuklik pokazuje wpisy.
+    """
+    def __init__(self, folder, main_window=None):
+        super().__init__(main_window)
+        self.setWindowTitle("Pokrycie tłumaczeń")
+        self.resize(1000, 500)
+        self.main_window = main_window
+        self.folder = folder
+        self.paths = find_strings_files(folder)
+        self.results = {}
+        self.languages = []
+
+        layout = QVBoxLayout(self)
+        self.info_label = QLabel(
+            f"Komórka: brakujące / puste / jak {BASE_LANG}. Dwuklik – lista wpisów."
+        )
+        layout.addWidget(self.info_label)
+        self.progress = QProgressBar()
+        self.progress.setRange(0, max(1, len(self.paths)))
+        layout.addWidget(self.progress)
+
+        self.matrix = QTableWidget()
+        self.matrix.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.matrix.cellDoubleClicked.connect(self.show_details)
+        layout.addWidget(self.matrix)
+
+        refresh_btn = QPushButton("Odśwież")
+        refresh_btn.clicked.connect(self.refresh)
+        layout.addWidget(refresh_btn)
+
+        self.task = None
+        self.refresh()
+
+    def refresh(self):
+        if self.task is not None:
+            self.task.cancel()
+        self.paths = find_strings_files(self.folder)
+        self.progress.setRange(0, max(1, len(self.paths)))
+        self.progress.setValue(0)
+        self.progress.show()
+        paths = self.paths
+
+        def work(task):
+            return coverage_cache.scan(paths, task.is_cancelled, task.progress.emit)
+
+        task = Job(work, self, name="Pokrycie tłumaczeń")
+        task.progress.connect(self.progress.setValue)
+        task.done.connect(self.show_results)
+        task.failed.connect(lambda msg: self.info_label.setText(f"Błąd: {msg}"))
+        task.finished.connect(lambda t=task: self.on_task_finished(t))
+        self.task = task
+        task.start()
+
+    def on_task_finished(self, task):
+        if self.task is task:
+            self.task = None
+        task.deleteLater()
+
+    def show_results(self, results):
+        self.task = None
+        self.progress.hide()
+        self.results = results
+        self.languages = all_languages(results)
+        paths = [path for path in self.paths if path in results]
+        self.matrix.clear()
+        self.matrix.setRowCount(len(paths))
+        self.matrix.setColumnCount(len(self.languages))
+        self.matrix.setHorizontalHeaderLabels(self.languages)
+        self.matrix.setVerticalHeaderLabels([os.path.relpath(p, self.folder) for p in paths])
+        for row, path in enumerate(paths):
+            result = results[path]
+            total = result["entries"]
+            for col, lang in enumerate(self.languages):
+                counts = language_counts(result, lang)
+                untranslated = counts[MISSING] + counts[EMPTY] + counts[SAME]
+                item = QTableWidgetItem(f"{counts[MISSING]} / {counts[EMPTY]} / {counts[SAME]}")
+                item.setData(Qt.UserRole, path)
+                item.setTextAlignment(Qt.AlignCenter)
+                done = 1.0 - untranslated / total if total else 1.0
+                item.setBackground(QColor.fromHsvF(done / 3, 0.6, 0.45))  # czerwony -> zielony
+                item.setToolTip(
+                    f"{lang}: przetłumaczone {round(done * 100)}% z {total}\n"
+                    f"Brakujące: {counts[MISSING]}, puste: {counts[EMPTY]}, "
+                    f"jak {BASE_LANG}: {counts[SAME]}"
+                )
+                self.matrix.setItem(row, col, item)
+        self.matrix.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+
+    def show_details(self, row, col):
+        item = self.matrix.item(row, col)
+        if item is None:
+            return
+        dlg = CoverageDetailsDialog(item.data(Qt.UserRole), self.languages[col], self.main_window, self)
+        dlg.exec_()
+
+    def closeEvent(self, event):
+        if self.task is not None:
+            self.task.cancel()
+        super().closeEvent(event)
+
+class CoverageDetailsDialog(QDialog):
+    """Wpisy jednego pliku i języka: brakujące, puste albo identyczne z enUS."""
+    def __init__(self, path, lang, main_window=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"{os.path.basename(path)} – {lang}")
+        self.resize(900, 500)
+        self.path = path
+        self.lang = lang
+        self.main_window = main_window
+        self.table = load_table(path)
+
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        self.kind_combo = QComboBox()
+        for kind, label in KIND_LABELS.items():
+            self.kind_combo.addItem(label, kind)
+        self.kind_combo.currentIndexChanged.connect(self.fill)
+        top.addWidget(self.kind_combo)
+        self.count_label = QLabel()
+        top.addWidget(self.count_label)
+        top.addStretch()
+        layout.addLayout(top)
+
+        self.entries = QTableWidget()
+        self.entries.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.entries.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.entries.cellDoubleClicked.connect(self.open_entry)
+        layout.addWidget(self.entries)
+        if main_window is not None and hasattr(main_window, "open_json_file"):
+            layout.addWidget(QLabel("Dwuklik – otwórz wpis w zakładce"))
+        self.fill()
+
+    def fill(self):
+        kind = self.kind_combo.currentData()
+        rows = coverage_rows(self.table, self.lang, kind)
+        self.count_label.setText(f"Wpisów: {len(rows)}")
+        headers = ["id", "Key", BASE_LANG] + ([self.lang] if self.lang != BASE_LANG else [])
+        self.entries.clear()
+        self.entries.setColumnCount(len(headers))
+        self.entries.setHorizontalHeaderLabels(headers)
+        self.entries.setRowCount(len(rows))
+        for n, row in enumerate(rows):
+            for col, field in enumerate(headers):
+                value = self.table.get(row, field)
+                self.entries.setItem(n, col, QTableWidgetItem("" if value is None else str(value)))
+        self.entries.resizeColumnsToContents()
+
+    def open_entry(self, row, col):
+        if self.main_window is None or not hasattr(self.main_window, "open_json_file"):
+            return
+        key_item = self.entries.item(row, 1)
+        viewer = self.main_window.open_json_file(self.path)
+        if viewer is not None and key_item is not None:
+            viewer.search_input.setText(key_item.text())
@@ -0,0 +1,225 @@
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+
+# Mapowanie kodów kolorów D2R na kolory HTML
+D2R_COLOR_MAP = {
+    "0": "#FFFFFF",  # ÿc0 – White
+    "1": "#FF4D4D",  # ÿc1 – Red
+    "2": "#00FF00",  # ÿc2 – Green
+    "3": "#6969FF",  # ÿc3 – Blue
+    "4": "#C7B377",  # ÿc4 – Light Gold
+    "5": "#696969",  # ÿc5 – Grey
+    "6": "#000000",  # ÿc6 – Black
+    "7": "#D0C27D",  # ÿc7 – Dark Gold
+    "8": "#FFA800",  # ÿc8 – Orange
+    "9": "#FFFF64",  # ÿc9 – Yellow
+    "a": "#008000",  # ÿca – Dark Green
+    "b": "#AE00FF",  # ÿcb – Purple
+    "c": "#00C800",  # ÿcc – Medium Green
+    "A": "#008000",  # ÿcA – Dark Green
+    "B": "#AE00FF",  # ÿcB – Purple
+    "C": "#00C800",  # ÿcC – Medium Green
+
+    # Przybliżone z obrazu (custom, nieoficjalne kody):
+    ";": "#B000B0",  # ÿc; – Purple
+    "=": "#E0E0E0",  # ÿc= – White2
+    ":": "#004400",  # ÿc: – Dark Green2
+    "@": "#FF8800",  # ÿc@ – Orange1
+    "D": "#FFD700",  # ÿcD – Gold2
+    "E": "#FF0000",  # ÿcE – Health Potion Red
+    "F": "#ADD8E6",  # ÿcF – Mana Potion Blue
+    "G": "#FF77FF",  # ÿcG – Rejuvenation Pink
+    "H": "#B8860B",  # ÿcH – Light Gold2
+    "I": "#888888",  # ÿcI – Grey3
+    "J": "#FF6600",  # ÿcJ – Orange3
+    "K": "#999999",  # ÿcK – Grey2
+    "L": "#FFB347",  # ÿcL – Orange4
+    "M": "#FFDCA8",  # ÿcM – Light Gold
+    "N": "#00FFFF",  # ÿcN – Light Blue
+    "O": "#FF69B4",  # ÿcO – Pink
+    "P": "#E0BBE4",  # ÿcP – Pale Violet
+    "Q": "#00DD00",  # ÿcQ – Bright Green
+    "R": "#FFFF00",  # ÿcR – Yellow2
+    "S": "#880000",  # ÿcS – Dark Red
+    "T": "#ADD8E6",  # ÿcT – Sky Blue
+    "U": "#CC0000",  # ÿcU – Rich Red
+    "Y": "#AAAAAA"   # ÿcY – Neutral/Quest Grey
+}
+
+DEFAULT_COLOR = "#FFFFFF"
+
+# Kod koloru: "ÿc" + dowolny znak (nieznany kod nie zmienia koloru)
+D2R_CODE_RE = re.compile("ÿc(.)")
+
+# Maksymalna długość tekstu (nowa linia liczy się jako dwa znaki)
+MAX_TEXT_LEN = 481
+
+class LRUCache:
+    """Prosty słownik LRU o ograniczonej liczbie wpisów."""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+def tokenize_line(line, color=DEFAULT_COLOR):
+    """
+    Dzieli linię na odcinki jednego koloru.
+
+    Returns:
+        (lista (kolor, tekst), kolor obowiązujący na końcu linii)
+    """
+    runs = []
+    pos = 0
+    for match in D2R_CODE_RE.finditer(line):
+        if match.start() > pos:
+            runs.append((color, line[pos:match.start()]))
+        color = D2R_COLOR_MAP.get(match.group(1), color)
+        pos = match.end()
+    if pos < len(line):
+        runs.append((color, line[pos:]))
+    return runs, color
+
+def tokenize_d2r_text(text):
+    """Zwraca listę linii (w kolejności wyświetlania – od dołu) jako listy odcinków."""
+    color = DEFAULT_COLOR
+    lines = []
+    for line in reversed(text.split("\n")):  # odwróć kolejność linii
+        runs, color = tokenize_line(line, color)
+        lines.append(runs)
+    return lines
+
+def text_length(text):
+    return len(text) + text.count("\n")
+
+def missing_color_code(line):
+    """Czy niepusta linia nie zaczyna się od kodu koloru."""
+    return bool(line.strip()) and not line.lstrip().startswith("ÿc")
+
+class IncrementalD2RText:
+    """
+    Stan tekstu edytowanego na żywo: tokeny i HTML każdej linii, długość
+    i linie bez kodu koloru.
+
+    replace_lines() dostaje tylko zmienione linie (np. bloki z
+    QTextDocument.contentsChange) i tokenizuje je oraz linie wyżej, do
+    których dociera zmiana koloru. Długość i lista linii bez kodu koloru
+    zmieniają się o różnicę – bez przeglądania całego tekstu.
+    """
+    def __init__(self, text=""):
+        self.lines = []
+        self._chars = 0
+        self._states = []   # na linię: (kolor początkowy, kolor końcowy, HTML)
+        self._missing = []  # posortowane indeksy niepustych linii bez kodu koloru
+        self.replace_lines(0, 0, text.split("\n"))
+
+    @property
+    def length(self):
+        # Nowa linia liczy się jako dwa znaki
+        return self._chars + 2 * max(0, len(self.lines) - 1)
+
+    def replace_lines(self, start, removed, new_lines):
+        """
+        Zastępuje removed linii od start liniami new_lines.
+
+        Returns:
+            (pierwsza, koniec) – zakres linii (numeracja po zmianie) z nowym
+            HTML; obejmuje start..start + len(new_lines)
+        """
+        stop = start + removed
+        new_stop = start + len(new_lines)
+        lines = self.lines
+        self._chars += sum(map(len, new_lines)) - sum(map(len, lines[start:stop]))
+        lines[start:stop] = new_lines
+        self._states[start:stop] = [None] * len(new_lines)
+
+        missing = self._missing
+        lo = bisect_left(missing, start)
+        hi = bisect_left(missing, stop)
+        shift = new_stop - stop
+        missing[lo:] = ([start + i for i, line in enumerate(new_lines) if missing_color_code(line)]
+                        + [i + shift for i in missing[hi:]])
+
+        # Kolory przechodzą od ostatniej linii w górę (kolejność wyświetlania)
+        states = self._states
+        color = states[new_stop][1] if new_stop < len(lines) else DEFAULT_COLOR
+        first = new_stop
+        for i in range(new_stop - 1, -1, -1):
+            state = states[i]
+            if state is not None and state[0] == color:
+                break
+            runs, end_color = tokenize_line(lines[i], color)
+            states[i] = (color, end_color, runs_to_html(runs))
+            color = end_color
+            first = i
+        return min(first, start), new_stop
+
+    def update(self, text):
+        """Cały nowy tekst – zmienione linie wyznaczane porównaniem z poprzednim (O(n))."""
+        lines = text.split("\n")
+        old = self.lines
+        limit = min(len(old), len(lines))
+        start = 0
+        while start < limit and old[start] == lines[start]:
+            start += 1
+        end = 0
+        while end < limit - start and old[-1 - end] == lines[-1 - end]:
+            end += 1
+        return self.replace_lines(start, len(old) - end - start, lines[start:len(lines) - end])
+
+    def too_long(self):
+        return self.length > MAX_TEXT_LEN
+
+    def missing_color_lines(self):
+        """Numery (od 1) niepustych linii bez kodu koloru."""
+        return [i + 1 for i in self._missing]
+
+    def line_html(self, index):
+        return self._states[index][2]
+
+    def html(self, font_name):
+        if self.lines == [""]:
+            return ""
+        body = "".join(state[2] + "<br>" for state in reversed(self._states))
+        return wrap_d2r_html(body, font_name)
+
+def runs_to_html(runs):
+    return "".join(
+        f'<span style="color: {color};">{segment.replace("%", "%%")}</span>'
+        for color, segment in runs
+    )
+
+def wrap_d2r_html(body, font_name):
+    return f'<div style="font-family: {font_name}; font-size: 14pt; text-align: center; background-color: rgba(0, 0, 0, 0.8); padding: 5px; border-radius: 4px;">{body}</div>'
+
+# Wyrenderowany HTML, klucz: (tekst, czcionka)
+_html_cache = LRUCache(8192)
+
+def render_d2r_html(text, font_name):
+    if not text:
+        return ""
+    key = (text, font_name)
+    html = _html_cache.get(key)
+    if html is None:
+        body = "".join(runs_to_html(runs) + "<br>" for runs in tokenize_d2r_text(text))
+        html = wrap_d2r_html(body, font_name)
+        _html_cache.put(key, html)
+    return html
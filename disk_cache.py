@@ -0,0 +1,237 @@
+"""
+Trwały cache sparsowanych plików TXT i JSON na dysku (katalog cache/).
+
+Każdy wynik parsowania zapisywany jest raz, w postaci marshal (bajty,
+listy, słowniki), w pliku nazwanym odciskiem zawartości pliku źródłowego
+(blake2b). Indeks pamięta dla ścieżki (rozmiar, mtime, odcisk) – dopóki
+się zgadzają, plik źródłowy nie jest nawet czytany, a wynik wczytywany jest
+z pliku cache przez mmap. Po zmianie rozmiaru lub mtime liczony jest odcisk:
+ta sama zawartość (np. skopiowany plik vanilla) nadal trafia w cache.
+
+Nagłówek pliku cache zawiera wersję formatu i wersję marshal – pliki z innej
+wersji programu lub Pythona są pomijane. Rodzaj wyniku (kind) zawiera też
+wersję parsera, np. "txt-table-1".
+"""
+import gc
+import os
+import mmap
+import struct
+import marshal
+import hashlib
+import threading
+
+from file_io import atomic_write
+
+CACHE_VERSION = 1
+MAGIC = b"D2RC"
+_HEADER = struct.Struct("<4sHH")  # magic, wersja cache, wersja marshal
+
+INDEX_NAME = "index.bin"
+# Małe pliki parsują się szybciej, niż trwa zapis do cache
+MIN_FILE_SIZE = 128 * 1024
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+def default_cache_dir():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+def fingerprint(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def _read_blob(path):
+    """Zawartość pliku cache albo None (brak pliku, inna wersja, uszkodzenie)."""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _HEADER.size or _HEADER.unpack_from(mm) != (MAGIC, CACHE_VERSION, marshal.version):
+                return None
+            view = memoryview(mm)[_HEADER.size:]
+            # Setki tysięcy list i napisów naraz – bez przebiegów GC o ~1/3 szybciej
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return marshal.loads(view)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+                view.release()
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+
+def _write_blob(path, value):
+    atomic_write(path, _HEADER.pack(MAGIC, CACHE_VERSION, marshal.version) + marshal.dumps(value))
+
+class DiskCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, min_file_size=MIN_FILE_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.min_file_size = min_file_size
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._index = None  # (rodzaj, ścieżka) -> (rozmiar, mtime_ns, odcisk)
+        self._lock = threading.Lock()
+
+    def _key(self, kind, path):
+        return kind, os.path.normcase(os.path.abspath(path))
+
+    def _blob_path(self, kind, fp):
+        return os.path.join(self.directory, f"{kind}-{fp}.bin")
+
+    def _index_dict(self):
+        if self._index is None:
+            index = _read_blob(os.path.join(self.directory, INDEX_NAME))
+            self._index = index if isinstance(index, dict) else {}
+        return self._index
+
+    def _lookup(self, kind, path, st):
+        with self._lock:
+            entry = self._index_dict().get(self._key(kind, path))
+        if entry is None or entry[:2] != (st.st_size, st.st_mtime_ns):
+            return None
+        return _read_blob(self._blob_path(kind, entry[2]))
+
+    def get(self, path, kind, decode=None):
+        """
+        Wynik z cache bez czytania pliku źródłowego (tylko zgodny rozmiar i mtime).
+
+        Returns:
+            wynik (po decode) albo None
+        """
+        if not self.enabled:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        state = self._lookup(kind, path, st)
+        if state is None:
+            return None
+        self.hits += 1
+        return decode(state) if decode else state
+
+    def load(self, path, kind, parse, encode=None, decode=None):
+        """
+        Wynik parse(path) – z cache albo policzony i zapamiętany.
+
+        encode/decode zamieniają wynik na obiekty marshal i z powrotem (np.
+        StringTable.to_state/from_state). Każde wywołanie zwraca nowy obiekt.
+        """
+        st = os.stat(path)
+        if not self.enabled or st.st_size < self.min_file_size:
+            return parse(path)
+        state = self._lookup(kind, path, st)
+        if state is not None:
+            self.hits += 1
+            return decode(state) if decode else state
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        fp = fingerprint(raw)
+        del raw
+        state = _read_blob(self._blob_path(kind, fp))
+        if state is not None:
+            # Ta sama zawartość pod inną ścieżką albo z nowym mtime
+            self.hits += 1
+            value = decode(state) if decode else state
+        else:
+            self.misses += 1
+            value = parse(path)
+            state = encode(value) if encode else value
+            if not self._store_blob(kind, fp, state):
+                return value
+        self._remember(kind, path, st, fp)
+        return value
+
+    def put(self, path, kind, state, signature):
+        """
+        Zapamiętuje wynik policzony gdzie indziej (np. wczytany porcjami w
+        zakładce). signature – (rozmiar, mtime_ns) pliku z chwili parsowania;
+        jeśli plik od tego czasu się zmienił, nic nie jest zapisywane.
+        """
+        if not self.enabled or signature[0] < self.min_file_size:
+            return False
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            st = os.stat(path)
+        except OSError:
+            return False
+        if (st.st_size, st.st_mtime_ns) != tuple(signature):
+            return False
+        fp = fingerprint(raw)
+        if not os.path.exists(self._blob_path(kind, fp)) and not self._store_blob(kind, fp, state):
+            return False
+        self._remember(kind, path, st, fp)
+        return True
+
+    def _store_blob(self, kind, fp, state):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_blob(self._blob_path(kind, fp), state)
+        except (OSError, ValueError) as e:
+            print(f"Błąd zapisu cache: {e}")
+            return False
+        self._enforce_limit()
+        return True
+
+    def _remember(self, kind, path, st, fp):
+        with self._lock:
+            index = self._index_dict()
+            key = self._key(kind, path)
+            old = index.get(key)
+            index[key] = (st.st_size, st.st_mtime_ns, fp)
+            # Poprzednia zawartość pliku nie jest już nikomu potrzebna
+            if old is not None and old[2] != fp and not any(
+                k[0] == kind and entry[2] == old[2] for k, entry in index.items()
+            ):
+                try:
+                    os.remove(self._blob_path(kind, old[2]))
+                except OSError:
+                    pass
+            self._save_index()
+
+    def _save_index(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_blob(os.path.join(self.directory, INDEX_NAME), self._index)
+        except (OSError, ValueError) as e:
+            print(f"Błąd zapisu indeksu cache: {e}")
+
+    def _enforce_limit(self):
+        """Usuwa najstarsze pliki cache ponad limit rozmiaru."""
+        try:
+            with os.scandir(self.directory) as entries:
+                blobs = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries
+                         if e.name.endswith(".bin") and e.name != INDEX_NAME]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in blobs)
+        for _, size, path in sorted(blobs):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def size(self):
+        """Łączny rozmiar plików cache w bajtach."""
+        try:
+            with os.scandir(self.directory) as entries:
+                return sum(e.stat().st_size for e in entries if e.is_file())
+        except OSError:
+            return 0
+
+    def clear(self):
+        with self._lock:
+            self._index = {}
+            try:
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".bin"):
+                            os.remove(entry.path)
+            except OSError as e:
+                print(f"Błąd czyszczenia cache: {e}")
+
+# Wspólny dla programu i wtyczek
+disk_cache = DiskCache()
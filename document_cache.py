@@ -0,0 +1,171 @@
+"""
+Wspólny cache sparsowanych plików JSON (zakładki, wtyczki, indeksy).
+
+Wpis jest ważny, dopóki (rozmiar, mtime) pliku się nie zmieni. Łączny
+rozmiar wpisów jest ograniczony – po przekroczeniu limitu usuwane są
+najdawniej używane. Cache działa w obrębie jednego procesu; zadania
+w puli procesów (find_replace, strings_lint) parsują pliki same. Pod spodem
+jest trwały disk_cache – po ponownym uruchomieniu duże pliki nie są
+parsowane od nowa.
+
+Dwie postacie dokumentu:
+  json(path)    – wynik json_codec.load_path; wspólny, nie wolno go zmieniać,
+  strings(path) – (StringTable, EntryOffsets, sygnatura) pliku strings;
+                  domyślnie kopia do edycji (StringTable.fork, offsets.copy).
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import json_codec
+from disk_cache import disk_cache
+from json_patch import EntryOffsets, file_signature
+from json_stream import read_strings_file
+from string_table import StringTable
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Obiekty Pythona z json.loads zajmują kilka razy więcej niż plik
+JSON_SIZE_FACTOR = 6
+
+JSON = "json"
+STRINGS = "strings"
+
+# Rodzaje wyników w disk_cache (z wersją formatu)
+JSON_DISK_KIND = "json-1"
+STRINGS_DISK_KIND = "strings-3"  # 3: także "id": null i "Key": null
+
+def _parse_strings(path):
+    table, offsets, _ = read_strings_file(path)
+    return table, offsets
+
+def _strings_to_state(document):
+    table, offsets = document
+    return table.to_state(), offsets.to_state() if offsets is not None else None
+
+def _strings_from_state(state):
+    table, offsets = state
+    return StringTable.from_state(table), EntryOffsets.from_state(offsets) if offsets is not None else None
+
+class DocumentCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (rodzaj, ścieżka) -> (sygnatura, dokument, rozmiar)
+        self._lock = threading.Lock()
+
+    def _key(self, kind, path):
+        return kind, os.path.normpath(path)
+
+    def _get(self, key, signature):
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or cached[0] != signature:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+
+    def _put(self, key, signature, document, nbytes):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[2]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (signature, document, nbytes)
+            self.nbytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self._entries:
+            _, (_, _, nbytes) = self._entries.popitem(last=False)
+            self.nbytes -= nbytes
+
+    def json(self, path):
+        """Sparsowany plik JSON (wspólny obiekt – tylko do odczytu)."""
+        # Sygnatura sprzed odczytu: zmiana w trakcie da przy następnym razie nowe parsowanie
+        signature = file_signature(path)
+        key = self._key(JSON, path)
+        data = self._get(key, signature)
+        if data is None:
+            data = disk_cache.load(path, JSON_DISK_KIND, json_codec.load_path)
+            self._put(key, signature, data, JSON_SIZE_FACTOR * signature[0])
+        return data
+
+    def strings(self, path, copy=True):
+        """
+        Plik strings jako tabela kolumnowa.
+
+        Returns:
+            (StringTable, EntryOffsets albo None, sygnatura pliku); przy
+            copy=False tabela i pozycje są wspólne – tylko do odczytu.
+        """
+        signature = file_signature(path)
+        key = self._key(STRINGS, path)
+        cached = self._get(key, signature)
+        if cached is None:
+            cached = disk_cache.load(path, STRINGS_DISK_KIND, _parse_strings, _strings_to_state, _strings_from_state)
+            table, offsets = cached
+            self._put(key, signature, cached, self._strings_nbytes(table, offsets))
+        table, offsets = cached
+        if copy:
+            return table.fork(), offsets.copy() if offsets is not None else None, signature
+        return table, offsets, signature
+
+    def cached_strings(self, path):
+        """Jak strings(), ale bez parsowania – None, jeśli pliku nie ma w cache (ani na dysku)."""
+        try:
+            signature = file_signature(path)
+        except OSError:
+            return None
+        key = self._key(STRINGS, path)
+        cached = self._get(key, signature)
+        if cached is None:
+            cached = disk_cache.get(path, STRINGS_DISK_KIND, _strings_from_state)
+            if cached is None:
+                return None
+            table, offsets = cached
+            self._put(key, signature, cached, self._strings_nbytes(table, offsets))
+        table, offsets = cached
+        return table.fork(), offsets.copy() if offsets is not None else None, signature
+
+    def put_strings(self, path, signature, table, offsets):
+        """Zapamiętuje tabelę wczytaną (albo zapisaną) przez zakładkę – jako kopię."""
+        table = table.fork()
+        offsets = offsets.copy() if offsets is not None else None
+        self._put(self._key(STRINGS, path), signature, (table, offsets), self._strings_nbytes(table, offsets))
+
+    def persist_strings(self, path, signature):
+        """Zapisuje tabelę z cache (np. wczytaną porcjami przez zakładkę) na dysk – do wywołania w tle."""
+        with self._lock:
+            cached = self._entries.get(self._key(STRINGS, path))
+        if cached is None or cached[0] != signature:
+            return False
+        return disk_cache.put(path, STRINGS_DISK_KIND, _strings_to_state(cached[1]), signature)
+
+    def _strings_nbytes(self, table, offsets):
+        return table.nbytes() + (16 * len(offsets) if offsets is not None else 0)
+
+    def invalidate(self, path):
+        for kind in (JSON, STRINGS):
+            with self._lock:
+                old = self._entries.pop(self._key(kind, path), None)
+                if old is not None:
+                    self.nbytes -= old[2]
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+# Wspólny dla całego programu i wtyczek
+document_cache = DocumentCache()
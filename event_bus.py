@@ -0,0 +1,140 @@
+"""
+Szyna zdarzeń programu dla wtyczek (MainWindow.events).
+
+Program publikuje zdarzenia, wtyczki je subskrybują:
+    from event_bus import FileSaved
+    main_window.events.subscribe(FileSaved, on_saved, owner=dialog)
+
+Zdarzenia nie są dostarczane od razu: szyna zbiera je przez COALESCE_MS od
+ostatniego (najdłużej MAX_DELAY_MS od pierwszego) i łączy zdarzenia tego
+samego typu dotyczące tego samego pliku lub folderu – seria zapisów albo
+zmian na dysku to jedno wywołanie odbiorcy. Odbiorcy wywoływani są w wątku
+GUI w kolejności zdarzeń; publish można wołać z dowolnego wątku.
+"""
+import os
+import time
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+COALESCE_MS = 200
+MAX_DELAY_MS = 1000
+
+class Event:
+    """Zdarzenie; te z tym samym typem i key() są łączone przez merge()."""
+    __slots__ = ()
+
+    def key(self):
+        return None
+
+    def merge(self, newer):
+        """Połączenie z nowszym zdarzeniem o tym samym kluczu – domyślnie nowsze wygrywa."""
+        return newer
+
+    def __repr__(self):
+        names = [name for cls in reversed(type(self).__mro__) for name in getattr(cls, "__slots__", ())]
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in names)
+        return f"{type(self).__name__}({fields})"
+
+class FolderChanged(Event):
+    """
+    Zmiana folderu moda albo plików w nim.
+
+    folder – folder wybrany w programie; paths – zbiór zmienionych, dodanych
+    albo usuniętych plików (ścieżki bezwzględne, także pliki otwartych
+    zakładek spoza folderu) albo None, gdy wybrano inny folder.
+    """
+    __slots__ = ("folder", "paths")
+
+    def __init__(self, folder, paths=None):
+        self.folder = folder
+        self.paths = frozenset(os.path.normpath(p) for p in paths) if paths is not None else None
+
+    def merge(self, newer):
+        if newer.folder != self.folder:
+            return newer
+        if self.paths is None or newer.paths is None:
+            return FolderChanged(self.folder)  # odbiorca i tak zaczyna od nowa
+        return FolderChanged(self.folder, self.paths | newer.paths)
+
+class _PathEvent(Event):
+    __slots__ = ("path",)
+
+    def __init__(self, path):
+        self.path = path
+
+    def key(self):
+        return os.path.normpath(self.path)
+
+class FileOpened(_PathEvent):
+    """Plik otwarty w nowej zakładce (także odtworzonej z poprzedniej sesji)."""
+    __slots__ = ()
+
+class FileSaved(_PathEvent):
+    """Plik zapisany przez program (zakładka, Znajdź i zamień)."""
+    __slots__ = ()
+
+class TabClosed(_PathEvent):
+    """Zamknięto zakładkę z plikiem."""
+    __slots__ = ()
+
+class EventBus(QObject):
+    _published = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._subscribers = []  # (typ zdarzenia, odbiorca)
+        self._pending = OrderedDict()  # (typ, klucz) -> zdarzenie
+        self._first_pending = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        # Z innego wątku sygnał trafia do kolejki wątku GUI
+        self._published.connect(self._enqueue)
+
+    def subscribe(self, event_type, handler, owner=None):
+        """
+        handler(zdarzenie) dla zdarzeń typu event_type (Event – wszystkich).
+        owner – QObject (np. okno wtyczki); po jego usunięciu subskrypcja znika.
+        """
+        entry = (event_type, handler)
+        self._subscribers.append(entry)
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self._remove(entry))
+        return handler
+
+    def unsubscribe(self, event_type, handler):
+        self._remove((event_type, handler))
+
+    def _remove(self, entry):
+        if entry in self._subscribers:
+            self._subscribers.remove(entry)
+
+    def publish(self, event):
+        self._published.emit(event)
+
+    def _enqueue(self, event):
+        key = (type(event), event.key())
+        old = self._pending.pop(key, None)
+        # Na koniec kolejki – np. otwarcie po zamknięciu tego samego pliku zostaje ostatnie
+        self._pending[key] = old.merge(event) if old is not None else event
+        now = time.monotonic()
+        if self._first_pending is None:
+            self._first_pending = now
+        left_ms = MAX_DELAY_MS - (now - self._first_pending) * 1000
+        self._timer.start(int(max(0, min(COALESCE_MS, left_ms))))
+
+    def flush(self):
+        """Dostarcza od razu wszystkie zebrane zdarzenia."""
+        self._timer.stop()
+        events = list(self._pending.values())
+        self._pending.clear()
+        self._first_pending = None
+        for event in events:
+            for event_type, handler in list(self._subscribers):
+                if not isinstance(event, event_type):
+                    continue
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"Błąd obsługi zdarzenia {type(event).__name__}: {e}")
@@ -0,0 +1,29 @@
+import os
+import shutil
+import tempfile
+
+def atomic_write(path, data):
+    """
+    Zapisuje bajty do pliku tymczasowego w tym samym folderze i podmienia
+    plik docelowy jednym os.replace – przerwany zapis nie zostawi
+    uszkodzonego pliku.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=os.path.basename(path), dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            try:
+                shutil.copymode(path, tmp_path)
+            except OSError:
+                pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,116 @@
+"""
+Obserwowanie folderu moda i otwartych plików.
+
+QFileSystemWatcher zgłasza zmiany pojedynczo i często kilka razy na jeden
+zapis (np. zapis atomowy: plik tymczasowy + zamiana). FileWatcher zbiera je
+przez COALESCE_MS i wysyła jedną paczkę: listę katalogów ze zmienioną
+zawartością oraz listę plików zmienionych, dodanych albo usuniętych.
+
+Zmiany plików w katalogu wykrywane są przez porównanie migawki
+{nazwa: (rozmiar, mtime)} – bez ponownego przeglądania całego folderu.
+Zapis "w miejscu" nie zmienia katalogu (Linux), dlatego pliki, na których
+zależy odbiorcom (otwarte zakładki, pliki strings), obserwowane są też
+pojedynczo.
+"""
+import os
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from path_index import is_supported
+
+COALESCE_MS = 300
+
+def snapshot_directory(directory):
+    """
+    Returns:
+        {nazwa: (rozmiar, mtime_ns)} obsługiwanych plików katalogu ({} gdy go brak).
+    """
+    snapshot = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if is_supported(entry.name) and entry.is_file():
+                    st = entry.stat()
+                    snapshot[entry.name] = (st.st_size, st.st_mtime_ns)
+    except OSError:
+        pass
+    return snapshot
+
+def _diff_snapshots(old, new):
+    return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+class FileWatcher(QObject):
+    directories_changed = pyqtSignal(list)
+    files_changed = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._snapshots = {}  # katalog -> migawka
+        self._files = set()   # pliki obserwowane pojedynczo (także chwilowo usunięte)
+        self._changed_dirs = set()
+        self._changed_files = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(COALESCE_MS)
+        self._timer.timeout.connect(self._flush)
+
+    def watch_directories(self, snapshots):
+        """snapshots: {katalog: migawka} – liczone np. w tle przez snapshot_directory."""
+        self._snapshots.update(snapshots)
+        watched = set(self._watcher.directories())
+        new = [d for d in snapshots if d not in watched]
+        if new:
+            self._watcher.addPaths(new)
+
+    def clear_directories(self):
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._snapshots.clear()
+        self._changed_dirs.clear()
+
+    def watch_files(self, paths):
+        paths = [os.path.normpath(p) for p in paths]
+        self._files.update(paths)
+        watched = set(self._watcher.files())
+        existing = [p for p in paths if os.path.isfile(p) and p not in watched]
+        if existing:
+            self._watcher.addPaths(existing)
+
+    def unwatch_file(self, path):
+        path = os.path.normpath(path)
+        self._files.discard(path)
+        if path in self._watcher.files():
+            self._watcher.removePath(path)
+
+    def _on_directory_changed(self, directory):
+        self._changed_dirs.add(directory)
+        self._timer.start()
+
+    def _on_file_changed(self, path):
+        self._changed_files.add(os.path.normpath(path))
+        self._timer.start()
+
+    def _flush(self):
+        dirs, self._changed_dirs = self._changed_dirs, set()
+        files, self._changed_files = self._changed_files, set()
+        for directory in dirs:
+            old = self._snapshots.get(directory, {})
+            new = snapshot_directory(directory)
+            if os.path.isdir(directory):
+                self._snapshots[directory] = new
+            else:
+                self._snapshots.pop(directory, None)
+            files.update(os.path.normpath(os.path.join(directory, name)) for name in _diff_snapshots(old, new))
+        # Po zapisie atomowym (zamiana pliku) watcher przestaje obserwować ścieżkę
+        watched = set(self._watcher.files())
+        lost = [p for p in self._files & files if p not in watched and os.path.isfile(p)]
+        if lost:
+            self._watcher.addPaths(lost)
+        if dirs:
+            self.directories_changed.emit(sorted(dirs))
+        if files:
+            self.files_changed.emit(sorted(files))
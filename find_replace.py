@@ -0,0 +1,141 @@
+"""
+Znajdź i zamień (wyrażenia regularne) we wszystkich plikach strings moda.
+
+Wyszukiwanie działa w puli procesów – jeden plik na zadanie, wyniki
+przychodzą plik po pliku. Zamiana zapisuje każdy plik atomowo.
+"""
+import os
+import re
+from functools import lru_cache
+from concurrent.futures import as_completed
+
+import json_codec
+from json_patch import save_edits
+from document_cache import document_cache
+
+# Pola, w których nie zamieniamy (identyfikatory wpisów)
+SKIP_FIELDS = ("id", "Key")
+
+class Match:
+    """Jedno trafienie: wartość pola przed i po zamianie."""
+    __slots__ = ("path", "row", "entry_id", "key", "field", "old", "new", "count")
+
+    def __init__(self, path, row, entry_id, key, field, old, new, count):
+        self.path = path
+        self.row = row
+        self.entry_id = entry_id
+        self.key = key
+        self.field = field
+        self.old = old
+        self.new = new
+        self.count = count
+
+    def as_tuple(self):
+        return (self.path, self.row, self.entry_id, self.key, self.field, self.old, self.new, self.count)
+
+@lru_cache(maxsize=16)
+def compile_pattern(pattern, flags=0):
+    return re.compile(pattern, flags)
+
+def find_in_entries(path, entries, pattern, replacement, flags=0, fields=None):
+    """
+    Returns:
+        lista krotek Match.as_tuple() (krotki – tanie do przesłania między procesami)
+    """
+    regex = compile_pattern(pattern, flags)
+    found = []
+    for row, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        for field, text in entry.items():
+            if field in SKIP_FIELDS or type(text) is not str:
+                continue
+            if fields and field not in fields:
+                continue
+            if regex.search(text) is None:
+                continue
+            new, count = regex.subn(replacement, text)
+            found.append((path, row, entry.get("id"), entry.get("Key"), field, text, new, count))
+    return found
+
+def find_in_file(path, pattern, replacement, flags=0, fields=None):
+    entries = json_codec.load_path(path)
+    if not isinstance(entries, list):
+        return []
+    return find_in_entries(path, entries, pattern, replacement, flags, fields)
+
+def _find_job(args):
+    path = args[0]
+    try:
+        return path, find_in_file(*args), None
+    except (OSError, ValueError, re.error) as e:
+        return path, [], str(e)
+
+def iter_find(paths, pattern, replacement, flags=0, fields=None, jobs=None, is_cancelled=None, pool=None):
+    """
+    Szuka we wszystkich plikach równolegle – w podanej `pool` albo we
+    wspólnej puli procesów programu (jobs.job_service().process_pool()).
+
+    Raises:
+        re.error – niepoprawne wyrażenie (sprawdzane przed startem puli)
+
+    Yields:
+        (ścieżka, lista Match, błąd albo None) – w kolejności kończenia plików
+    """
+    regex = compile_pattern(pattern, flags)
+    regex.sub(replacement, "")  # błędy w zamienniku (np. \\9) przed startem puli
+    fields = tuple(fields) if fields else None
+    job_args = [(path, pattern, replacement, flags, fields) for path in paths]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    if jobs <= 1 or len(paths) <= 1:
+        for args in job_args:
+            if is_cancelled and is_cancelled():
+                return
+            path, found, error = _find_job(args)
+            yield path, [Match(*m) for m in found], error
+        return
+
+    if pool is None:
+        from jobs import job_service  # tutaj – procesy puli importują ten moduł bez Qt
+        pool = job_service().process_pool()
+    yield from _iter_pool(pool, job_args, is_cancelled)
+
+def _iter_pool(pool, job_args, is_cancelled):
+    futures = [pool.submit(_find_job, args) for args in job_args]
+    try:
+        for future in as_completed(futures):
+            if is_cancelled and is_cancelled():
+                return
+            path, found, error = future.result()
+            yield path, [Match(*m) for m in found], error
+    finally:
+        for future in futures:
+            future.cancel()
+
+def apply_matches(path, matches):
+    """
+    Zapisuje zamiany w jednym pliku (atomowo). Plik jest wczytywany ponownie;
+    trafienia, których wartość na dysku zmieniła się od wyszukiwania, są pomijane.
+
+    Returns:
+        (liczba zapisanych zmian, liczba pominiętych)
+    """
+    table, offsets, signature = document_cache.strings(path)
+    edits = []
+    skipped = 0
+    for match in matches:
+        if match.row >= len(table) or table.get(match.row, match.field) != match.old:
+            skipped += 1
+            continue
+        table.set(match.row, match.field, match.new)
+        edits.append((match.row, match.field, match.old, match.new))
+    save_edits(path, table, offsets, signature, edits)
+    return len(edits), skipped
+
+def group_by_file(matches):
+    grouped = {}
+    for match in matches:
+        grouped.setdefault(match.path, []).append(match)
+    return grouped
@@ -0,0 +1,272 @@
+import os
+import re
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+    QCheckBox, QTableView, QAbstractItemView, QHeaderView, QMessageBox,
+    QApplication
+)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from event_bus import FileSaved
+from find_replace import iter_find, apply_matches, group_by_file
+from jobs import Job, job_service, PRIORITY_HIGH
+from strings_lint import find_strings_files
+
+def _preview(text):
+    # Nowe linie widoczne w jednej linii tabeli
+    return text.replace("\n", "⏎")
+
+class MatchListModel(QAbstractTableModel):
+    """Trafienia dopisywane porcjami (plik po pliku) w trakcie wyszukiwania."""
+    HEADERS = ["Plik", "id", "Key", "Pole", "Przed", "Po"]
+
+    def __init__(self, folder, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.matches = []
+        self.checked = bytearray()
+
+    def clear(self):
+        self.beginResetModel()
+        self.matches = []
+        self.checked = bytearray()
+        self.endResetModel()
+
+    def append(self, matches):
+        if not matches:
+            return
+        first = len(self.matches)
+        self.beginInsertRows(QModelIndex(), first, first + len(matches) - 1)
+        self.matches.extend(matches)
+        self.checked += b"\x01" * len(matches)
+        self.endInsertRows()
+
+    def checked_matches(self):
+        return [m for m, c in zip(self.matches, self.checked) if c]
+
+    def set_all_checked(self, checked):
+        self.checked = bytearray(b"\x01" if checked else b"\x00") * len(self.matches)
+        if self.matches:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.matches) - 1, 0))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.matches)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        match = self.matches[index.row()]
+        col = index.column()
+        if role == Qt.CheckStateRole and col == 0:
+            return Qt.Checked if self.checked[index.row()] else Qt.Unchecked
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return os.path.relpath(match.path, self.folder)
+            if col == 1:
+                return "" if match.entry_id is None else str(match.entry_id)
+            if col == 2:
+                return "" if match.key is None else str(match.key)
+            if col == 3:
+                return match.field
+            if col == 4:
+                return _preview(match.old)
+            if col == 5:
+                return _preview(match.new)
+        if role == Qt.ToolTipRole and col in (4, 5):
+            return match.old if col == 4 else match.new
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role == Qt.CheckStateRole and index.column() == 0:
+            self.checked[index.row()] = 1 if value == Qt.Checked else 0
+            self.dataChanged.emit(index, index)
+            return True
+        return False
+
+class FindReplaceDialog(QDialog):
+    """Znajdź i zamień (regex) we wszystkich plikach strings moda."""
+    def __init__(self, folder, main_window=None):
+        super().__init__(main_window)
+        self.setWindowTitle("Znajdź i zamień w modzie")
+        self.resize(1100, 600)
+        self.folder = folder
+        self.main_window = main_window
+        self.task = None
+
+        layout = QVBoxLayout(self)
+        form = QHBoxLayout()
+        self.pattern_input = QLineEdit()
+        self.pattern_input.setPlaceholderText("Wyrażenie regularne (np. ÿc4(\\w+))")
+        form.addWidget(self.pattern_input)
+        self.replacement_input = QLineEdit()
+        self.replacement_input.setPlaceholderText("Zamień na (np. ÿc8\\1)")
+        form.addWidget(self.replacement_input)
+        layout.addLayout(form)
+
+        options = QHBoxLayout()
+        self.ignore_case = QCheckBox("Bez wielkości liter")
+        options.addWidget(self.ignore_case)
+        self.fields_input = QLineEdit()
+        self.fields_input.setPlaceholderText("Języki, np. plPL, deDE (puste = wszystkie)")
+        options.addWidget(self.fields_input)
+        self.search_btn = QPushButton("Szukaj")
+        self.search_btn.clicked.connect(self.start_search)
+        options.addWidget(self.search_btn)
+        layout.addLayout(options)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.model = MatchListModel(folder, self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.verticalHeader().hide()
+        layout.addWidget(self.view)
+
+        buttons = QHBoxLayout()
+        check_all = QPushButton("Zaznacz wszystkie")
+        check_all.clicked.connect(lambda: self.model.set_all_checked(True))
+        buttons.addWidget(check_all)
+        uncheck_all = QPushButton("Odznacz wszystkie")
+        uncheck_all.clicked.connect(lambda: self.model.set_all_checked(False))
+        buttons.addWidget(uncheck_all)
+        buttons.addStretch()
+        self.apply_btn = QPushButton("Zamień zaznaczone")
+        self.apply_btn.clicked.connect(self.apply_replacements)
+        buttons.addWidget(self.apply_btn)
+        layout.addLayout(buttons)
+
+    def _fields(self):
+        return [f.strip() for f in self.fields_input.text().split(",") if f.strip()]
+
+    def start_search(self):
+        pattern = self.pattern_input.text()
+        if not pattern:
+            return
+        if self.task is not None:
+            self.task.cancel()
+        replacement = self.replacement_input.text()
+        flags = re.IGNORECASE if self.ignore_case.isChecked() else 0
+        fields = self._fields()
+        paths = find_strings_files(self.folder)
+        try:
+            re.compile(pattern, flags).sub(replacement, "")
+        except re.error as e:
+            self.status_label.setText(f"Błędne wyrażenie: {e}")
+            return
+
+        self.model.clear()
+        self.files_done = 0
+        self.files_total = len(paths)
+        self.status_label.setText(f"Szukanie... (0/{len(paths)} plików)")
+
+        def work(task):
+            for result in iter_find(paths, pattern, replacement, flags, fields,
+                                    is_cancelled=task.is_cancelled,
+                                    pool=job_service().process_pool()):
+                task.partial.emit(result)
+
+        task = Job(work, self, name="Znajdź i zamień", priority=PRIORITY_HIGH)
+        task.partial.connect(lambda result, t=task: self.on_file_searched(t, result))
+        task.done.connect(lambda _, t=task: self.on_search_finished(t))
+        task.failed.connect(lambda msg: self.status_label.setText(f"Błąd: {msg}"))
+        task.finished.connect(lambda t=task: self.on_task_finished(t))
+        self.task = task
+        task.start()
+
+    def on_task_finished(self, task):
+        if self.task is task:
+            self.task = None
+        task.deleteLater()
+
+    def on_file_searched(self, task, result):
+        if task is not self.task:
+            return
+        path, matches, error = result
+        if error:
+            print(f"Błąd w pliku {path}: {error}")
+        self.model.append(matches)
+        self.files_done += 1
+        self.status_label.setText(
+            f"Szukanie... ({self.files_done}/{self.files_total} plików), trafień: {self.model.rowCount()}"
+        )
+
+    def on_search_finished(self, task):
+        if task is not self.task:
+            return
+        self.task = None
+        self.status_label.setText(f"Trafień: {self.model.rowCount()} w {self.files_total} plikach")
+
+    def _open_viewers(self):
+        viewers = {}
+        tabs = getattr(self.main_window, "tabs", None)
+        if tabs is not None:
+            for i in range(tabs.count()):
+                widget = tabs.widget(i)
+                if getattr(widget, "json_path", None):
+                    viewers[os.path.normpath(widget.json_path)] = widget
+        return viewers
+
+    def apply_replacements(self):
+        if self.task is not None:
+            return  # najpierw niech wyszukiwanie się skończy
+        grouped = group_by_file(self.model.checked_matches())
+        if not grouped:
+            return
+        viewers = self._open_viewers()
+        events = getattr(self.main_window, "events", None)
+        written = skipped = 0
+        busy_files = []
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            for path, matches in grouped.items():
+                viewer = viewers.get(os.path.normpath(path))
+                if viewer is not None and (viewer.has_unsaved_changes() or viewer.is_loading()):
+                    busy_files.append(os.path.basename(path))
+                    continue
+                try:
+                    done, stale = apply_matches(path, matches)
+                except Exception as e:
+                    print(f"Błąd zapisu {path}: {e}")
+                    busy_files.append(os.path.basename(path))
+                    continue
+                written += done
+                skipped += stale
+                if done and events is not None:
+                    events.publish(FileSaved(path))
+                if viewer is not None and done:
+                    viewer.load_json(path)  # zakładka pokazuje nową zawartość
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        message = f"Zamienionych wartości: {written} w {len(grouped) - len(busy_files)} plikach."
+        if skipped:
+            message += f"\nPominięte (zmienione od wyszukiwania): {skipped}."
+        if busy_files:
+            message += f"\nPominięte pliki (niezapisane zmiany w zakładce lub błąd): {', '.join(busy_files)}."
+        QMessageBox.information(self, "Znajdź i zamień", message)
+        self.model.clear()
+        self.status_label.setText("")
+
+    def closeEvent(self, event):
+        if self.task is not None:
+            self.task.cancel()
+        super().closeEvent(event)
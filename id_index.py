@@ -0,0 +1,199 @@
+"""
+Indeks id i Key ze wszystkich plików strings moda.
+
+Użyte id trzymane są jako mapa bitowa liczników (bytearray – jeden bajt na id;
+od 255 wystąpień bajt stoi na 255, a prawdziwy licznik jest w słowniku),
+Key jako słownik Key -> liczba wystąpień.
+Zapytania "następny wolny zakres" i "duplikaty" działają na całej mapie
+metodami bytearray (w C). Każdy plik pamięta swój wkład, więc zmiana pliku
+przelicza tylko ten plik.
+"""
+import re
+import threading
+from array import array
+
+from document_cache import document_cache
+from json_patch import file_signature
+
+# Id powyżej tej wartości (albo nie-liczby) trafiają do zwykłego słownika
+MAX_BITMAP_ID = 1 << 24
+
+_DUPLICATE_RE = re.compile(rb"[^\x00\x01]")
+
+class _FileIds:
+    __slots__ = ("signature", "ids", "keys")
+
+    def __init__(self, signature, ids, keys):
+        self.signature = signature
+        self.ids = ids    # array('q') id na wiersz (-1: brak id albo id spoza mapy)
+        self.keys = keys  # Key na wiersz (None: brak)
+
+def read_ids(path):
+    """
+    Returns:
+        (array id na wiersz, lista (wiersz, id) id spoza mapy, lista Key na wiersz)
+    """
+    table = document_cache.strings(path, copy=False)[0]
+    ids = array('q')
+    other_ids = []
+    for row in range(len(table)):
+        entry_id = table.get_id(row)
+        if type(entry_id) is int and 0 <= entry_id < MAX_BITMAP_ID:
+            ids.append(entry_id)
+        else:
+            ids.append(-1)
+            if entry_id is not None:
+                other_ids.append((row, entry_id))
+    keys = [key if type(key) is str else None for key in table.keys]
+    return ids, other_ids, keys
+
+class IdIndex:
+    def __init__(self):
+        self.counts = bytearray()
+        self._overflow = {}   # id -> liczba wystąpień, gdy nie mieści się w bajcie (>= 255)
+        self.other_ids = {}   # id spoza mapy -> liczba wystąpień
+        self.keys = {}        # Key -> liczba wystąpień
+        self.files = {}       # ścieżka -> _FileIds
+        self._other_by_file = {}  # ścieżka -> lista (wiersz, id spoza mapy)
+        # Aktualizacje przychodzą z zadań w tle (okno wtyczki, obserwator plików)
+        self._lock = threading.RLock()
+
+    # ---- aktualizacja ----
+
+    def _add_counts(self, ids, delta):
+        counts = self.counts
+        if ids and delta > 0:
+            top = max(ids) + 1
+            if top > len(counts):
+                counts.extend(bytes(top - len(counts)))
+        overflow = self._overflow
+        for entry_id in ids:
+            if entry_id < 0:
+                continue
+            count = overflow.get(entry_id, counts[entry_id]) + delta
+            if count >= 255:
+                overflow[entry_id] = count
+                counts[entry_id] = 255
+            else:
+                overflow.pop(entry_id, None)
+                counts[entry_id] = max(0, count)
+
+    def _add_dict(self, target, values, delta):
+        for value in values:
+            if value is None:
+                continue
+            count = target.get(value, 0) + delta
+            if count > 0:
+                target[value] = count
+            else:
+                target.pop(value, None)
+
+    def remove_file(self, path):
+        with self._lock:
+            self._remove_file(path)
+
+    def _remove_file(self, path):
+        data = self.files.pop(path, None)
+        if data is None:
+            return
+        self._add_counts(data.ids, -1)
+        self._add_dict(self.keys, data.keys, -1)
+        self._add_dict(self.other_ids, (i for _, i in self._other_by_file.pop(path, ())), -1)
+
+    def update_file(self, path):
+        """Przelicza wkład jednego pliku (np. po zapisie). Zwraca True, jeśli się zmienił."""
+        with self._lock:
+            return self._update_file(path)
+
+    def _update_file(self, path):
+        try:
+            signature = file_signature(path)
+        except OSError:
+            self._remove_file(path)
+            return True
+        data = self.files.get(path)
+        if data is not None and data.signature == signature:
+            return False
+        try:
+            ids, other_ids, keys = read_ids(path)
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Pominięto {path}: {e}")
+            self._remove_file(path)
+            return True
+        self._remove_file(path)
+        self.files[path] = _FileIds(signature, ids, keys)
+        self._other_by_file[path] = other_ids
+        self._add_counts(ids, 1)
+        self._add_dict(self.keys, keys, 1)
+        self._add_dict(self.other_ids, (i for _, i in other_ids), 1)
+        return True
+
+    def refresh(self, paths, is_cancelled=None):
+        """Synchronizuje indeks z listą plików – czytane są tylko zmienione pliki."""
+        paths = list(paths)
+        with self._lock:
+            for path in set(self.files) - set(paths):
+                self._remove_file(path)
+        changed = 0
+        for path in paths:
+            if is_cancelled and is_cancelled():
+                break
+            changed += self.update_file(path)
+        return changed
+
+    # ---- zapytania ----
+
+    def is_id_used(self, entry_id):
+        if type(entry_id) is int and 0 <= entry_id < MAX_BITMAP_ID:
+            return entry_id < len(self.counts) and self.counts[entry_id] > 0
+        return entry_id in self.other_ids
+
+    def is_key_used(self, key):
+        return key in self.keys
+
+    def next_free_range(self, count=1, start=1):
+        """Pierwsze id >= start, od którego count kolejnych id jest wolnych."""
+        count = max(1, count)
+        pos = self.counts.find(bytes(count), start)
+        if pos != -1:
+            return pos
+        # Wolny zakres zaczyna się w końcówce mapy (lub za nią)
+        tail = len(self.counts)
+        while tail > start and self.counts[tail - 1] == 0:
+            tail -= 1
+        return max(tail, start)
+
+    def duplicate_ids(self):
+        """Posortowane id występujące więcej niż raz."""
+        duplicates = [m.start() for m in _DUPLICATE_RE.finditer(self.counts)]
+        duplicates.extend(sorted(
+            (i for i, c in self.other_ids.items() if c > 1), key=str
+        ))
+        return duplicates
+
+    def duplicate_keys(self):
+        return sorted(k for k, c in self.keys.items() if c > 1)
+
+    def locate_id(self, entry_id):
+        """Lista (ścieżka, wiersz) wpisów o danym id."""
+        if type(entry_id) is int and 0 <= entry_id < MAX_BITMAP_ID:
+            return [
+                (path, row)
+                for path, data in self.files.items()
+                for row, i in enumerate(data.ids) if i == entry_id
+            ]
+        return [
+            (path, row)
+            for path, pairs in self._other_by_file.items()
+            for row, i in pairs if i == entry_id
+        ]
+
+    def locate_key(self, key):
+        return [
+            (path, row)
+            for path, data in self.files.items()
+            for row, k in enumerate(data.keys) if k == key
+        ]
+
+# Wspólny indeks – kolejne otwarcia czytają tylko zmienione pliki
+id_index = IdIndex()
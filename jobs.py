@@ -0,0 +1,285 @@
+"""
+Wspólna pula zadań w tle dla programu i wtyczek (MainWindow.jobs).
+
+Zadanie (Job) to funkcja fn(job) wykonywana w jednym z ograniczonej liczby
+wątków. fn sprawdza job.is_cancelled() (albo job.check_cancelled()), postęp
+zgłasza przez job.progress.emit(0-100), a wyniki częściowe przez
+job.partial.emit(...). Sygnały trafiają do wątku GUI. Kolejka ma priorytety –
+zadanie z mniejszą liczbą rusza wcześniej.
+
+Praca na wielu procesach (np. przetwarzanie wielu plików) idzie przez
+JobService.map_processes albo wspólną JobService.process_pool() – wyniki
+spływają jako partial w kolejności kończenia.
+
+Jeden wątek puli jest zarezerwowany dla PRIORITY_HIGH: długie zadania w tle
+(indeksy, zapis cache) nie blokują wyszukiwania wywołanego przez użytkownika.
+
+Przykład we wtyczce (odbiorców podaje się od razu – zadanie może skończyć
+się, zanim submit zwróci wynik):
+    job = main_window.jobs.submit(fn, name="Moje zadanie", priority=PRIORITY_LOW,
+                                  on_partial=..., on_done=...)
+    ...
+    job.cancel()
+"""
+import os
+import heapq
+import multiprocessing
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from search_index import SearchCancelled
+
+# Przerwanie zadania – ten sam wyjątek, którego używa wyszukiwanie
+JobCancelled = SearchCancelled
+
+PRIORITY_HIGH = 0      # odpowiedź na akcję użytkownika (wyszukiwanie)
+PRIORITY_NORMAL = 10   # wczytywanie plików
+PRIORITY_LOW = 20      # indeksy budowane na zapas
+
+class Job(QObject):
+    """
+    Zadanie w tle. Interfejs jak dawny BackgroundTask (QThread): sygnały
+    done/partial/progress/failed, cancel(), is_cancelled(), start(), wait().
+    """
+    done = pyqtSignal(object)
+    partial = pyqtSignal(object)
+    progress = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()  # zawsze na końcu (także po błędzie i przerwaniu)
+
+    def __init__(self, fn, parent=None, name="", priority=PRIORITY_NORMAL, service=None):
+        super().__init__(parent)
+        self.fn = fn
+        self.name = name or getattr(fn, "__name__", "zadanie")
+        self.priority = priority
+        self.service = service
+        self._cancelled = False
+        self._started = False
+        self._finished = threading.Event()
+
+    def start(self):
+        """Wstawia zadanie do kolejki puli (raz)."""
+        if not self._started:
+            self._started = True
+            if self.service is None:
+                self.service = job_service()
+            self.service.enqueue(self)
+        return self
+
+    def cancel(self):
+        self._cancelled = True
+        # Zadanie jeszcze w kolejce kończy się od razu – nikt nie czeka na wolny wątek
+        if self._started and self.service is not None and self.service.remove_pending(self):
+            self._finish_cancelled()
+
+    def detach(self):
+        """
+        Przerywa zadanie i odłącza je od odbiorców i rodzica (np. zamykanej
+        zakładki) – bez czekania. Zadanie, którego nie da się przerwać w
+        połowie (parsowanie całego pliku, zapis cache), kończy się w tle.
+        """
+        self.cancel()
+        self.blockSignals(True)
+        self.setParent(None)
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def check_cancelled(self):
+        if self._cancelled:
+            raise JobCancelled()
+
+    def is_finished(self):
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Czeka na koniec zadania, które już wystartowało; True po zakończeniu."""
+        if not self._started:
+            return True
+        return self._finished.wait(timeout)
+
+    def _emit(self, signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass  # odbiorca (np. zamknięte okno) został już usunięty
+
+    def _finish_cancelled(self):
+        self._finished.set()
+        self._emit(self.cancelled)
+        self._emit(self.finished)
+
+    def _run(self):
+        try:
+            if self._cancelled:
+                raise JobCancelled()
+            result = self.fn(self)
+        except JobCancelled:
+            self._emit(self.cancelled)
+        except Exception as e:
+            if self._cancelled:
+                self._emit(self.cancelled)
+            else:
+                self._emit(self.failed, str(e))
+        else:
+            if self._cancelled:
+                self._emit(self.cancelled)
+            else:
+                self._emit(self.done, result)
+        finally:
+            self._finished.set()
+            self._emit(self.finished)
+
+class JobService(QObject):
+    """
+    Ograniczona pula wątków z kolejką priorytetową i (tworzona przy pierwszym
+    użyciu) wspólna pula procesów.
+    """
+    job_started = pyqtSignal(object)
+    job_finished = pyqtSignal(object)
+
+    def __init__(self, max_threads=None, max_processes=None, parent=None):
+        super().__init__(parent)
+        cpus = os.cpu_count() or 1
+        self.max_threads = max_threads or max(2, min(4, cpus))
+        # Przy jednym wątku nie ma czego rezerwować
+        self.max_background = max(1, self.max_threads - 1)
+        self.max_processes = max_processes or cpus
+        self._threads = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="job")
+        self._processes = None
+        self._lock = threading.Lock()
+        self._queue = []  # (priorytet, kolejność, zadanie)
+        self._order = itertools.count()
+        self._running = set()
+
+    def create(self, fn, name="", priority=PRIORITY_NORMAL, parent=None):
+        """Zadanie fn(job) bez startu – do podłączenia sygnałów przed job.start()."""
+        return Job(fn, parent, name, priority, service=self)
+
+    def submit(self, fn, name="", priority=PRIORITY_NORMAL, parent=None,
+               on_done=None, on_partial=None, on_progress=None, on_failed=None):
+        """
+        Tworzy zadanie fn(job), podłącza odbiorców i uruchamia je; zwraca Job.
+        Zadanie z rodzicem jest usuwane (deleteLater) po zakończeniu.
+        """
+        job = self.create(fn, name, priority, parent)
+        for signal, slot in ((job.done, on_done), (job.partial, on_partial),
+                             (job.progress, on_progress), (job.failed, on_failed)):
+            if slot is not None:
+                signal.connect(slot)
+        if parent is not None:
+            job.finished.connect(job.deleteLater)
+        return job.start()
+
+    def enqueue(self, job):
+        with self._lock:
+            heapq.heappush(self._queue, (job.priority, next(self._order), job))
+        self._start_next()
+
+    def _start_next(self):
+        # Do puli trafia tylko tyle zadań, ile jest wolnych wątków – kolejność
+        # (priorytety) rozstrzyga się tutaj, a nie w kolejce ThreadPoolExecutor
+        while True:
+            with self._lock:
+                if len(self._running) >= self.max_threads or not self._queue:
+                    return
+                # Kolejka jest posortowana – skoro na czele nie ma HIGH, nie ma go wcale
+                if self._queue[0][0] > PRIORITY_HIGH and self._background_count() >= self.max_background:
+                    return
+                job = heapq.heappop(self._queue)[2]
+                self._running.add(job)
+            self._threads.submit(self._run, job)
+
+    def _run(self, job):
+        job._emit(self.job_started, job)
+        try:
+            job._run()
+        finally:
+            with self._lock:
+                self._running.discard(job)
+            job._emit(self.job_finished, job)
+            self._start_next()
+
+    def _background_count(self):
+        return sum(1 for job in self._running if job.priority > PRIORITY_HIGH)
+
+    def remove_pending(self, job):
+        """Usuwa zadanie z kolejki; False, jeśli już ruszyło (albo się skończyło)."""
+        with self._lock:
+            for i, entry in enumerate(self._queue):
+                if entry[2] is job:
+                    self._queue[i] = self._queue[-1]
+                    self._queue.pop()
+                    heapq.heapify(self._queue)
+                    return True
+        return False
+
+    def running(self):
+        with self._lock:
+            return list(self._running)
+
+    def pending(self):
+        with self._lock:
+            return [entry[2] for entry in sorted(self._queue)]
+
+    def process_pool(self):
+        """Wspólna pula procesów (funkcje i argumenty muszą dać się zpiklować)."""
+        with self._lock:
+            if self._processes is None:
+                # spawn, nie fork: proces z wątkami (Qt, pula, nadzorca) skopiowany
+                # przez fork może zakleszczyć się na odziedziczonej blokadzie
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.max_processes, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._processes
+
+    def map_processes(self, fn, items, name="", priority=PRIORITY_NORMAL, parent=None, **slots):
+        """
+        Uruchamia fn(item) dla każdego elementu w puli procesów.
+
+        Returns:
+            Job – partial: (item, wynik) w kolejności kończenia, progress: procent
+            elementów, done: liczba przetworzonych. Przerwanie anuluje oczekujące.
+        """
+        items = list(items)
+
+        def work(job):
+            if not items:
+                return 0
+            pool = self.process_pool()
+            futures = {pool.submit(fn, item): item for item in items}
+            count = 0
+            try:
+                for future in as_completed(futures):
+                    job.check_cancelled()
+                    job.partial.emit((futures[future], future.result()))
+                    count += 1
+                    job.progress.emit(100 * count // len(items))
+            finally:
+                for future in futures:
+                    future.cancel()
+            return count
+        return self.submit(work, name or getattr(fn, "__name__", ""), priority, parent, **slots)
+
+    def cancel_all(self):
+        for job in self.pending() + self.running():
+            job.cancel()
+
+    def shutdown(self, wait=False):
+        self.cancel_all()
+        self._threads.shutdown(wait=wait)
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait)
+
+_service = None
+
+def job_service():
+    """Wspólna pula programu (tworzona przy pierwszym użyciu)."""
+    global _service
+    if _service is None:
+        _service = JobService()
+    return _service
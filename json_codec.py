@@ -0,0 +1,57 @@
+"""
+Wspólne wczytywanie i zapis JSON.
+
+Parsowanie używa orjson, jeśli jest zainstalowany (pip install orjson),
+inaczej modułu json. Zapis zawsze idzie przez json.dumps – pliki są
+bajt w bajt takie same niezależnie od zainstalowanych pakietów.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BOM = b"\xef\xbb\xbf"
+
+# Nazwa używanego parsera (np. do komunikatów i benchmarku)
+BACKEND = "orjson" if orjson is not None else "json"
+
+def _strip_bom(data):
+    if isinstance(data, bytes):
+        return data[len(BOM):] if data.startswith(BOM) else data
+    return data[1:] if data.startswith("﻿") else data
+
+def loads_stdlib(data):
+    if isinstance(data, (bytes, bytearray)):
+        data = bytes(data).decode("utf-8-sig")
+    return json.loads(_strip_bom(data))
+
+def loads(data):
+    """
+    Parsuje JSON z str albo bytes (BOM jest pomijany).
+
+    orjson nie akceptuje rozszerzeń modułu json (NaN, Infinity, liczby
+    większe niż 64 bity) – wtedy parsowanie jest powtarzane modułem json,
+    więc wynik i błędy są takie jak w bibliotece standardowej.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(_strip_bom(data))
+        except orjson.JSONDecodeError:
+            pass
+    return loads_stdlib(data)
+
+def load(f):
+    """Jak json.load – plik otwarty tekstowo lub binarnie."""
+    return loads(f.read())
+
+def load_path(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+def dumps(obj, **kwargs):
+    return json.dumps(obj, **kwargs)
+
+def dump(obj, f, **kwargs):
+    return json.dump(obj, f, **kwargs)
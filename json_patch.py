@@ -0,0 +1,215 @@
+import os
+import re
+from array import array
+
+import json_codec
+from file_io import atomic_write
+
+# Para "klucz": wartość w płaskim obiekcie.
+# Działa na bajtach – w UTF-8 bajty '"' i '\' nie występują wewnątrz znaków wielobajtowych.
+_PAIR_RE = re.compile(
+    rb'"((?:[^"\\]|\\.)*)"\s*:\s*("(?:[^"\\]|\\.)*"|[^,}\]\s]+)',
+    re.S
+)
+_NON_ASCII_RE = re.compile(rb'[\x80-\xff]')
+
+BOM = b"\xef\xbb\xbf"
+
+class PatchError(Exception):
+    pass
+
+class FileChangedError(PatchError):
+    """Plik zmienił się na dysku od wczytania – zapis nadpisałby te zmiany."""
+
+class EntryOffsets:
+    """
+    Położenie bajtowe każdego wpisu (obiektu) w pliku strings JSON.
+
+    Pozycje są zbierane podczas parsowania; położenie konkretnej wartości
+    wyznaczane jest dopiero przy zapisie, z bajtów jednego obiektu.
+    """
+    def __init__(self, ascii_only=False):
+        self.bases = array('q')
+        self.sizes = array('q')
+        self.ascii_only = ascii_only
+
+    def append(self, base, size):
+        self.bases.append(base)
+        self.sizes.append(size)
+
+    def __len__(self):
+        return len(self.bases)
+
+    def copy(self):
+        # patch_file przesuwa pozycje w miejscu – każdy zapisujący ma własną kopię
+        offsets = EntryOffsets(self.ascii_only)
+        offsets.bases = array('q', self.bases)
+        offsets.sizes = array('q', self.sizes)
+        return offsets
+
+    def to_state(self):
+        return self.bases.tobytes(), self.sizes.tobytes(), self.ascii_only
+
+    @classmethod
+    def from_state(cls, state):
+        bases, sizes, ascii_only = state
+        offsets = cls(ascii_only)
+        offsets.bases.frombytes(bases)
+        offsets.sizes.frombytes(sizes)
+        return offsets
+
+    def _shift(self, patches):
+        # patches: posortowane (wiersz, różnica długości)
+        bases = self.bases
+        delta = 0
+        next_row = 0
+        for row, diff in patches:
+            for r in range(next_row, row + 1):
+                bases[r] += delta
+            next_row = row + 1
+            self.sizes[row] += diff
+            delta += diff
+        if delta:
+            for r in range(next_row, len(bases)):
+                bases[r] += delta
+
+class ByteOffsetTracker:
+    """Przelicza rosnące pozycje znakowe w tekście na pozycje bajtowe w UTF-8."""
+    def __init__(self, text, prefix_bytes=0):
+        self.text = text
+        self._char = 0
+        self._byte = prefix_bytes
+
+    def to_bytes(self, char_pos):
+        self._byte += len(self.text[self._char:char_pos].encode("utf-8"))
+        self._char = char_pos
+        return self._byte
+
+def is_ascii_only(raw):
+    return not _NON_ASCII_RE.search(raw)
+
+def encode_value(value, ascii_only=False):
+    return json_codec.dumps(value, ensure_ascii=ascii_only).encode("utf-8")
+
+def dump_entries(entries, bom=True):
+    """
+    Zapis jak json.dumps(list(entries), indent=2, ensure_ascii=False), ale
+    składany wpis po wpisie (entries może być generatorem), żeby od razu
+    znać położenie każdego wpisu.
+
+    Returns:
+        (bajty pliku, EntryOffsets)
+    """
+    offsets = EntryOffsets()
+    parts = [BOM + b"[\n" if bom else b"[\n"]
+    pos = len(parts[0])
+    for i, entry in enumerate(entries):
+        if i:
+            parts.append(b",\n")
+            pos += 2
+        body = json_codec.dumps(entry, indent=2, ensure_ascii=False).replace("\n", "\n  ").encode("utf-8")
+        parts.append(b"  ")
+        offsets.append(pos + 2, len(body))
+        parts.append(body)
+        pos += 2 + len(body)
+    if not offsets:
+        return (BOM if bom else b"") + b"[]", offsets
+    parts.append(b"\n]")
+    return b"".join(parts), offsets
+
+def file_signature(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+def check_signature(path, signature):
+    """Raises: FileChangedError, jeśli (rozmiar, mtime) pliku jest inny niż przy wczytaniu."""
+    if file_signature(path) != tuple(signature):
+        raise FileChangedError("Plik zmienił się na dysku od wczytania")
+
+def _value_span(obj_bytes, field):
+    # Pozycja wartości pola w bajtach jednego (płaskiego) obiektu
+    name = json_codec.dumps(field, ensure_ascii=False).encode("utf-8")[1:-1]
+    for m in _PAIR_RE.finditer(obj_bytes):
+        if m.group(1) == name:
+            return m.span(2)
+    return None
+
+def patch_file(path, offsets, edits, signature):
+    """
+    Podmienia w pliku tylko bajty zmienionych wartości.
+
+    edits – lista (wiersz, pole, stara wartość, nowa wartość).
+    signature – (rozmiar, mtime) pliku z chwili wczytania. Plik jest
+    sklejany z łatkami w pamięci i podmieniany atomowo (także przy zmianach
+    tej samej długości – czytający nigdy nie widzi pliku w połowie zapisu).
+
+    Returns:
+        nowa sygnatura pliku
+
+    Raises:
+        FileChangedError – inna sygnatura albo inna stara wartość na dysku,
+        PatchError – nietypowy układ pliku (pozycje nie wskazują wartości)
+        albo kilka zmian tej samej wartości.
+    """
+    check_signature(path, signature)
+    with open(path, "rb") as f:
+        raw = f.read()
+    patches = []
+    for row, field, old_value, new_value in edits:
+        if row >= len(offsets):
+            raise PatchError(f"Brak pozycji wiersza {row}")
+        base = offsets.bases[row]
+        obj_bytes = raw[base:base + offsets.sizes[row]]
+        if obj_bytes[:1] != b"{" or obj_bytes[-1:] != b"}":
+            raise PatchError(f"Nieoczekiwana zawartość wiersza {row}")
+        span = _value_span(obj_bytes, field)
+        if span is None:
+            raise PatchError(f"Brak pola {field} w wierszu {row}")
+        if json_codec.loads(obj_bytes[span[0]:span[1]]) != old_value:
+            raise FileChangedError(f"Wartość pola {field} w wierszu {row} zmieniła się na dysku")
+        new = encode_value(new_value, offsets.ascii_only)
+        patches.append((base + span[0], base + span[1], row, new))
+    patches.sort()
+    # Dwie zmiany tej samej wartości sklejone obok siebie dałyby błędny JSON
+    for (_, prev_end, prev_row, _), (start, _, row, _) in zip(patches, patches[1:]):
+        if start < prev_end:
+            raise PatchError(f"Nakładające się zmiany w wierszach {prev_row} i {row}")
+
+    chunks = []
+    pos = 0
+    for start, end, _, new in patches:
+        chunks.append(raw[pos:start])
+        chunks.append(new)
+        pos = end
+    chunks.append(raw[pos:])
+    atomic_write(path, b"".join(chunks))
+
+    offsets._shift([(row, len(new) - (end - start)) for start, end, row, new in patches])
+    return file_signature(path)
+
+def save_edits(path, table, offsets, signature, edits):
+    """
+    Zapisuje zmiany (wiersz, pole, stara, nowa) już naniesione na table:
+    łatkami, a gdy się nie da (nietypowy układ pliku) – pełnym atomowym
+    zapisem tabeli.
+
+    Returns:
+        (nowa sygnatura pliku, EntryOffsets aktualne po zapisie)
+
+    Raises:
+        FileChangedError – plik zmienił się na dysku; nic nie jest zapisywane.
+    """
+    if not edits:
+        return signature, offsets
+    try:
+        if offsets is None:
+            check_signature(path, signature)
+            raise PatchError("Brak pozycji wpisów w pliku")
+        return patch_file(path, offsets, edits, signature), offsets
+    except FileChangedError:
+        raise
+    except PatchError as e:
+        print(f"Zapis pełnego pliku: {e}")
+        raw, offsets = dump_entries(table.iter_entries())
+        atomic_write(path, raw)
+        return file_signature(path), offsets
@@ -0,0 +1,147 @@
+import re
+import json
+
+import json_codec
+from json_patch import EntryOffsets, ByteOffsetTracker, file_signature, is_ascii_only, BOM
+from string_table import StringTable
+
+_WS_RE = re.compile(r'[ \t\n\r]*')
+_BYTES_WS = b" \t\n\r"
+
+# Koniec obiektu na końcu linii (ewentualnie z przecinkiem) albo przed końcowym "]".
+# W łańcuchach JSON nie ma surowych znaków nowej linii, więc takie "}" nie leży w tekście.
+_OBJECT_END_RE = re.compile(rb'\}[ \t]*,?[ \t]*(?:\r?\n|\][ \t\r\n]*\Z)')
+
+def object_offsets(raw, count):
+    """
+    Pozycje bajtowe płaskich obiektów tablicy w pliku z jednym obiektem
+    na linię lub kilka linii (układ plików strings D2R) – bez parsowania.
+
+    Returns:
+        EntryOffsets albo None, jeśli układ pliku jest inny (albo liczba
+        znalezionych obiektów nie zgadza się z count)
+    """
+    ends = [m.start() + 1 for m in _OBJECT_END_RE.finditer(raw)]
+    if len(ends) != count:
+        return None
+    offsets = EntryOffsets(is_ascii_only(raw))
+    pos = len(BOM) if raw.startswith(BOM) else 0
+    separator = b"["
+    for end in ends:
+        start = raw.find(b"{", pos, end)
+        if start == -1 or raw[pos:start].strip(_BYTES_WS) != separator:
+            return None
+        offsets.append(start, end - start)
+        pos = end
+        separator = b","
+    if raw[pos:].strip(_BYTES_WS) != b"]":
+        return None
+    return offsets
+
+def iter_json_array_chunks(text, first_chunk=200, chunk_size=5000):
+    """
+    Parsuje tablicę JSON element po elemencie i zwraca je porcjami.
+
+    Pierwsza porcja jest mała, żeby widok mógł pokazać początek pliku od razu.
+
+    Yields:
+        (lista elementów, lista (początek, koniec) elementów w tekście,
+         pozycja w tekście po porcji)
+
+    Raises:
+        ValueError – tekst nie jest tablicą JSON albo jest uszkodzony.
+    """
+    decoder = json.JSONDecoder()
+    pos = _WS_RE.match(text, 0).end()
+    if text[pos:pos + 1] != "[":
+        raise ValueError("Plik nie zawiera tablicy JSON")
+    pos = _WS_RE.match(text, pos + 1).end()
+    chunk = []
+    spans = []
+    size = first_chunk
+    if text[pos:pos + 1] != "]":
+        while True:
+            start = pos
+            obj, pos = decoder.raw_decode(text, pos)
+            chunk.append(obj)
+            spans.append((start, pos))
+            pos = _WS_RE.match(text, pos).end()
+            char = text[pos:pos + 1]
+            if char == ",":
+                pos = _WS_RE.match(text, pos + 1).end()
+            elif char == "]":
+                break
+            else:
+                raise ValueError(f"Nieoczekiwany znak na pozycji {pos}")
+            if len(chunk) >= size:
+                yield chunk, spans, pos
+                chunk = []
+                spans = []
+                size = chunk_size
+    if _WS_RE.match(text, pos + 1).end() != len(text):
+        raise ValueError(f"Nadmiarowe dane za tablicą JSON (pozycja {pos + 1})")
+    yield chunk, spans, len(text)
+
+class StringsFileReader:
+    """
+    Wczytuje plik strings JSON porcjami do StringTable, zbierając przy tym
+    pozycje bajtowe wpisów (do zapisu łatkami przez patch_file).
+
+    Po przejściu chunks(): offsets (None dla nietypowego pliku) i signature.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.offsets = None
+        self.signature = None
+
+    def chunks(self, first_chunk=200, chunk_size=5000):
+        """
+        Yields:
+            (StringTable z porcją wpisów, postęp 0.0–1.0)
+        """
+        # Sygnatura sprzed odczytu – zmiana pliku w trakcie wyjdzie przy zapisie
+        self.signature = file_signature(self.path)
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        if json_codec.orjson is not None:
+            # Szybki parser: całość naraz, pozycje wpisów z układu linii
+            try:
+                entries = json_codec.loads(raw)
+            except ValueError:
+                entries = None
+            offsets = object_offsets(raw, len(entries)) if isinstance(entries, list) else None
+            if offsets is not None:
+                start = 0
+                size = first_chunk
+                while start < len(entries) or not start:
+                    part = entries[start:start + size]
+                    start += size
+                    size = chunk_size
+                    yield StringTable.from_entries(part), min(1.0, start / max(1, len(entries)))
+                self.offsets = offsets
+                return
+        text = raw.decode("utf-8-sig")
+        offsets = EntryOffsets(is_ascii_only(raw))
+        tracker = ByteOffsetTracker(text, len(BOM) if raw.startswith(BOM) else 0)
+        try:
+            for chunk, spans, pos in iter_json_array_chunks(text, first_chunk, chunk_size):
+                for start, end in spans:
+                    base = tracker.to_bytes(start)
+                    offsets.append(base, tracker.to_bytes(end) - base)
+                yield StringTable.from_entries(chunk), pos / max(1, len(text))
+        except ValueError:
+            # Nietypowy plik – wczytaj w całości standardowo
+            offsets = None
+            yield StringTable.from_entries(json_codec.loads(text)), 1.0
+        self.offsets = offsets
+
+def read_strings_file(path):
+    """
+    Returns:
+        (StringTable, EntryOffsets albo None, sygnatura pliku)
+    """
+    reader = StringsFileReader(path)
+    table = StringTable()
+    for part, _ in reader.chunks():
+        table.extend(part)
+    return table, reader.offsets, reader.signature
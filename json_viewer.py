@@ -1,93 +1,331 @@
-import sys
-import json
+import os
+from bisect import bisect_left
 from PyQt5.QtWidgets import (
-    QDialog, QPlainTextEdit, QDialogButtonBox,
-    QWidget, QVBoxLayout, QPushButton, QTextBrowser, QLabel,
-    QScrollArea, QGroupBox, QGridLayout, QLineEdit, QHBoxLayout
+    QDialog, QPlainTextEdit, QDialogButtonBox, QPushButton, QShortcut,
+    QWidget, QVBoxLayout, QLabel, QLineEdit, QHBoxLayout, QMessageBox,
+    QListView, QAbstractItemView, QStyledItemDelegate, QProgressBar,
+    QFileDialog, QInputDialog, QTextEdit, QFrame
 )
-from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
-
-# Mapowanie kodów kolorów D2R na kolory HTML
-D2R_COLOR_MAP = {
-    "0": "#FFFFFF",  # ÿc0 – White
-    "1": "#FF4D4D",  # ÿc1 – Red
-    "2": "#00FF00",  # ÿc2 – Green
-    "3": "#6969FF",  # ÿc3 – Blue
-    "4": "#C7B377",  # ÿc4 – Light Gold
-    "5": "#696969",  # ÿc5 – Grey
-    "6": "#000000",  # ÿc6 – Black
-    "7": "#D0C27D",  # ÿc7 – Dark Gold
-    "8": "#FFA800",  # ÿc8 – Orange
-    "9": "#FFFF64",  # ÿc9 – Yellow
-    "a": "#008000",  # ÿca – Dark Green
-    "b": "#AE00FF",  # ÿcb – Purple
-    "c": "#00C800",  # ÿcc – Medium Green
-    "A": "#008000",  # ÿcA – Dark Green
-    "B": "#AE00FF",  # ÿcB – Purple
-    "C": "#00C800",  # ÿcC – Medium Green
-
-    # Przybliżone z obrazu (custom, nieoficjalne kody):
-    ";": "#B000B0",  # ÿc; – Purple
-    "=": "#E0E0E0",  # ÿc= – White2
-    ":": "#004400",  # ÿc: – Dark Green2
-    "@": "#FF8800",  # ÿc@ – Orange1
-    "D": "#FFD700",  # ÿcD – Gold2
-    "E": "#FF0000",  # ÿcE – Health Potion Red
-    "F": "#ADD8E6",  # ÿcF – Mana Potion Blue
-    "G": "#FF77FF",  # ÿcG – Rejuvenation Pink
-    "H": "#B8860B",  # ÿcH – Light Gold2
-    "I": "#888888",  # ÿcI – Grey3
-    "J": "#FF6600",  # ÿcJ – Orange3
-    "K": "#999999",  # ÿcK – Grey2
-    "L": "#FFB347",  # ÿcL – Orange4
-    "M": "#FFDCA8",  # ÿcM – Light Gold
-    "N": "#00FFFF",  # ÿcN – Light Blue
-    "O": "#FF69B4",  # ÿcO – Pink
-    "P": "#E0BBE4",  # ÿcP – Pale Violet
-    "Q": "#00DD00",  # ÿcQ – Bright Green
-    "R": "#FFFF00",  # ÿcR – Yellow2
-    "S": "#880000",  # ÿcS – Dark Red
-    "T": "#ADD8E6",  # ÿcT – Sky Blue
-    "U": "#CC0000",  # ÿcU – Rich Red
-    "Y": "#AAAAAA"   # ÿcY – Neutral/Quest Grey
-}
+from PyQt5.QtGui import (
+    QFont, QFontMetrics, QTextDocument, QColor, QPalette, QKeySequence, QTextCursor,
+    QTextOption
+)
+from PyQt5.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QSize, QRect, QEvent, QTimer,
+    QPoint, pyqtSignal
+)
+
+from d2r_text import (
+    D2R_CODE_RE, MAX_TEXT_LEN, LRUCache, IncrementalD2RText,
+    render_d2r_html
+)
+from search_index import TrigramIndex, SearchCancelled, linear_search
+from jobs import Job, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+from file_io import atomic_write
+from json_patch import PatchError, FileChangedError, check_signature, patch_file, dump_entries, file_signature
+from json_stream import StringsFileReader
+from document_cache import document_cache
+from translation_io import export_table, read_translations, merge_translations
+from string_table import StringTable
 
 D2R_FONT_NAME = ""
 
 def format_d2r_text(text):
-    if not text:
-        return ""
-    lines = text.split("\n")[::-1]  # odwróć kolejność linii
-    result = ""
-    current_color = "#FFFFFF"
-    for line in lines:
-        i = 0
-        while i < len(line):
-            if line[i:i+2] == "ÿc" and i + 2 < len(line):
-                color_code = line[i+2]
-                current_color = D2R_COLOR_MAP.get(color_code, current_color)
-                i += 3
-            else:
-                segment = line[i].replace("%", "%%")
-                result += f'<span style="color: {current_color};">{segment}</span>'
-                i += 1
-        result += "<br>"
-    wrapped = f'<div style="font-family: {D2R_FONT_NAME}; font-size: 14pt; text-align: center; background-color: rgba(0, 0, 0, 0.8); padding: 5px; border-radius: 4px;">{result}</div>'
-    return wrapped
+    return render_d2r_html(text, D2R_FONT_NAME)
+
+class D2RPreview(QTextEdit):
+    """
+    Podgląd tekstu tak, jak wyświetli go gra: jeden blok dokumentu na linię
+    (ostatnia linia na górze). Przy edycji podmieniane są tylko bloki linii,
+    które zmieniły się w IncrementalD2RText.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setMinimumHeight(80)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 0.8); border-radius: 4px; padding: 5px;")
+        self.document().setDefaultFont(QFont(D2R_FONT_NAME, 14))
+        self.document().setDefaultTextOption(QTextOption(Qt.AlignCenter))
+        self._lines = 0  # liczba linii tekstu w podglądzie
+
+    def apply(self, state, start, removed, first, stop):
+        """
+        Odświeża podgląd po state.replace_lines(start, removed, ...), które
+        zwróciło zakres (first, stop).
+        """
+        # Linie przed start mają te same numery przed i po zmianie
+        old_stop = start + removed
+        block = self._lines - old_stop
+        count = old_stop - first
+        if not self._lines:
+            block, count = 0, 1  # pusty blok nowego dokumentu
+        htmls = [state.line_html(i) for i in range(stop - 1, first - 1, -1)]
+        self._replace_blocks(block, count, htmls)
+        self._lines = len(state.lines)
+
+    def _replace_blocks(self, block, count, htmls):
+        doc = self.document()
+        cursor = QTextCursor(doc)
+        cursor.beginEditBlock()
+        if count:
+            cursor.setPosition(doc.findBlockByNumber(block).position())
+            last = doc.findBlockByNumber(block + count - 1)
+            cursor.setPosition(last.position() + last.length() - 1, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+            if htmls:
+                for i, html in enumerate(htmls):
+                    if i:
+                        cursor.insertBlock()
+                    cursor.insertHtml(html)
+            elif block + count < self._lines:
+                cursor.deleteChar()  # zostaje pusty blok – usuwa go razem z separatorem
+            elif block:
+                cursor.deletePreviousChar()
+        elif block < self._lines:
+            cursor.setPosition(doc.findBlockByNumber(block).position())
+            for html in htmls:
+                cursor.insertHtml(html)
+                cursor.insertBlock()
+        else:
+            cursor.movePosition(QTextCursor.End)
+            for html in htmls:
+                cursor.insertBlock()
+                cursor.insertHtml(html)
+        cursor.endEditBlock()
+
+# Języki wyświetlane w widoku (kolejność wierszy w karcie wpisu)
+VIEW_LANGS = ["enUS", "plPL"]
+
+EntryRole = Qt.UserRole + 1
+
+class EntryListModel(QAbstractListModel):
+    """
+    Model listy wpisów – widok pyta tylko o wiersze, które są widoczne.
+    Trzyma tabelę kolumnową i listę jej wierszy po filtrowaniu.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table = StringTable()
+        self._rows = range(0)
+
+    def set_rows(self, table, rows):
+        self.beginResetModel()
+        self.table = table
+        self._rows = rows
+        self.endResetModel()
+
+    def table_row(self, row):
+        return self._rows[row]
+
+    def show_appended_rows(self):
+        # Tabela urosła (wczytywanie w tle), a model pokazuje wszystkie wiersze
+        first = len(self._rows)
+        last = len(self.table)
+        if last > first:
+            self.beginInsertRows(QModelIndex(), first, last - 1)
+            self._rows = range(last)
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == EntryRole:
+            return row
+        if role == Qt.DisplayRole:
+            return f"Key: {self.table.get(row, 'Key', '')} (ID: {self.table.get(row, 'id', '')})"
+        return None
+
+    def refresh_row(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+class EntryDelegate(QStyledItemDelegate):
+    """
+    Rysuje kartę wpisu (nagłówek + podgląd enUS/plPL + przycisk Edytuj)
+    bezpośrednio na viewporcie – bez tworzenia widgetów dla każdego wpisu.
+    """
+    MARGIN = 6
+    LABEL_WIDTH = 60
+    BUTTON_WIDTH = 70
+    BUTTON_HEIGHT = 24
+    SPACING = 6
+
+    edit_requested = pyqtSignal(int, str)
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        # Gotowe dokumenty widocznych wierszy i zmierzone wysokości tekstów,
+        # klucz: (tekst, czcionka, szerokość)
+        self._documents = LRUCache(256)
+        self._heights = LRUCache(65536)
+        self._metrics = None
+        self._metrics_font = None
+
+    def _text_width(self, row_width):
+        return max(50, row_width - 2 * self.MARGIN - self.LABEL_WIDTH - self.BUTTON_WIDTH - 2 * self.SPACING)
+
+    def _header_height(self):
+        return self.view.fontMetrics().height() + 8
+
+    def _document(self, text, width):
+        key = (text, D2R_FONT_NAME, width)
+        doc = self._documents.get(key)
+        if doc is None:
+            doc = QTextDocument()
+            doc.setDefaultFont(QFont(D2R_FONT_NAME, 14))
+            doc.setHtml(format_d2r_text(text))
+            doc.setTextWidth(width)
+            self._documents.put(key, doc)
+        self._heights.put(key, int(doc.size().height()))
+        return doc
+
+    def _font_metrics(self):
+        if self._metrics_font != D2R_FONT_NAME:
+            self._metrics = QFontMetrics(QFont(D2R_FONT_NAME, 14))
+            self._metrics_font = D2R_FONT_NAME
+        return self._metrics
+
+    def _estimate_text_height(self, text, width):
+        # Szacowanie z metryk czcionki – bez układania dokumentu
+        fm = self._font_metrics()
+        lines = 1  # format_d2r_text dokłada <br> po ostatniej linii
+        for line in text.split("\n"):
+            advance = fm.horizontalAdvance(D2R_CODE_RE.sub("", line))
+            lines += max(1, -(-advance // max(1, width - 10)))
+        return lines * fm.lineSpacing() + 18
+
+    def _text_height(self, text, width):
+        # Zmierzona wysokość (jeśli wiersz był już rysowany), inaczej szacunek
+        height = self._heights.get((text, D2R_FONT_NAME, width))
+        if height is None:
+            height = self._estimate_text_height(text, width)
+        return max(self.BUTTON_HEIGHT, height)
+
+    def _lang_texts(self, index):
+        # (język, tekst) dla języków obecnych we wpisie
+        table = index.model().table
+        row = index.data(EntryRole)
+        texts = []
+        for lang in VIEW_LANGS:
+            text = table.get(row, lang)
+            if text is not None:
+                texts.append((lang, str(text)))
+        return texts
+
+    def sizeHint(self, option, index):
+        width = self.view.viewport().width()
+        text_width = self._text_width(width - 4)
+        height = self._header_height() + self.MARGIN
+        for _, text in self._lang_texts(index):
+            height += self._text_height(text, text_width) + self.SPACING
+        return QSize(width, height + self.MARGIN)
+
+    def _layout(self, rect, index):
+        # Zwraca listę (lang, tekst, prostokąt tekstu, prostokąt przycisku)
+        text_width = self._text_width(rect.width())
+        y = rect.top() + self._header_height() + self.MARGIN
+        rows = []
+        for lang, text in self._lang_texts(index):
+            height = self._text_height(text, text_width)
+            text_rect = QRect(rect.left() + self.MARGIN + self.LABEL_WIDTH + self.SPACING, y, text_width, height)
+            button_rect = QRect(text_rect.right() + self.SPACING, y, self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+            rows.append((lang, text, text_rect, button_rect))
+            y += height + self.SPACING
+        return rows
+
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        painter.save()
+        painter.setPen(QColor("#888"))
+        painter.drawRoundedRect(rect, 4, 4)
+        header_rect = QRect(rect.left() + self.MARGIN, rect.top() + 2,
+                            rect.width() - 2 * self.MARGIN, self._header_height())
+        painter.setPen(option.palette.color(QPalette.WindowText))
+        painter.drawText(header_rect, Qt.AlignLeft | Qt.AlignVCenter, index.data(Qt.DisplayRole))
+
+        remeasured = False
+        for lang, text, text_rect, button_rect in self._layout(rect, index):
+            key = (text, D2R_FONT_NAME, text_rect.width())
+            if self._heights.get(key) is None:
+                remeasured = True
+            doc = self._document(text, text_rect.width())
+            label_rect = QRect(rect.left() + self.MARGIN, text_rect.top(), self.LABEL_WIDTH, self.BUTTON_HEIGHT)
+            painter.setPen(option.palette.color(QPalette.WindowText))
+            painter.drawText(label_rect, Qt.AlignLeft | Qt.AlignVCenter, f"{lang}:")
+
+            painter.save()
+            painter.translate(text_rect.topLeft())
+            painter.setClipRect(QRect(0, 0, text_rect.width(), text_rect.height()))
+            doc.drawContents(painter)
+            painter.restore()
+
+            painter.setPen(QColor("#888"))
+            painter.setBrush(QColor("#444"))
+            painter.drawRect(button_rect.adjusted(0, 0, -1, -1))
+            painter.setPen(QColor("white"))
+            painter.drawText(button_rect, Qt.AlignCenter, "Edytuj")
+        painter.restore()
+        if remeasured:
+            # Szacunek zastąpiony pomiarem – widok musi przeliczyć wysokość wiersza
+            self.sizeHintChanged.emit(index)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            for lang, _, _, button_rect in self._layout(option.rect.adjusted(2, 2, -2, -2), index):
+                if button_rect.contains(event.pos()):
+                    self.edit_requested.emit(index.row(), lang)
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+# Zadania w tle idą do wspólnej, ograniczonej puli (jobs.py); nazwa zostaje dla
+# modułów i wtyczek, które ją importują
+BackgroundTask = Job
 
 class JsonLangViewer(QWidget):
+    SEARCH_DELAY_MS = 200
+    SCROLL_RESTORE_ATTEMPTS = 20
+
+    # Emitowany przy zmianie stanu "niezapisane zmiany" (np. dla tytułu zakładki)
+    dirty_changed = pyqtSignal(bool)
+    # Emitowany po wczytaniu całego pliku
+    loaded = pyqtSignal()
+    # Emitowany po zapisie pliku (ścieżka)
+    saved = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("D2R JSON Language Viewer")
         self.setAcceptDrops(True)
         self.resize(900, 700)
 
-        self.page = 0
-        self.entries_per_page = 100
-        self.all_data = []
-        self.filtered_data = []
-        self.current_entries = []
+        # Wczytany plik w formie kolumnowej i wiersze widoczne po filtrowaniu
+        self.table = StringTable()
+        self.filtered_rows = range(0)
+        self.json_path = None
+
+        # Edycje trzymane w pamięci: (wiersz, język) -> wartość zapisana na dysku
+        self.pending_edits = {}
+        self._was_dirty = False
+        self._conflict_prompt = False
+        # Pozycje bajtowe wpisów w pliku – zapis podmienia tylko zmienione wartości
+        self.offsets = None
+        self.file_signature = None
+
+        # Indeks wyszukiwania budowany w tle po wczytaniu pliku
+        self.search_index = TrigramIndex()
+        self._last_search = None  # (zapytanie, wiersze) – do zawężania wyniku
+        self._search_task = None
+        self._index_task = None
+        self._load_task = None
+        self._tasks = set()
+        # Wiersz tabeli do przewinięcia po wczytaniu (przywracanie sesji)
+        self._pending_top_row = None
 
         layout = QVBoxLayout(self)
 
@@ -95,28 +333,58 @@ class JsonLangViewer(QWidget):
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Szukaj w Key, ID, enUS, plPL...")
-        self.search_input.textChanged.connect(self.filter_entries)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.filter_entries)
+        self.search_input.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(self.search_input)
-
-        # PAGINACJA - przyciski
-        self.prev_button = QPushButton("Poprzednia strona")
-        self.next_button = QPushButton("Następna strona")
-        self.prev_button.clicked.connect(self.prev_page)
-        self.next_button.clicked.connect(self.next_page)
-        search_layout.addWidget(self.prev_button)
-        search_layout.addWidget(self.next_button)
-
+        self.count_label = QLabel("")
+        search_layout.addWidget(self.count_label)
+        self.save_button = QPushButton("Zapisz")
+        self.save_button.setEnabled(False)
+        self.save_button.clicked.connect(self.save_changes)
+        search_layout.addWidget(self.save_button)
+        self.export_button = QPushButton("Eksport")
+        self.export_button.setToolTip("Eksport kolumny językowej do CSV/XLIFF")
+        self.export_button.clicked.connect(self.export_translations)
+        search_layout.addWidget(self.export_button)
+        self.import_button = QPushButton("Import")
+        self.import_button.setToolTip("Import tłumaczeń z CSV/XLIFF (łączenie po id i Key)")
+        self.import_button.clicked.connect(self.import_translations)
+        search_layout.addWidget(self.import_button)
         layout.addLayout(search_layout)
 
+        save_shortcut = QShortcut(QKeySequence.Save, self)
+        save_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+        save_shortcut.activated.connect(self.save_changes)
+
         self.file_label = QLabel("Brak wczytanego pliku")
         layout.addWidget(self.file_label)
 
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll.setWidget(self.scroll_content)
-        layout.addWidget(self.scroll)
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.hide()
+        layout.addWidget(self.load_progress)
+
+        # LISTA WPISÓW – model + delegat, przewijanie ciągłe zamiast stron
+        self.model = EntryListModel(self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.delegate = EntryDelegate(self.list_view)
+        self.delegate.edit_requested.connect(self.on_edit_requested)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.list_view.setResizeMode(QListView.Adjust)
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(200)
+        self.list_view.setUniformItemSizes(False)
+        layout.addWidget(self.list_view)
+
+        self.empty_label = QLabel("Brak wyników.")
+        self.empty_label.hide()
+        layout.addWidget(self.empty_label)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -130,109 +398,262 @@ class JsonLangViewer(QWidget):
             if path.endswith(".json"):
                 self.load_json(path)
 
+    def _create_task(self, fn, on_done, priority=PRIORITY_NORMAL):
+        task = Job(fn, self, priority=priority)
+        task.done.connect(on_done)
+        task.finished.connect(lambda t=task: self._on_task_finished(t))
+        self._tasks.add(task)
+        return task
+
+    def _on_task_finished(self, task):
+        # Każde wyszukiwanie to nowe zadanie – zakończone nie może zostać dzieckiem widoku
+        self._tasks.discard(task)
+        if self._search_task is task:
+            self._search_task = None
+        if self._index_task is task:
+            self._index_task = None
+        task.deleteLater()
+
+    def _start_task(self, fn, on_done, priority=PRIORITY_NORMAL):
+        task = self._create_task(fn, on_done, priority)
+        task.start()
+        return task
+
+    def cancel_tasks(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    def shutdown(self):
+        """Przerywa pracę w tle (np. przy zamknięciu zakładki)."""
+        self.search_timer.stop()
+        self.cancel_tasks()
+        self._load_task = None
+
+    def release(self):
+        """Przerywa pracę w tle przed usunięciem widoku (bez czekania w wątku GUI)."""
+        self.shutdown()
+        for task in self._tasks:
+            task.detach()
+        self._tasks.clear()
+
+    def is_loading(self):
+        return self._load_task is not None
+
+    def memory_usage(self):
+        """Przybliżone zużycie pamięci przez wczytany plik i indeks wyszukiwania."""
+        return self.table.nbytes() + self.search_index.nbytes()
+
+    def rebuild_search_index(self):
+        if self._index_task is not None:
+            self._index_task.cancel()
+        self.search_index = TrigramIndex()
+        self._last_search = None
+        index = self.search_index
+        table = self.table
+
+        def build(task):
+            index.build(table, task.is_cancelled)
+            return index
+        self._index_task = self._start_task(build, self.on_search_index_ready, PRIORITY_LOW)
+
+    def on_search_index_ready(self, index):
+        if index is self.search_index and self.search_input.text():
+            self.filter_entries()
+
     def filter_entries(self):
         query = self.search_input.text().lower()
-        # Wyszukiwanie działa na ALL_DATA!
-        def matches(entry):
-            return any(query in str(entry.get(k, '')).lower()
-                       for k in ['Key', 'id', 'enUS', 'plPL'])
-        self.filtered_data = [entry for entry in self.all_data if matches(entry)] if query else self.all_data
-        self.page = 0
+        if self.is_loading():
+            return  # wyszukiwanie ruszy po wczytaniu całego pliku
+        if self._search_task is not None:
+            self._search_task.cancel()
+            self._search_task = None
+        if not query:
+            self._last_search = None
+            self.filtered_rows = range(len(self.table))
+            self.populate_view()
+            return
+
+        # Wyszukiwanie działa na ALL_DATA – w wątku, z indeksem jeśli gotowy
+        index = self.search_index
+        table = self.table
+        previous = self._last_search
+
+        def search(task):
+            if index.ready:
+                rows = index.search(query, previous, task.is_cancelled)
+            else:
+                rows = linear_search(table, query, is_cancelled=task.is_cancelled)
+            return table, query, rows
+        self._search_task = self._start_task(search, self.on_search_results, PRIORITY_HIGH)
+
+    def on_search_results(self, result):
+        table, query, rows = result
+        if table is not self.table or query != self.search_input.text().lower():
+            return
+        self._last_search = (query, rows)
+        self.filtered_rows = rows
         self.populate_view()
 
     def load_json(self, path=None):
+        """Wczytuje plik w tle; wpisy pojawiają się w widoku porcjami."""
         if path:
             self.json_path = path
-        self.file_label.setText(f"Załadowano plik: {path}")
-        try:
-            with open(path, encoding="utf-8-sig") as f:
-                data = json.load(f)
-        except Exception as e:
-            print(f"Błąd: {e}")
-            return
-
-        self.all_data = data
-        self.filtered_data = data
-        self.page = 0
+        path = self.json_path
+        self.shutdown()
+
+        self.table = StringTable()
+        self.filtered_rows = range(0)
+        self.offsets = None
+        self.pending_edits = {}
+        self._last_search = None
+        self._pending_top_row = None
+        self._update_dirty_state()
+        self.file_label.setText(f"Wczytywanie pliku: {path}")
         self.populate_view()
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+
+        def load(task):
+            # Plik wczytany wcześniej (inna zakładka, indeks, wtyczka) – bez parsowania
+            cached = document_cache.cached_strings(path)
+            if cached is not None:
+                table, offsets, signature = cached
+                task.partial.emit(table)
+                return offsets, signature, True
+            reader = StringsFileReader(path)
+            for part, done in reader.chunks():
+                if task.is_cancelled():
+                    raise SearchCancelled()
+                task.partial.emit(part)
+                task.progress.emit(int(100 * done))
+            return reader.offsets, reader.signature, False
+
+        # Sygnały podłączone przed startem – pierwsza porcja nie może przepaść
+        task = self._create_task(load, lambda result: self.on_load_finished(task, result))
+        task.partial.connect(lambda chunk: self.on_entries_loaded(task, chunk))
+        task.progress.connect(self.load_progress.setValue)
+        task.failed.connect(lambda error: self.on_load_failed(task, error))
+        self._load_task = task
+        task.start()
+
+    def on_entries_loaded(self, task, part):
+        if task is not self._load_task:
+            return
+        if not len(self.table) and not self.table.columns:
+            # Pierwsza porcja (albo cała tabela z cache) staje się tabelą widoku
+            self.table = self.model.table = part
+        else:
+            self.table.extend(part)
+        self.filtered_rows = range(len(self.table))
+        self.model.show_appended_rows()
+        self._update_view_state()
+
+    def on_load_finished(self, task, result):
+        if task is not self._load_task:
+            return
+        self.offsets, self.file_signature, from_cache = result
+        self._load_task = None
+        if not from_cache:
+            path, signature = self.json_path, self.file_signature
+            document_cache.put_strings(path, signature, self.table, self.offsets)
+            # Zapis do cache na dysku – następne uruchomienie nie parsuje pliku
+            self._start_task(lambda task: document_cache.persist_strings(path, signature),
+                             lambda _: None, PRIORITY_LOW)
+        self.load_progress.hide()
+        self._update_dirty_state()
+        self.rebuild_search_index()
+        if self.search_input.text():
+            self.filter_entries()
+        else:
+            self._apply_pending_scroll()
+        self.loaded.emit()
+
+    def on_load_failed(self, task, error):
+        if task is not self._load_task:
+            return
+        self._load_task = None
+        self.load_progress.hide()
+        print(f"Błąd: {error}")
+        self.file_label.setText(f"Błąd wczytywania pliku: {self.json_path} ({error})")
 
     def populate_view(self):
-        self.current_entries = []
-        for i in reversed(range(self.scroll_layout.count())):
-            widget = self.scroll_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.deleteLater()
-
-        data = self.filtered_data
-        start = self.page * self.entries_per_page
-        stop = start + self.entries_per_page
-        page_entries = data[start:stop]
-        if not page_entries:
-            l = QLabel("Brak wyników.")
-            self.scroll_layout.addWidget(l)
+        self.model.set_rows(self.table, self.filtered_rows)
+        self.list_view.scrollToTop()
+        self._update_view_state()
+        if not self.is_loading():
+            self._apply_pending_scroll()
+
+    def top_row(self):
+        """Wiersz tabeli widoczny na górze listy (albo None)."""
+        index = self.list_view.indexAt(QPoint(0, 0))
+        return self.model.table_row(index.row()) if index.isValid() else None
+
+    def view_state(self):
+        """Stan zakładki do zapamiętania: plik, wyszukiwanie, przewinięcie."""
+        return {
+            "path": self.json_path,
+            "query": self.search_input.text(),
+            "top_row": self.top_row() if self._pending_top_row is None else self._pending_top_row,
+        }
+
+    def restore_view_state(self, state):
+        """Wczytuje plik ze stanu z view_state(); przewija po wczytaniu/wyszukaniu."""
+        self.search_input.blockSignals(True)
+        self.search_input.setText(state.get("query") or "")
+        self.search_input.blockSignals(False)
+        self.load_json(state["path"])
+        self._pending_top_row = state.get("top_row")
+
+    def _apply_pending_scroll(self):
+        top_row = self._pending_top_row
+        if top_row is None:
             return
+        self._pending_top_row = None
+        # Wiersze po filtrowaniu są posortowane – pozycja na liście przez bisekcję
+        rows = self.filtered_rows
+        position = bisect_left(rows, top_row)
+        if position < len(rows):
+            self._scroll_to_position(position, self.SCROLL_RESTORE_ATTEMPTS)
+
+    def _scroll_to_position(self, position, attempts, stable=0):
+        # Widok układa wiersze porcjami (Batched), więc wiersz po scrollTo jeszcze
+        # się przesuwa – kończymy, gdy dwa kolejne sprawdzenia pokażą go na górze
+        if position >= self.model.rowCount():
+            return
+        if self.list_view.indexAt(QPoint(0, 0)).row() == position:
+            stable += 1
+            if stable >= 2:
+                return
+        else:
+            stable = 0
+            self.list_view.scrollTo(self.model.index(position), QAbstractItemView.PositionAtTop)
+        if attempts > 0:
+            QTimer.singleShot(50, lambda: self._scroll_to_position(position, attempts - 1, stable))
+
+    def _update_view_state(self):
+        self.empty_label.setVisible(not self.filtered_rows and not self.is_loading())
+        self.list_view.setVisible(bool(self.filtered_rows))
+        self.count_label.setText(f"{len(self.filtered_rows)}/{len(self.table)}")
+
+    def on_edit_requested(self, row, lang):
+        if self.is_loading():
+            return
+        self.open_edit_dialog(self.model.table_row(row), lang, row)
 
-        for entry in page_entries:
-            group_box = QGroupBox(f"Key: {entry.get('Key', '')} (ID: {entry.get('id', '')})")
-            group_layout = QGridLayout()
-            group_layout.setColumnStretch(1, 1)
-
-            for idx, lang in enumerate(["enUS", "plPL"]):
-                if lang in entry:
-                    label = QLabel(f"{lang}:")
-                    browser = QTextBrowser()
-                    browser.setFont(QFont(D2R_FONT_NAME, 14))
-                    browser.setHtml(format_d2r_text(entry[lang]))
-                    browser.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-                    browser.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-                    browser.setSizeAdjustPolicy(QTextBrowser.AdjustToContents)
-                    browser.setMinimumHeight(10)
-                    browser.setMaximumHeight(16777215)
-                    browser.document().setTextWidth(browser.viewport().width())
-                    doc_height = int(browser.document().size().height()) + 10
-                    browser.setMinimumHeight(doc_height)
-                    browser.setMaximumHeight(doc_height)
-
-                    edit_button = QPushButton("Edytuj")
-                    edit_button.setStyleSheet("color: white; background-color: #444; border: 1px solid #888; padding: 2px;")
-                    edit_button.clicked.connect(lambda checked, e=entry, l=lang, b=browser: self.open_edit_dialog(e, l, b))
-
-                    group_layout.addWidget(label, idx, 0, alignment=Qt.AlignTop)
-                    group_layout.addWidget(browser, idx, 1)
-                    group_layout.addWidget(edit_button, idx, 2, alignment=Qt.AlignTop)
-
-            group_box.setLayout(group_layout)
-            self.scroll_layout.addWidget(group_box)
-            self.current_entries.append((entry, group_box))
-
-        # Pokaż/ukryj przyciski paginacji zależnie od ilości wpisów
-        total = len(self.filtered_data)
-        self.prev_button.setEnabled(self.page > 0)
-        self.next_button.setEnabled((self.page + 1) * self.entries_per_page < total)
-
-    def next_page(self):
-        if (self.page + 1) * self.entries_per_page < len(self.filtered_data):
-            self.page += 1
-            self.populate_view()
-
-    def prev_page(self):
-        if self.page > 0:
-            self.page -= 1
-            self.populate_view()
-
-    from PyQt5.QtWidgets import QDialog, QPlainTextEdit, QDialogButtonBox
-
-    def open_edit_dialog(self, entry, lang, browser):
+    def open_edit_dialog(self, row, lang, view_row=None):
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Edytuj {lang}")
         layout = QVBoxLayout(dialog)
 
         editor = QPlainTextEdit()
-        editor.setPlainText(entry[lang])
+        editor.setPlainText(self.table.get(row, lang, ""))
         editor.setMinimumHeight(200)
         layout.addWidget(editor)
 
-        MAX_LEN = 481
+        # Podgląd tekstu tak, jak wyświetli go gra
+        preview = D2RPreview()
+        layout.addWidget(preview)
+
         footer_widget = QWidget()
         footer_layout = QVBoxLayout(footer_widget)
         footer_layout.setContentsMargins(0, 0, 0, 0)
@@ -246,49 +667,273 @@ class JsonLangViewer(QWidget):
         footer_layout.addWidget(warn_label)
         layout.addWidget(footer_widget)
 
-        def update_counter():
-            text = editor.toPlainText()
-            count = len(text) + text.count('\n')
-            counter_label.setText(f"{count}/{MAX_LEN}")
-            if count > MAX_LEN:
+        # Po każdej zmianie przetwarzane są tylko zmienione bloki dokumentu
+        document = editor.document()
+        state = IncrementalD2RText(editor.toPlainText())
+        preview.apply(state, 0, 0, 0, len(state.lines))
+
+        def update_labels():
+            counter_label.setText(f"{state.length}/{MAX_TEXT_LEN}")
+            if state.too_long():
                 error_label.setText("Przekroczyłeś dozwoloną liczbę znaków")
             else:
                 error_label.setText("")
 
-            lines = text.split('\n')
-            warn_lines = []
-            for idx, line in enumerate(lines, 1):
-                if line.strip() and not line.lstrip().startswith('ÿc'):
-                    warn_lines.append(str(idx))
+            warn_lines = state.missing_color_lines()
             if warn_lines:
                 warn_label.setText(
-                    f'Brak kodu koloru w linii/liniach: {", ".join(warn_lines)}'
+                    f'Brak kodu koloru w linii/liniach: {", ".join(map(str, warn_lines))}'
                 )
             else:
                 warn_label.setText("")
 
-        editor.textChanged.connect(update_counter)
-        update_counter()
+        def on_contents_change(position, removed, added):
+            first = document.findBlock(position).blockNumber()
+            end = min(position + added, document.characterCount() - 1)
+            last = document.findBlock(end).blockNumber()
+            # Ile linii przed zmianą zajmował ten fragment
+            old_count = last - first + 1 - (document.blockCount() - len(state.lines))
+            new_lines = [document.findBlockByNumber(i).text() for i in range(first, last + 1)]
+            changed = state.replace_lines(first, old_count, new_lines)
+            preview.apply(state, first, old_count, *changed)
+            update_labels()
+
+        document.contentsChange.connect(on_contents_change)
+        update_labels()
 
         buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
         layout.addWidget(buttons)
-        buttons.accepted.connect(lambda: self.save_edit(dialog, editor, entry, lang, browser))
+        buttons.accepted.connect(lambda: self.save_edit(dialog, editor, row, lang, view_row))
         buttons.rejected.connect(dialog.reject)
         dialog.exec_()
 
-    def save_edit(self, dialog, editor, entry, lang, browser):
-        new_text = editor.toPlainText()
+    def save_edit(self, dialog, editor, row, lang, view_row=None):
+        # Edycja tylko w pamięci – zapis na dysk dopiero przez "Zapisz"
+        self.apply_edit(row, lang, editor.toPlainText(), view_row)
+        dialog.accept()
+
+    def _set_value(self, row, lang, new_text):
+        old_text = self.table.get(row, lang)
+        if old_text == new_text:
+            return False
+        key = (row, lang)
+        if key not in self.pending_edits:
+            self.pending_edits[key] = old_text
+        self.table.set(row, lang, new_text)
+        if self.pending_edits[key] == new_text:
+            del self.pending_edits[key]  # powrót do wartości z dysku
+        return True
+
+    def apply_edit(self, row, lang, new_text, view_row=None):
+        if not self._set_value(row, lang, new_text):
+            return
+        self.search_index.update_row(row, self.table)
+        self._last_search = None
+        self._update_dirty_state()
+        if view_row is not None and view_row < self.model.rowCount():
+            self.model.refresh_row(view_row)
+            self.delegate.sizeHintChanged.emit(self.model.index(view_row))
+
+    def apply_edits(self, edits):
+        """Wiele zmian naraz (np. import) – indeks i widok odświeżane raz."""
+        changed = sum(self._set_value(row, lang, new) for row, lang, _, new in edits)
+        if changed:
+            self._update_dirty_state()
+            self.rebuild_search_index()
+            self.filter_entries()
+        return changed
+
+    def _choose_lang(self, title):
+        langs = list(self.table.columns)
+        if not langs:
+            return None
+        current = langs.index("plPL") if "plPL" in langs else 0
+        lang, ok = QInputDialog.getItem(self, title, "Język:", langs, current, False)
+        return lang if ok else None
+
+    def export_translations(self):
+        if not self.json_path or self.is_loading():
+            return
+        lang = self._choose_lang("Eksport tłumaczeń")
+        if not lang:
+            return
+        out_path, _ = QFileDialog.getSaveFileName(
+            self, "Eksport tłumaczeń", f"{os.path.splitext(self.json_path)[0]}_{lang}.csv",
+            "CSV (*.csv);;XLIFF (*.xliff *.xlf)"
+        )
+        if not out_path:
+            return
+        try:
+            export_table(self.table, lang, out_path, os.path.basename(self.json_path))
+        except Exception as e:
+            print(f"Błąd eksportu: {e}")
+            QMessageBox.critical(self, "Błąd", f"Nie udało się wyeksportować: {e}")
+
+    def import_translations(self):
+        """Import trafia do niezapisanych zmian – zapis atomowy przez "Zapisz"."""
+        if not self.json_path or self.is_loading():
+            return
+        lang = self._choose_lang("Import tłumaczeń")
+        if not lang:
+            return
+        in_path, _ = QFileDialog.getOpenFileName(
+            self, "Import tłumaczeń", os.path.dirname(self.json_path),
+            "CSV/XLIFF (*.csv *.xliff *.xlf)"
+        )
+        if not in_path:
+            return
+        try:
+            edits, unmatched = merge_translations(self.table, lang, read_translations(in_path, lang))
+        except Exception as e:
+            print(f"Błąd importu: {e}")
+            QMessageBox.critical(self, "Błąd", f"Nie udało się zaimportować: {e}")
+            return
+        changed = self.apply_edits(edits)
+        QMessageBox.information(
+            self, "Import tłumaczeń",
+            f"Zmienionych wpisów: {changed}\nNiedopasowanych wierszy: {unmatched}\n"
+            "Zmiany zapiszesz przyciskiem \"Zapisz\"."
+        )
+
+    def dirty_rows(self):
+        return {row for row, _ in self.pending_edits}
+
+    def _update_dirty_state(self):
+        dirty = bool(self.pending_edits)
+        self.save_button.setEnabled(dirty)
+        if dirty:
+            self.file_label.setText(f"Załadowano plik: {self.json_path} (niezapisane zmiany: {len(self.dirty_rows())})")
+        else:
+            self.file_label.setText(f"Załadowano plik: {self.json_path}")
+        if dirty != self._was_dirty:
+            self._was_dirty = dirty
+            self.dirty_changed.emit(dirty)
+
+    def has_unsaved_changes(self):
+        return bool(self.pending_edits)
+
+    def reload_if_changed(self):
+        """
+        Po zmianie pliku na dysku wczytuje go ponownie, z zachowaniem wyszukiwania
+        i przewinięcia. Własny zapis (ta sama sygnatura) jest pomijany. Przy
+        niezapisanych zmianach użytkownik wybiera: wczytać ponownie (porzucając
+        zmiany) albo nadpisać plik; po anulowaniu zmiany zostają w zakładce,
+        a zapis zapyta ponownie.
+
+        Returns:
+            True, jeśli plik jest wczytywany ponownie.
+        """
+        try:
+            signature = file_signature(self.json_path)
+        except OSError:
+            self.file_label.setText(f"Plik usunięty z dysku: {self.json_path}")
+            return False
+        if signature == self.file_signature and not self.is_loading():
+            return False
+        if self.has_unsaved_changes():
+            choice = self.resolve_disk_conflict()
+            if choice is None and self.has_unsaved_changes():
+                self.file_label.setText(
+                    f"Plik zmienił się na dysku: {self.json_path} "
+                    f"(niezapisane zmiany: {len(self.dirty_rows())} – zapis zapyta, czy nadpisać)"
+                )
+            return choice == "reload"
+        self.restore_view_state(self.view_state())
+        return True
+
+    def save_changes(self, overwrite=False):
+        """
+        Zapisuje niezapisane zmiany. Jeśli plik zmienił się na dysku, pyta, czy
+        wczytać go ponownie, czy nadpisać; overwrite=True od razu zapisuje całą tabelę.
+
+        Returns:
+            True, jeśli zmiany są zapisane (albo nie było czego zapisywać).
+        """
+        if not self.pending_edits or not self.json_path or self.is_loading():
+            return True
+        if overwrite:
+            if not self._save_full():
+                return False
+        else:
+            edits = [
+                (row, lang, old_value, self.table.get(row, lang))
+                for (row, lang), old_value in self.pending_edits.items()
+            ]
+            try:
+                check_signature(self.json_path, self.file_signature)
+                if self.offsets is None:
+                    raise PatchError("Brak pozycji wpisów w pliku")
+                self.file_signature = patch_file(self.json_path, self.offsets, edits, self.file_signature)
+            except FileChangedError as e:
+                print(f"Nie zapisano {self.json_path}: {e}")
+                return self.resolve_disk_conflict() == "overwrite"
+            except PatchError as e:
+                # Nietypowy układ pliku – pełny zapis
+                print(f"Zapis pełnego pliku: {e}")
+                if not self._save_full():
+                    return False
+            except Exception as e:
+                print(f"Błąd podczas zapisu: {e}")
+                QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać pliku: {e}")
+                return False
+        self.pending_edits = {}
+        self._update_dirty_state()
+        # Plik na dysku to teraz ta tabela – kolejne otwarcia nie muszą go parsować
+        document_cache.put_strings(self.json_path, self.file_signature, self.table, self.offsets)
+        self.saved.emit(self.json_path)
+        return True
+
+    def ask_disk_conflict(self):
+        """
+        Returns:
+            "reload", "overwrite" albo None (anulowano).
+        """
+        box = QMessageBox(
+            QMessageBox.Warning, "Plik zmienił się na dysku",
+            f"Plik {os.path.basename(self.json_path)} został zmieniony poza tą zakładką.\n\n"
+            f"Wczytać go ponownie (niezapisane zmiany: {len(self.dirty_rows())} zostaną porzucone) "
+            f"czy nadpisać go swoimi zmianami (zmiany z dysku zostaną utracone)?",
+            QMessageBox.Cancel, self
+        )
+        reload_button = box.addButton("Wczytaj ponownie", QMessageBox.DestructiveRole)
+        overwrite_button = box.addButton("Nadpisz", QMessageBox.AcceptRole)
+        box.exec_()
+        clicked = box.clickedButton()
+        if clicked is reload_button:
+            return "reload"
+        if clicked is overwrite_button:
+            return "overwrite"
+        return None
+
+    def resolve_disk_conflict(self):
+        """
+        Plik zmienił się na dysku, a zakładka ma niezapisane zmiany – pyta
+        użytkownika i wczytuje plik ponownie albo go nadpisuje.
+
+        Returns:
+            "reload", "overwrite" (zapisano) albo None
+        """
+        if self._conflict_prompt:
+            return None  # pytanie już jest na ekranie
+        self._conflict_prompt = True
+        try:
+            choice = self.ask_disk_conflict()
+        finally:
+            self._conflict_prompt = False
+        if choice == "reload":
+            self.restore_view_state(self.view_state())
+        elif choice == "overwrite" and not self.save_changes(overwrite=True):
+            return None
+        return choice
+
+    def _save_full(self):
         try:
-            with open(self.json_path, encoding="utf-8-sig") as f:
-                all_data = json.load(f)
-            # szukaj po ID i Key
-            for obj in all_data:
-                if obj.get("id") == entry.get("id") and obj.get("Key") == entry.get("Key"):
-                    obj[lang] = new_text
-                    break
-            with open(self.json_path, "w", encoding="utf-8-sig") as f:
-                json.dump(all_data, f, indent=2, ensure_ascii=False)
-            self.load_json(self.json_path)  # odśwież wszystko
+            raw, offsets = dump_entries(self.table.iter_entries())
+            atomic_write(self.json_path, raw)
+            self.file_signature = file_signature(self.json_path)
         except Exception as e:
             print(f"Błąd podczas zapisu: {e}")
-        dialog.accept()
\ No newline at end of file
+            QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać pliku: {e}")
+            return False
+        self.offsets = offsets
+        return True
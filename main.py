@@ -3,18 +3,93 @@ import os
 import importlib.util
 import glob
 
+# Jak najwcześniej – licznik startu liczy czas od tego importu
+from startup_timing import startup_timer
+
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QHBoxLayout, QVBoxLayout, QSplitter,
-    QPushButton, QFileDialog, QTreeView, QLabel, QTabWidget, QMenuBar, QAction
+    QPushButton, QFileDialog, QTreeView, QLabel, QTabWidget, QMenuBar, QAction,
+    QMessageBox, QInputDialog
 )
-from PyQt5.QtCore import Qt, QDir, QSettings
-from PyQt5.QtGui import QFontDatabase, QFont
+from PyQt5.QtCore import Qt, QDir, QSettings, QTimer
+from PyQt5.QtGui import QFontDatabase, QFont, QKeySequence
 from PyQt5.QtWidgets import QFileSystemModel
 
 import json_viewer
-from plugins_manager import PluginsManagerDialog
+import json_codec
+from plugins_manager import PluginsManagerDialog, read_plugin_header
+from coverage_dialog import CoverageDialog
+from find_replace_dialog import FindReplaceDialog
+from startup_timing_dialog import StartupTimingDialog
+from txt_viewer import TxtViewer
+from path_index import PathIndex, is_supported
+from quick_open_dialog import QuickOpenDialog
+from stall_watchdog import StallWatchdog, DEFAULT_THRESHOLD_MS
+from jobs import job_service, PRIORITY_LOW
+from file_watcher import FileWatcher, snapshot_directory
+from id_index import id_index
+from coverage import coverage_cache
+from strings_lint import STRINGS_DIR
+from disk_cache import disk_cache
+from event_bus import EventBus, FolderChanged, FileOpened, FileSaved, TabClosed
+
+startup_timer.mark("Importy main.py")
 
 # ====== Loader pluginów (foldery z plikiem {plugin}/{plugin}.py) ======
+# Nagłówek czytany jest statycznie (plugins_manager.read_plugin_header). Wtyczki
+# z run_plugin dostają tylko akcję w menu i są importowane przy pierwszym użyciu;
+# wtyczki z samym register_plugin ładowane są od razu, jak dotąd.
+
+REQUIRED_HEADER = ("PLUGIN_NAME", "PLUGIN_DESCRIPTION", "PLUGIN_VERSION")
+
+# Zaimportowane moduły wtyczek: folder -> moduł
+_loaded_plugins = {}
+
+def import_plugin(folder_name, plugins_folder="Plugins"):
+    """Importuje moduł wtyczki (raz); zwraca moduł albo None przy błędzie."""
+    if folder_name in _loaded_plugins:
+        return _loaded_plugins[folder_name]
+    plugin_folder = os.path.join(plugins_folder, folder_name)
+    plugin_file = os.path.join(plugin_folder, f"{folder_name}.py")
+    # Dodaj katalog pluginu do sys.path na czas jego ładowania (by działały importy lokalne)
+    sys.path.insert(0, plugin_folder)
+    try:
+        spec = importlib.util.spec_from_file_location(folder_name, plugin_file)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            print(f"Błąd ładowania wtyczki {folder_name}: {e}")
+            return None
+    finally:
+        # Po załadowaniu pluginu usuń jego katalog z sys.path
+        try:
+            sys.path.remove(plugin_folder)
+        except ValueError:
+            pass
+    _loaded_plugins[folder_name] = module
+    return module
+
+def add_plugin_action(main_window, folder_name, header, plugins_folder="Plugins"):
+    """Akcja w menu, która importuje wtyczkę dopiero po pierwszym kliknięciu."""
+    menus = {"Opcje": main_window.options_menu, "Pluginy": main_window.plugins_menu}
+    menu = menus.get(header.get("PLUGIN_MENU"), main_window.plugins_menu)
+    action = QAction(str(header.get("PLUGIN_ACTION") or header["PLUGIN_NAME"]), main_window)
+
+    def run():
+        if folder_name in _loaded_plugins:
+            module = _loaded_plugins[folder_name]
+        else:
+            with startup_timer.phase(f"Wtyczka {folder_name}: import przy użyciu"):
+                module = import_plugin(folder_name, plugins_folder)
+        if module is None or not hasattr(module, "run_plugin"):
+            QMessageBox.warning(main_window, "Wtyczka", f"Nie udało się uruchomić wtyczki {header['PLUGIN_NAME']}.")
+            return
+        module.run_plugin(main_window)
+    action.triggered.connect(run)
+    menu.addAction(action)
+    return action
+
 def load_plugins(main_window, plugins_folder="Plugins"):
     enabled = set()
     enabled_file = os.path.join(plugins_folder, "plugins_enabled.txt")
@@ -28,61 +103,137 @@ def load_plugins(main_window, plugins_folder="Plugins"):
         print("Brak plugins_enabled.txt – żadna wtyczka nie zostanie załadowana.")
         return
 
-    for folder_name in enabled:
-        plugin_folder = os.path.join(plugins_folder, folder_name)
-        plugin_file = os.path.join(plugin_folder, f"{folder_name}.py")
-        if not os.path.isdir(plugin_folder) or not os.path.isfile(plugin_file):
-            print(f"Folder/plugin '{folder_name}' nie istnieje lub brak {folder_name}.py")
-            continue
+    for folder_name in sorted(enabled):
+        with startup_timer.phase(f"Wtyczka {folder_name}"):
+            _load_plugin(main_window, folder_name, plugins_folder)
+
+def _load_plugin(main_window, folder_name, plugins_folder):
+    """Nagłówek, import/akcja i rejestracja jednej wtyczki (mierzone osobno)."""
+    plugin_folder = os.path.join(plugins_folder, folder_name)
+    plugin_file = os.path.join(plugin_folder, f"{folder_name}.py")
+    if not os.path.isdir(plugin_folder) or not os.path.isfile(plugin_file):
+        print(f"Folder/plugin '{folder_name}' nie istnieje lub brak {folder_name}.py")
+        return
+
+    try:
+        with startup_timer.phase("nagłówek"):
+            header = read_plugin_header(plugin_file)
+    except (OSError, SyntaxError, ValueError) as e:
+        print(f"Błąd odczytu nagłówka wtyczki {folder_name}: {e}")
+        return
+    # Rozpoznawanie nagłówka
+    if not header.get("PLUGIN_OK", False) or not all(name in header for name in REQUIRED_HEADER):
+        print(f"Wtyczka {folder_name} pominięta (brak nagłówka).")
+        return
 
-        # Dodaj katalog pluginu do sys.path na czas jego ładowania (by działały importy lokalne)
-        sys.path.insert(0, plugin_folder)
+    if "run_plugin" in header["functions"]:
+        add_plugin_action(main_window, folder_name, header, plugins_folder)
+        print(f"Zarejestrowano wtyczkę: {header['PLUGIN_NAME']} v{header['PLUGIN_VERSION']} (ładowana przy użyciu)")
+    elif "register_plugin" in header["functions"]:
+        with startup_timer.phase("import"):
+            module = import_plugin(folder_name, plugins_folder)
+        if module is None:
+            return
         try:
-            spec = importlib.util.spec_from_file_location(folder_name, plugin_file)
-            module = importlib.util.module_from_spec(spec)
-            try:
-                spec.loader.exec_module(module)
-                # Rozpoznawanie nagłówka
-                if (getattr(module, "PLUGIN_OK", False)
-                    and hasattr(module, "PLUGIN_NAME")
-                    and hasattr(module, "PLUGIN_DESCRIPTION")
-                    and hasattr(module, "PLUGIN_VERSION")
-                    and hasattr(module, "register_plugin")):
-                    module.register_plugin(main_window)
-                    print(f"Załadowano wtyczkę: {module.PLUGIN_NAME} v{module.PLUGIN_VERSION}")
-                else:
-                    print(f"Wtyczka {folder_name} pominięta (brak nagłówka lub register_plugin).")
-            except Exception as e:
-                print(f"Błąd ładowania wtyczki {folder_name}: {e}")
-        finally:
-            # Po załadowaniu pluginu usuń jego katalog z sys.path
-            try:
-                sys.path.remove(plugin_folder)
-            except ValueError:
-                pass
+            with startup_timer.phase("register_plugin"):
+                module.register_plugin(main_window)
+            print(f"Załadowano wtyczkę: {header['PLUGIN_NAME']} v{header['PLUGIN_VERSION']}")
+        except Exception as e:
+            print(f"Błąd ładowania wtyczki {folder_name}: {e}")
+    else:
+        print(f"Wtyczka {folder_name} pominięta (brak register_plugin lub run_plugin).")
 
 # ====== Główna aplikacja ======
 
 LAST_FOLDER_KEY = "last_folder"
+# Otwarte zakładki (plik, wyszukiwanie, przewinięcie) i aktywna zakładka – JSON
+SESSION_KEY = "session"
+# Limit pamięci na wczytane pliki w zakładkach; najdawniej używane są usypiane
+TAB_MEMORY_KEY = "tab_memory_budget_mb"
+DEFAULT_TAB_MEMORY_MB = 512
+# Próg wykrywania zawieszeń interfejsu (ms, 0 = wyłączone)
+STALL_THRESHOLD_KEY = "stall_threshold_ms"
+
+class TabPlaceholder(QWidget):
+    """
+    Zakładka bez wczytanego pliku (z poprzedniej sesji albo uśpiona) – plik
+    czytany dopiero po jej aktywacji, ze stanem z JsonLangViewer.view_state().
+    """
+    def __init__(self, state):
+        super().__init__()
+        self.state = dict(state)
+        self.json_path = self.state["path"]
+        layout = QVBoxLayout(self)
+        label = QLabel(f"Plik zostanie wczytany po otwarciu zakładki:\n{self.json_path}")
+        label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(label)
+
+    def view_state(self):
+        return dict(self.state)
+
+    def has_unsaved_changes(self):
+        return False
+
+    def is_loading(self):
+        return False
+
+    def load_json(self, path=None):
+        # Plik i tak zostanie wczytany przy aktywacji zakładki
+        if path:
+            self.json_path = self.state["path"] = path
 
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
+        ui_phase = startup_timer.begin("Menu i panele")
         self.setWindowTitle("D2RTools")
         self.resize(1280, 800)
 
         self.settings = QSettings("d2r_json_viewer", "d2r_json_viewer")
+        self.folder = None
+        self.stall_watchdog = StallWatchdog(self.stall_threshold(), parent=self)
+        # Dopiero w działającej pętli zdarzeń – start programu (folder, sesja,
+        # wtyczki) przed app.exec_() to nie zawieszenie
+        QTimer.singleShot(0, self.stall_watchdog.start)
+        # Wspólna pula zadań w tle – także dla wtyczek (main_window.jobs)
+        self.jobs = job_service()
+        # Zdarzenia dla wtyczek (main_window.events) – folder, otwarcie, zapis, zamknięcie
+        self.events = EventBus(self)
 
         main_layout = QHBoxLayout(self)
 
         # Dodaj menu
         menubar = QMenuBar(self)
         options_menu = menubar.addMenu("Opcje")
+        self.options_menu = options_menu
         plugins_menu = menubar.addMenu("Pluginy")  # <-- NOWE MENU
         self.plugins_menu = plugins_menu           # <-- przechowaj referencję dla pluginów
         plugins_action = QAction("Wtyczki", self)
         plugins_action.triggered.connect(self.show_plugins_manager)
         options_menu.addAction(plugins_action)
+        coverage_action = QAction("Pokrycie tłumaczeń", self)
+        coverage_action.triggered.connect(self.show_coverage)
+        options_menu.addAction(coverage_action)
+        find_replace_action = QAction("Znajdź i zamień w modzie", self)
+        find_replace_action.triggered.connect(self.show_find_replace)
+        options_menu.addAction(find_replace_action)
+        quick_open_action = QAction("Szybkie otwieranie pliku", self)
+        quick_open_action.setShortcut(QKeySequence("Ctrl+P"))
+        quick_open_action.triggered.connect(self.show_quick_open)
+        options_menu.addAction(quick_open_action)
+        self.addAction(quick_open_action)  # skrót działa też przy zamkniętym menu
+        memory_action = QAction("Limit pamięci zakładek", self)
+        memory_action.triggered.connect(self.choose_tab_memory_budget)
+        options_menu.addAction(memory_action)
+        stall_action = QAction("Wykrywanie zawieszeń", self)
+        stall_action.triggered.connect(self.choose_stall_threshold)
+        options_menu.addAction(stall_action)
+        disk_cache_action = QAction("Cache plików na dysku", self)
+        disk_cache_action.triggered.connect(self.show_disk_cache)
+        options_menu.addAction(disk_cache_action)
+        timing_action = QAction("Czas uruchamiania", self)
+        timing_action.triggered.connect(self.show_startup_timing)
+        options_menu.addAction(timing_action)
         main_layout.setMenuBar(menubar)
 
         self.splitter = QSplitter(Qt.Horizontal)
@@ -101,8 +252,10 @@ class MainWindow(QWidget):
         left_layout.addWidget(self.folder_path_label)
 
         self.fs_model = QFileSystemModel()
-        self.fs_model.setNameFilters(["*.json"])
+        self.fs_model.setNameFilters(["*.json", "*.txt"])
         self.fs_model.setNameFilterDisables(False)
+        self._scan_phase = None
+        self.fs_model.directoryLoaded.connect(self.on_directory_loaded)
 
         self.tree = QTreeView()
         self.tree.setModel(self.fs_model)
@@ -112,29 +265,68 @@ class MainWindow(QWidget):
         self.splitter.addWidget(left_widget)
         left_widget.setMinimumWidth(300)
 
+        # Indeks ścieżek do szybkiego otwierania – budowany w tle, odświeżany
+        # po katalogu przy zmianach zgłoszonych przez obserwatora plików
+        self.path_index = PathIndex()
+        self._path_index_task = None
+        self._directory_task = None
+        self._changed_directories = set()  # czekają na zakończenie _directory_task
+        self._quick_open = None
+        self.file_watcher = FileWatcher(self)
+        self.file_watcher.directories_changed.connect(self.on_directories_changed)
+        self.file_watcher.files_changed.connect(self.on_files_changed)
+        self._strings_files = set()  # pliki strings folderu – obserwowane dla indeksów
+
         # PRAWY PANEL: TABY Z EDYTORAMI
         self.tabs = QTabWidget()
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self._restoring_session = False
+        self._tab_lru = []  # wczytane widoki, od najdawniej aktywnego
         self.splitter.addWidget(self.tabs)
+        startup_timer.end(ui_phase)
 
         # Po starcie: próbuj wczytać ostatni folder
         last_folder = self.settings.value(LAST_FOLDER_KEY, "")
         if last_folder and os.path.isdir(last_folder):
-            self.set_folder(last_folder)
+            with startup_timer.phase("Ostatni folder"):
+                self.set_folder(last_folder)
         else:
             self.tree.hide()
             info = QLabel("Wybierz folder z plikami JSON")
             left_layout.addWidget(info)
             self.info_label = info
 
+        with startup_timer.phase("Przywracanie sesji"):
+            self.restore_session()
+
         # Załaduj pluginy po zbudowaniu GUI!
-        load_plugins(self)
+        with startup_timer.phase("load_plugins"):
+            load_plugins(self)
 
     def show_plugins_manager(self):
         dlg = PluginsManagerDialog(self)
         dlg.exec_()
 
+    def show_startup_timing(self):
+        dlg = StartupTimingDialog(self)
+        dlg.exec_()
+
+    def show_coverage(self):
+        if not self.folder:
+            QMessageBox.information(self, "Pokrycie tłumaczeń", "Najpierw wybierz folder moda.")
+            return
+        dlg = CoverageDialog(self.folder, self)
+        dlg.exec_()
+
+    def show_find_replace(self):
+        if not self.folder:
+            QMessageBox.information(self, "Znajdź i zamień", "Najpierw wybierz folder moda.")
+            return
+        dlg = FindReplaceDialog(self.folder, self)
+        dlg.exec_()
+
     def choose_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Wybierz folder z plikami JSON")
         if folder:
@@ -144,34 +336,408 @@ class MainWindow(QWidget):
     def set_folder(self, folder):
         if hasattr(self, "info_label"):
             self.info_label.hide()
+        self.folder = folder
+        # Skan katalogu trwa w wątku QFileSystemModel – koniec w on_directory_loaded
+        self._scan_phase = startup_timer.begin_async("Skan folderu")
         self.fs_model.setRootPath(folder)
         self.tree.setRootIndex(self.fs_model.index(folder))
         self.tree.show()
         self.tree.header().setSectionResizeMode(0, self.tree.header().ResizeToContents)
         self.folder_path_label.setText(f"Ścieżka folderu: <b>{folder}</b>")
+        self.build_path_index(folder)
+        self.events.publish(FolderChanged(folder))
+
+    def build_path_index(self, folder):
+        if self._path_index_task is not None:
+            self._path_index_task.cancel()
+        if self._directory_task is not None:
+            self._directory_task.cancel()
+        self._changed_directories = set()
+        self.file_watcher.clear_directories()
+        self.path_index = PathIndex()
+        phase = startup_timer.begin_async("Indeks ścieżek")
+
+        def build(task):
+            index = PathIndex().build(folder, task.is_cancelled)
+            # Migawki katalogów dla obserwatora – od nich liczone są zmiany plików
+            snapshots = {}
+            for d in index.dirs:
+                task.check_cancelled()
+                directory = index.absolute(d) if d else index.root
+                snapshots[directory] = snapshot_directory(directory)
+            return index, snapshots
+        task = self.jobs.create(build, "Indeks ścieżek", PRIORITY_LOW, self)
+        task.done.connect(lambda result: self.on_path_index_ready(task, *result, phase))
+        task.failed.connect(lambda error: print(f"Błąd indeksowania plików: {error}"))
+        task.finished.connect(lambda t=task: self._on_path_index_task_finished(t))
+        self._path_index_task = task
+        task.start()
+
+    def _on_path_index_task_finished(self, task):
+        if self._path_index_task is task:
+            self._path_index_task = None  # błąd albo przerwanie
+        task.deleteLater()
+
+    def on_path_index_ready(self, task, index, snapshots, phase):
+        if task is not self._path_index_task:
+            return
+        self._path_index_task = None
+        self.path_index = index
+        startup_timer.end(phase, files=len(index))
+        self.file_watcher.watch_directories(snapshots)
+        self._strings_files = {os.path.normpath(index.absolute(p)) for p in index.files if self._is_strings_path(p)}
+        self.file_watcher.watch_files(self._strings_files)
+        if self._quick_open is not None and self._quick_open.isVisible():
+            self._quick_open.update_results()
+
+    def _is_strings_path(self, rel_path):
+        # Jak strings_lint.find_strings_files: JSON w local/lng/strings albo w samym folderze
+        rel_dir, _, name = rel_path.rpartition("/")
+        return name.lower().endswith(".json") and (
+            not rel_dir or rel_dir.endswith(STRINGS_DIR.replace(os.sep, "/"))
+        )
+
+    def on_directories_changed(self, directories):
+        if not self.path_index.ready:
+            return
+        self._changed_directories.update(directories)
+        self._start_directory_update()
+
+    def _start_directory_update(self):
+        # Jedno zadanie naraz – zmiany w jego trakcie czekają, by wyniki
+        # trafiały do indeksu w kolejności
+        if self._directory_task is not None or not self._changed_directories:
+            return
+        index = self.path_index
+        scans = [(d, index.known_subdirs(d)) for d in self._changed_directories]
+        self._changed_directories = set()
+
+        def update(task):
+            # Nowe podkatalogi (np. skopiowany folder) czytane w całości – w tle
+            results, snapshots = [], {}
+            for directory, known in scans:
+                task.check_cancelled()
+                scan = index.scan_directory(directory, known, task.is_cancelled)
+                results.append(scan)
+                for sub in scan[3].values():
+                    for d in sub.dirs:
+                        task.check_cancelled()
+                        path = sub.absolute(d) if d else sub.root
+                        snapshots[path] = snapshot_directory(path)
+            return results, snapshots
+        task = self.jobs.create(update, "Aktualizacja indeksu ścieżek", PRIORITY_LOW, self)
+        task.done.connect(lambda result: self.on_directories_scanned(task, index, *result))
+        task.failed.connect(lambda error: print(f"Błąd aktualizacji indeksu ścieżek: {error}"))
+        task.finished.connect(lambda t=task: self._on_directory_task_finished(t))
+        self._directory_task = task
+        task.start()
+
+    def on_directories_scanned(self, task, index, scans, snapshots):
+        if task is not self._directory_task or index is not self.path_index:
+            return
+        for scan in scans:
+            index.apply_scan(scan)
+        self.file_watcher.watch_directories(snapshots)
+        if self._quick_open is not None and self._quick_open.isVisible():
+            self._quick_open.update_results()
+
+    def _on_directory_task_finished(self, task):
+        if self._directory_task is task:
+            self._directory_task = None
+            self._start_directory_update()
+        task.deleteLater()
+
+    def on_files_changed(self, paths):
+        """Zmienione pliki: otwarte zakładki wczytują je ponownie, indeksy przeliczają tylko te pliki."""
+        changed = set(paths)
+        if self.folder:
+            self.events.publish(FolderChanged(self.folder, changed))
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            path = getattr(widget, "json_path", None)
+            if path and os.path.normpath(path) in changed and hasattr(widget, "reload_if_changed"):
+                widget.reload_if_changed()
+
+        # Nowe pliki strings też trafiają do indeksów i są odtąd obserwowane
+        if self.path_index.ready:
+            root = os.path.normpath(self.path_index.root)
+            for path in changed:
+                if path.startswith(root + os.sep) and os.path.isfile(path):
+                    rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+                    if self._is_strings_path(rel_path) and path not in self._strings_files:
+                        self._strings_files.add(path)
+                        self.file_watcher.watch_files([path])
+        known = {os.path.normpath(p): p for p in list(id_index.files) + coverage_cache.paths()}
+        strings = [known.get(p, p) for p in changed if p in known or p in self._strings_files]
+        if not strings:
+            return
+
+        def update(task):
+            for path in strings:
+                task.check_cancelled()
+                id_index.update_file(path)
+                coverage_cache.update_file(path)
+        self.jobs.submit(update, "Aktualizacja indeksów", PRIORITY_LOW, self,
+                         on_failed=lambda error: print(f"Błąd aktualizacji indeksów: {error}"))
+
+    def show_quick_open(self):
+        if self._quick_open is None:
+            self._quick_open = QuickOpenDialog(self)
+        self._quick_open.popup()
+
+    def on_directory_loaded(self, path):
+        if self._scan_phase is not None and os.path.normpath(path) == os.path.normpath(self.folder):
+            startup_timer.end(self._scan_phase, entries=self.fs_model.rowCount(self.fs_model.index(path)))
+            self._scan_phase = None
 
     def on_file_double_clicked(self, index):
         path = self.fs_model.filePath(index)
-        if path.endswith(".json"):
-            # Sprawdź, czy plik jest już otwarty w zakładce
-            for i in range(self.tabs.count()):
-                widget = self.tabs.widget(i)
-                if hasattr(widget, 'json_path') and widget.json_path == path:
-                    self.tabs.setCurrentIndex(i)
-                    return
-            # Jeśli nie - otwórz nową zakładkę
-            viewer = json_viewer.JsonLangViewer()
-            viewer.load_json(path)
-            viewer.json_path = path
-            filename = os.path.basename(path)
-            self.tabs.addTab(viewer, filename)
-            self.tabs.setCurrentWidget(viewer)
+        if is_supported(path):
+            self.open_file(path)
+
+    def open_json_file(self, path):
+        return self.open_file(path)
+
+    def open_file(self, path):
+        """Otwiera plik JSON/TXT w zakładce (albo przełącza na już otwartą) i zwraca widok."""
+        # Sprawdź, czy plik jest już otwarty w zakładce
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            if hasattr(widget, 'json_path') and widget.json_path == path:
+                self.tabs.setCurrentIndex(i)
+                return self.materialize_tab(i)
+        # Jeśli nie - otwórz nową zakładkę
+        viewer = self._new_viewer(path)
+        viewer.load_json(path)
+        viewer.json_path = path
+        filename = os.path.basename(path)
+        self.tabs.addTab(viewer, filename)
+        self.tabs.setCurrentWidget(viewer)
+        self.file_watcher.watch_files([path])
+        self.events.publish(FileOpened(path))
+        return viewer
+
+    def _new_viewer(self, path):
+        viewer = TxtViewer() if path.lower().endswith(".txt") else json_viewer.JsonLangViewer()
+        viewer.dirty_changed.connect(lambda dirty, v=viewer: self.update_tab_title(v, dirty))
+        viewer.loaded.connect(self.enforce_memory_budget)
+        viewer.saved.connect(lambda path: self.events.publish(FileSaved(path)))
+        return viewer
+
+    def materialize_tab(self, index):
+        """Zamienia zakładkę-zaślepkę na widok z wczytanym plikiem; zwraca widok."""
+        placeholder = self.tabs.widget(index)
+        if not isinstance(placeholder, TabPlaceholder):
+            return placeholder
+        viewer = self._new_viewer(placeholder.json_path)
+        viewer.restore_view_state(placeholder.view_state())
+        title = self.tabs.tabText(index)
+        was_current = self.tabs.currentIndex() == index
+        self.tabs.blockSignals(True)
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, viewer, title)
+            if was_current:
+                self.tabs.setCurrentIndex(index)
+        finally:
+            self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        return viewer
+
+    def on_tab_changed(self, index):
+        if index >= 0 and not self._restoring_session:
+            self.activate_tab(index)
+
+    def activate_tab(self, index):
+        viewer = self.materialize_tab(index)
+        if viewer in self._tab_lru:
+            self._tab_lru.remove(viewer)
+        self._tab_lru.append(viewer)
+        self.enforce_memory_budget()
+        return viewer
+
+    def tab_memory_budget(self):
+        """Limit pamięci zakładek w bajtach."""
+        try:
+            megabytes = int(self.settings.value(TAB_MEMORY_KEY, DEFAULT_TAB_MEMORY_MB))
+        except (TypeError, ValueError):
+            megabytes = DEFAULT_TAB_MEMORY_MB
+        return megabytes * 1024 * 1024
+
+    def choose_tab_memory_budget(self):
+        megabytes, ok = QInputDialog.getInt(
+            self, "Limit pamięci zakładek",
+            "Pamięć na wczytane pliki (MB) – po przekroczeniu najdawniej\n"
+            "używane zakładki są usypiane i wczytywane ponownie po kliknięciu:",
+            self.tab_memory_budget() // (1024 * 1024), 16, 1024 * 1024, 16
+        )
+        if ok:
+            self.settings.setValue(TAB_MEMORY_KEY, megabytes)
+            self.enforce_memory_budget()
+
+    def stall_threshold(self):
+        try:
+            return int(self.settings.value(STALL_THRESHOLD_KEY, DEFAULT_THRESHOLD_MS))
+        except (TypeError, ValueError):
+            return DEFAULT_THRESHOLD_MS
+
+    def choose_stall_threshold(self):
+        threshold, ok = QInputDialog.getInt(
+            self, "Wykrywanie zawieszeń",
+            "Zapisuj stos programu, gdy interfejs nie odpowiada dłużej niż (ms, 0 = wyłączone):\n"
+            f"Log: {self.stall_watchdog.log_path}",
+            self.stall_threshold(), 0, 60000, 100
+        )
+        if ok:
+            self.settings.setValue(STALL_THRESHOLD_KEY, threshold)
+            self.stall_watchdog.set_threshold(threshold)
+
+    def show_disk_cache(self):
+        size_mb = disk_cache.size() / (1024 * 1024)
+        reply = QMessageBox.question(
+            self, "Cache plików na dysku",
+            f"Sparsowane duże pliki TXT/JSON: {size_mb:.1f} MB\nFolder: {disk_cache.directory}\n\n"
+            "Wyczyścić cache? (pliki zostaną sparsowane ponownie przy następnym otwarciu)",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            disk_cache.clear()
+
+    def enforce_memory_budget(self):
+        """Usypia najdawniej używane zakładki, dopóki suma pamięci przekracza limit."""
+        self._tab_lru = [v for v in self._tab_lru if self.tabs.indexOf(v) != -1]
+        usage = {v: v.memory_usage() for v in self._tab_lru}
+        total = sum(usage.values())
+        budget = self.tab_memory_budget()
+        current = self.tabs.currentWidget()
+        for viewer in list(self._tab_lru):
+            if total <= budget:
+                break
+            # Aktywna, z niezapisanymi zmianami albo wciąż wczytywana – zostaje
+            if viewer is current or viewer.has_unsaved_changes() or viewer.is_loading():
+                continue
+            total -= usage[viewer]
+            self.hibernate_tab(viewer)
+
+    def hibernate_tab(self, viewer):
+        """Zastępuje widok zaślepką z jego stanem i zwalnia wczytane dane."""
+        index = self.tabs.indexOf(viewer)
+        if index == -1:
+            # Zakładka już zamknięta – nie ma czego usypiać
+            if viewer in self._tab_lru:
+                self._tab_lru.remove(viewer)
+            return None
+        placeholder = TabPlaceholder(viewer.view_state())
+        title = self.tabs.tabText(index)
+        self.tabs.blockSignals(True)
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, placeholder, title)
+        finally:
+            self.tabs.blockSignals(False)
+        if viewer in self._tab_lru:
+            self._tab_lru.remove(viewer)
+        viewer.release()
+        viewer.deleteLater()
+        return placeholder
+
+    def save_session(self):
+        tabs = []
+        active = 0
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            if not hasattr(widget, "view_state") or not widget.json_path:
+                continue
+            if i == self.tabs.currentIndex():
+                active = len(tabs)
+            tabs.append(widget.view_state())
+        self.settings.setValue(SESSION_KEY, json_codec.dumps({"tabs": tabs, "active": active}))
+
+    def restore_session(self):
+        """Odtwarza zakładki z poprzedniej sesji; wczytywana jest tylko aktywna."""
+        raw = self.settings.value(SESSION_KEY, "")
+        if not raw:
+            return
+        try:
+            session = json_codec.loads(raw)
+            states = list(session.get("tabs", []))
+            active = int(session.get("active", 0))
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"Błąd odczytu sesji: {e}")
+            return
+
+        current = 0
+        self._restoring_session = True
+        try:
+            for i, state in enumerate(states):
+                path = state.get("path") if isinstance(state, dict) else None
+                if not path or not os.path.isfile(path):
+                    continue  # plik usunięty od ostatniej sesji
+                if i <= active:
+                    current = self.tabs.count()
+                self.tabs.addTab(TabPlaceholder(state), os.path.basename(path))
+                self.file_watcher.watch_files([path])
+                self.events.publish(FileOpened(path))
+        finally:
+            self._restoring_session = False
+        if self.tabs.count():
+            self.tabs.setCurrentIndex(current)
+            self.activate_tab(current)
+
+    def update_tab_title(self, viewer, dirty):
+        index = self.tabs.indexOf(viewer)
+        if index != -1:
+            filename = os.path.basename(viewer.json_path)
+            self.tabs.setTabText(index, f"*{filename}" if dirty else filename)
+
+    def confirm_unsaved(self, widget):
+        """Pyta o zapis niezapisanych zmian; False – anulowano albo zapis się nie udał."""
+        if not (hasattr(widget, "has_unsaved_changes") and widget.has_unsaved_changes()):
+            return True
+        reply = QMessageBox.question(
+            self, "Niezapisane zmiany",
+            f"Zapisać zmiany w pliku {os.path.basename(widget.json_path)}?",
+            QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel
+        )
+        if reply == QMessageBox.Cancel:
+            return False
+        if reply == QMessageBox.Save:
+            return widget.save_changes()
+        return True
 
     def close_tab(self, index):
+        widget = self.tabs.widget(index)
+        if not self.confirm_unsaved(widget):
+            return
+        if widget in self._tab_lru:
+            self._tab_lru.remove(widget)
         self.tabs.removeTab(index)
+        path = getattr(widget, "json_path", None)
+        if path and os.path.normpath(path) not in self._strings_files:
+            self.file_watcher.unwatch_file(path)
+        if path:
+            self.events.publish(TabClosed(path))
+        if hasattr(widget, "release"):
+            widget.release()  # przerwij wczytywanie/wyszukiwanie w tle
+        widget.deleteLater()
+
+    def closeEvent(self, event):
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            if hasattr(widget, "has_unsaved_changes") and widget.has_unsaved_changes():
+                self.tabs.setCurrentIndex(i)
+            if not self.confirm_unsaved(widget):
+                event.ignore()
+                return
+        self.save_session()
+        self.stall_watchdog.stop()
+        self.jobs.cancel_all()  # pula jest wspólna – zamykana razem z procesem
+        super().closeEvent(event)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    with startup_timer.phase("QApplication"):
+        app = QApplication(sys.argv)
+    font_phase = startup_timer.begin("Czcionka D2R")
     font_id = QFontDatabase.addApplicationFont("exocetblizzardot-medium.otf")
     if font_id != -1:
         font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
@@ -182,9 +748,12 @@ if __name__ == "__main__":
     else:
         print("Nie udało się załadować czcionki D2R – używana będzie czcionka systemowa.")
         json_viewer.D2R_FONT_NAME = "Sans Serif"
+    startup_timer.end(font_phase)
 
-    window = MainWindow()
-    window.show()
+    with startup_timer.phase("MainWindow.__init__"):
+        window = MainWindow()
+    with startup_timer.phase("Pokazanie okna"):
+        window.show()
     # Ustaw proporcje paneli na 20% (lewy), 80% (prawy)
     window_width = window.width()
     left = int(window_width * 0.2)
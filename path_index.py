@@ -0,0 +1,290 @@
+"""
+Indeks ścieżek plików moda (JSON i TXT) do szybkiego otwierania (Ctrl+P).
+
+Budowany w tle, aktualizowany po jednym katalogu przy zmianach na dysku.
+Wyszukiwanie rozmyte: najpierw filtr po maskach znaków (liczby całkowite),
+potem ranking po nazwie pliku i ścieżce. Dane pomocnicze (liczba wpisów,
+wierszy) liczone są dopiero na żądanie i zapamiętywane w MetadataCache.
+"""
+import os
+import re
+from itertools import compress
+
+from search_index import SearchCancelled
+
+SUPPORTED_EXTENSIONS = (".json", ".txt")
+
+# Kategorie trafień, od najlepszej
+NAME_PREFIX, NAME_SUBSTRING, PATH_SUBSTRING, NAME_FUZZY, PATH_FUZZY = range(5)
+
+# Bajty 0/1 <-> cyfry '0'/'1' – konwersje masek bitowych bez pętli w Pythonie
+_FLAGS_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGITS_TO_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+def _char_classes(text):
+    return {ord(ch) & 63 for ch in text}
+
+def _char_mask(text):
+    mask = 0
+    for c in _char_classes(text):
+        mask |= 1 << c
+    return mask
+
+def _positions_to_bits(flags):
+    """Bajty 0/1 (po jednym na ścieżkę) -> liczba z bitem i dla ścieżki i."""
+    digits = bytes(flags).translate(_FLAGS_TO_DIGITS)[::-1]
+    return int(digits, 2) if digits else 0
+
+def _bits_to_positions(bits, count):
+    flags = format(bits, f"0{count}b").encode("ascii")[::-1].translate(_DIGITS_TO_FLAGS)
+    return list(compress(range(count), flags))
+
+def _fuzzy_pattern(query):
+    # "abc" -> a[^b]*b[^c]*c – bez nawrotów, liniowo względem długości tekstu
+    parts = [re.escape(query[0])]
+    for ch in query[1:]:
+        parts.append(f"[^{re.escape(ch)}]*{re.escape(ch)}")
+    return re.compile("".join(parts))
+
+def is_supported(name):
+    return name.lower().endswith(SUPPORTED_EXTENSIONS)
+
+class PathIndex:
+    """
+    Względne ścieżki plików (z '/') posortowane od najkrótszych – kolejność
+    na liście jest już rozstrzygnięciem remisów w rankingu.
+    """
+    CHECK_EVERY = 256
+
+    def __init__(self, root=None):
+        self.root = root
+        self.files = set()
+        self.dirs = set()     # względne katalogi ('' = korzeń), do obserwowania
+        self.paths = []
+        self._lower = []
+        self._names = []
+        self._masks = []
+        self._class_bits = {} # klasa znaku -> bity ścieżek, które go zawierają
+        self._last = None     # (zapytanie, pozycje kandydatów) – do zawężania
+        self.ready = False
+
+    def build(self, root, is_cancelled=None):
+        self.root = root
+        files, dirs = set(), set()
+        for count, (dirpath, dirnames, filenames) in enumerate(os.walk(root)):
+            if is_cancelled and count % self.CHECK_EVERY == 0 and is_cancelled():
+                raise SearchCancelled()
+            rel_dir = self._relative(dirpath)
+            dirs.add(rel_dir)
+            for name in filenames:
+                if is_supported(name):
+                    files.add(f"{rel_dir}/{name}" if rel_dir else name)
+        self.files, self.dirs = files, dirs
+        self._rebuild()
+        for c in range(64):
+            self._bits_for_class(c)  # w tle, by pierwsze zapytania były szybkie
+        self.ready = True
+        return self
+
+    def _relative(self, path):
+        rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+        return "" if rel == "." else rel
+
+    def _rebuild(self):
+        self.paths = sorted(self.files, key=lambda p: (len(p), p))
+        self._lower = [p.lower() for p in self.paths]
+        self._names = [p.rsplit("/", 1)[-1] for p in self._lower]
+        self._masks = [_char_mask(p) for p in self._lower]
+        self._class_bits = {}
+        self._last = None
+
+    def _bits_for_class(self, c):
+        bits = self._class_bits.get(c)
+        if bits is None:
+            bit = 1 << c
+            bits = _positions_to_bits(map(bool, map(bit.__and__, self._masks)))
+            self._class_bits[c] = bits
+        return bits
+
+    def __len__(self):
+        return len(self.paths)
+
+    def absolute(self, rel_path):
+        return os.path.join(self.root, *rel_path.split("/"))
+
+    def known_subdirs(self, directory):
+        """Nazwy podkatalogów katalogu znanych indeksowi (do scan_directory)."""
+        rel_dir = self._relative(directory)
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        return frozenset(d[len(prefix):] for d in self.dirs
+                         if d.startswith(prefix) and d != rel_dir and "/" not in d[len(prefix):])
+
+    def scan_directory(self, directory, known, is_cancelled=None):
+        """
+        Czyta jeden katalog i w całości jego nowe podkatalogi (spoza known).
+        Nie zmienia indeksu – można wołać w tle; wynik stosuje apply_scan.
+
+        Returns:
+            (katalog, nazwy plików, nazwy podkatalogów, {nowy podkatalog: PathIndex});
+            nazwy plików i podkatalogów to None, gdy katalog zniknął.
+        """
+        if not os.path.isdir(directory):
+            return directory, None, None, {}
+        files, subdirs = set(), set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.add(entry.name)
+                elif is_supported(entry.name):
+                    files.add(entry.name)
+        subtrees = {name: PathIndex().build(os.path.join(directory, name), is_cancelled)
+                    for name in subdirs - known}
+        return directory, files, subdirs, subtrees
+
+    def apply_scan(self, scan):
+        """
+        Wstawia do indeksu wynik scan_directory (pliki katalogu bez
+        podkatalogów znanych wcześniej).
+
+        Returns:
+            Zbiór nowych katalogów względnych (do dodania do obserwowanych).
+        """
+        directory, files, subdirs, subtrees = scan
+        rel_dir = self._relative(directory)
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        # Usuń pliki tego katalogu (tylko bezpośrednie dzieci)
+        self.files = {p for p in self.files if not (p.startswith(prefix) and "/" not in p[len(prefix):])}
+        if files is None:
+            # Katalog zniknął razem z całym poddrzewem
+            self.files = {p for p in self.files if not p.startswith(prefix)} if prefix else set()
+            self.dirs = {d for d in self.dirs if d != rel_dir and not d.startswith(prefix)}
+            self._rebuild()
+            return set()
+
+        self.files.update(prefix + name for name in files)
+        # Podkatalogi usunięte z tego katalogu
+        for gone in [d for d in self.dirs if d.startswith(prefix) and d != rel_dir
+                     and "/" not in d[len(prefix):] and d[len(prefix):] not in subdirs]:
+            self.files = {p for p in self.files if not p.startswith(gone + "/")}
+            self.dirs = {d for d in self.dirs if d != gone and not d.startswith(gone + "/")}
+        # Nowe podkatalogi przeczytane w całości przez scan_directory
+        added = set()
+        for name, sub in subtrees.items():
+            child = prefix + name
+            if child in self.dirs:
+                continue
+            for path in sub.files:
+                self.files.add(f"{child}/{path}")
+            added.update(f"{child}/{d}" if d else child for d in sub.dirs)
+        self.dirs.update(added)
+        self._rebuild()
+        return added
+
+    def update_directory(self, directory):
+        """Ponownie czyta jeden katalog od razu (scan_directory + apply_scan)."""
+        return self.apply_scan(self.scan_directory(directory, self.known_subdirs(directory)))
+
+    def search(self, query, limit=50):
+        """
+        Rozmyte wyszukiwanie ścieżek.
+
+        Returns:
+            Lista do `limit` ścieżek względnych, od najlepiej pasującej.
+        """
+        q = query.strip().lower().replace("\\", "/")
+        if not q:
+            return self.paths[:limit]
+        masks = self._masks
+        if self._last is not None and q.startswith(self._last[0]):
+            qmask = _char_mask(q)
+            pool = [i for i in self._last[1] if masks[i] & qmask == qmask]
+        else:
+            # Iloczyn bitów klas znaków zapytania – bez pętli po ścieżkach
+            bits = -1
+            for c in _char_classes(q):
+                bits &= self._bits_for_class(c)
+            pool = _bits_to_positions(bits, len(masks)) if masks else []
+        self._last = (q, pool)
+
+        names, lower = self._names, self._lower
+        tiers = ([], [], [], [], [])
+        # 1. przejście: podciągi (tanie) – wiersze są od najkrótszych, więc po
+        # zebraniu `limit` trafień na początku nazwy lepszych już nie będzie
+        best = tiers[NAME_PREFIX]
+        for i in pool:
+            name = names[i]
+            if name.startswith(q):
+                best.append(i)
+                if len(best) >= limit:
+                    break
+            elif q in name:
+                tiers[NAME_SUBSTRING].append(i)
+            elif q in lower[i]:
+                tiers[PATH_SUBSTRING].append(i)
+        needed = limit - sum(len(t) for t in tiers)
+        if needed > 0:
+            # 2. przejście: dopasowanie rozmyte (litery w kolejności, z przerwami)
+            fuzzy = _fuzzy_pattern(q).search
+            for i in pool:
+                path = lower[i]
+                if q in path or not fuzzy(path):
+                    continue
+                if fuzzy(names[i]):
+                    tiers[NAME_FUZZY].append(i)
+                    if len(tiers[NAME_FUZZY]) >= needed:
+                        break
+                else:
+                    tiers[PATH_FUZZY].append(i)
+        result = []
+        for tier in tiers:
+            result.extend(self.paths[i] for i in tier[:limit - len(result)])
+            if len(result) >= limit:
+                break
+        return result
+
+def file_metadata(path):
+    """
+    Dane pomocnicze pliku do podglądu w szybkim otwieraniu.
+
+    Returns:
+        Słownik: dla JSON {"entries"}, dla TXT {"rows", "columns"}.
+    """
+    if path.lower().endswith(".json"):
+        from document_cache import document_cache
+        try:
+            return {"entries": len(document_cache.strings(path, copy=False)[0])}
+        except (ValueError, AttributeError):
+            data = document_cache.json(path)  # JSON, który nie jest tablicą wpisów
+            return {"entries": len(data) if isinstance(data, list) else None}
+    with open(path, "rb") as f:
+        raw = f.read()
+    lines = [line for line in raw.split(b"\n") if line.strip()]
+    return {"rows": max(len(lines) - 1, 0), "columns": lines[0].count(b"\t") + 1 if lines else 0}
+
+class MetadataCache:
+    """Dane file_metadata() zapamiętane według (rozmiar, mtime) pliku."""
+    def __init__(self):
+        self._cache = {}
+
+    def _signature(self, path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+
+    def get(self, path):
+        """Zapamiętane dane albo None, jeśli brak lub plik się zmienił."""
+        cached = self._cache.get(path)
+        if cached is None:
+            return None
+        try:
+            signature = self._signature(path)
+        except OSError:
+            return None
+        return cached[1] if cached[0] == signature else None
+
+    def compute(self, path):
+        signature = self._signature(path)
+        metadata = file_metadata(path)
+        self._cache[path] = (signature, metadata)
+        return metadata
+
+metadata_cache = MetadataCache()
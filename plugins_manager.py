@@ -1,14 +1,70 @@
 import os
+import ast
 import shutil
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout,
     QMessageBox, QWidget, QSizePolicy, QScrollArea, QGridLayout
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSettings
+
+import json_codec
 
 PLUGINS_DIR = "Plugins"
 ENABLED_FILE = os.path.join(PLUGINS_DIR, "plugins_enabled.txt")
 
+# Stałe nagłówka czytane bez uruchamiania wtyczki
+HEADER_NAMES = (
+    "PLUGIN_NAME", "PLUGIN_VERSION", "PLUGIN_DESCRIPTION", "PLUGIN_AUTHOR",
+    "PLUGIN_OK", "PLUGIN_MENU", "PLUGIN_ACTION"
+)
+# Funkcje wejściowe: register_plugin (ładowanie przy starcie), run_plugin (przy pierwszym użyciu)
+ENTRY_FUNCTIONS = ("register_plugin", "run_plugin")
+
+HEADER_CACHE_GROUP = "plugin_headers"
+
+def parse_plugin_header(source):
+    """
+    Czyta nagłówek wtyczki z kodu źródłowego (ast) – bez importowania modułu.
+
+    Returns:
+        słownik stałych PLUGIN_* oraz "functions" – lista zdefiniowanych ENTRY_FUNCTIONS
+    """
+    header = {}
+    functions = []
+    for node in ast.parse(source).body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id in HEADER_NAMES):
+            try:
+                header[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                pass
+        elif isinstance(node, ast.FunctionDef) and node.name in ENTRY_FUNCTIONS:
+            functions.append(node.name)
+    header["functions"] = functions
+    return header
+
+def read_plugin_header(plugin_file):
+    """Nagłówek wtyczki, zapamiętany w QSettings według (rozmiar, mtime) pliku."""
+    st = os.stat(plugin_file)
+    signature = [st.st_size, st.st_mtime_ns]
+    settings = QSettings("d2r_json_viewer", "d2r_json_viewer")
+    key = f"{HEADER_CACHE_GROUP}/{os.path.basename(plugin_file)}"
+    cached = settings.value(key, "")
+    if cached:
+        try:
+            cached = json_codec.loads(cached)
+            if cached.get("path") == os.path.abspath(plugin_file) and cached.get("signature") == signature:
+                return cached["header"]
+        except (ValueError, AttributeError, KeyError):
+            pass
+    with open(plugin_file, "r", encoding="utf-8") as f:
+        header = parse_plugin_header(f.read())
+    settings.setValue(key, json_codec.dumps({
+        "path": os.path.abspath(plugin_file), "signature": signature, "header": header
+    }))
+    return header
+
 def read_enabled_plugins():
     if not os.path.exists(ENABLED_FILE):
         return set()
@@ -29,17 +85,11 @@ def load_plugin_info(plugin_folder):
         "author": "",
     }
     try:
-        with open(plugin_py, "r", encoding="utf-8") as f:
-            code = f.read(4096)
-        for line in code.splitlines():
-            if line.startswith("PLUGIN_NAME"):
-                info["name"] = line.split("=", 1)[1].strip().strip('"\'')
-            if line.startswith("PLUGIN_VERSION"):
-                info["version"] = line.split("=", 1)[1].strip().strip('"\'')
-            if line.startswith("PLUGIN_DESCRIPTION"):
-                info["desc"] = line.split("=", 1)[1].strip().strip('"\'')
-            if line.startswith("PLUGIN_AUTHOR"):
-                info["author"] = line.split("=", 1)[1].strip().strip('"\'')
+        header = read_plugin_header(plugin_py)
+        info["name"] = str(header.get("PLUGIN_NAME", plugin_folder))
+        info["version"] = str(header.get("PLUGIN_VERSION", ""))
+        info["desc"] = str(header.get("PLUGIN_DESCRIPTION", ""))
+        info["author"] = str(header.get("PLUGIN_AUTHOR", ""))
     except Exception:
         pass
     return info
@@ -0,0 +1,120 @@
+import os
+import time
+
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QLabel
+from PyQt5.QtCore import Qt, QEvent
+
+from jobs import Job, PRIORITY_HIGH
+from path_index import metadata_cache
+
+class QuickOpenDialog(QDialog):
+    """Szybkie otwieranie pliku moda po fragmencie ścieżki (Ctrl+P)."""
+    RESULT_LIMIT = 50
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.setWindowTitle("Szybkie otwieranie")
+        self.resize(700, 450)
+        self._metadata_task = None
+
+        layout = QVBoxLayout(self)
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Nazwa lub fragment ścieżki pliku JSON/TXT...")
+        self.query_input.textChanged.connect(self.update_results)
+        self.query_input.installEventFilter(self)
+        layout.addWidget(self.query_input)
+
+        self.results = QListWidget()
+        self.results.itemActivated.connect(lambda item: self.open_selected())
+        self.results.currentRowChanged.connect(self.show_metadata)
+        layout.addWidget(self.results)
+
+        self.metadata_label = QLabel("")
+        layout.addWidget(self.metadata_label)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+    def eventFilter(self, obj, event):
+        # Strzałki i Enter w polu zapytania sterują listą wyników
+        if obj is self.query_input and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up):
+                step = 1 if key == Qt.Key_Down else -1
+                row = min(max(self.results.currentRow() + step, 0), self.results.count() - 1)
+                self.results.setCurrentRow(row)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                self.open_selected()
+                return True
+        return super().eventFilter(obj, event)
+
+    def popup(self):
+        self.query_input.selectAll()
+        self.query_input.setFocus()
+        self.update_results()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def update_results(self):
+        index = self.main_window.path_index
+        self.results.clear()
+        if not index.ready:
+            self.status_label.setText("Indeksowanie plików moda..." if self.main_window.folder
+                                      else "Najpierw wybierz folder moda.")
+            return
+        start = time.perf_counter()
+        paths = index.search(self.query_input.text(), self.RESULT_LIMIT)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.results.addItems(paths)
+        if paths:
+            self.results.setCurrentRow(0)
+        self.status_label.setText(f"Plików w indeksie: {len(index)}, wyników: {len(paths)} ({elapsed:.1f} ms)")
+
+    def selected_path(self):
+        item = self.results.currentItem()
+        if item is None:
+            return None
+        return self.main_window.path_index.absolute(item.text())
+
+    def show_metadata(self, row):
+        path = self.selected_path()
+        if path is None:
+            self.metadata_label.setText("")
+            return
+        metadata = metadata_cache.get(path)
+        if metadata is not None:
+            self.metadata_label.setText(self._describe(metadata))
+            return
+        # Liczone w tle i zapamiętywane – tylko dla zaznaczonego pliku
+        self.metadata_label.setText("...")
+        if self._metadata_task is not None:
+            self._metadata_task.cancel()
+        task = Job(lambda task: metadata_cache.compute(path), self, name="Dane pliku", priority=PRIORITY_HIGH)
+        task.done.connect(lambda metadata, p=path: self.on_metadata(p, metadata))
+        task.failed.connect(lambda error: self.metadata_label.setText(f"Błąd odczytu: {error}"))
+        task.finished.connect(lambda t=task: self.on_metadata_task_finished(t))
+        self._metadata_task = task
+        task.start()
+
+    def on_metadata_task_finished(self, task):
+        if self._metadata_task is task:
+            self._metadata_task = None
+        task.deleteLater()
+
+    def on_metadata(self, path, metadata):
+        if path == self.selected_path():
+            self.metadata_label.setText(self._describe(metadata))
+
+    def _describe(self, metadata):
+        if "entries" in metadata:
+            return f"Wpisów: {metadata['entries']}"
+        return f"Wierszy: {metadata['rows']}, kolumn: {metadata['columns']}"
+
+    def open_selected(self):
+        path = self.selected_path()
+        if path is None or not os.path.isfile(path):
+            return
+        self.hide()
+        self.main_window.open_file(path)
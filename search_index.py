@@ -0,0 +1,153 @@
+import threading
+from array import array
+
+# Pola przeszukiwane przez wyszukiwarkę w JsonLangViewer
+SEARCH_FIELDS = ("Key", "id", "enUS", "plPL")
+
+# Separator pól – nie pojawia się w zapytaniach, więc trigramy nie "sklejają" pól
+FIELD_SEPARATOR = "\x00"
+
+class SearchCancelled(Exception):
+    pass
+
+def _row_text(table, row, fields):
+    return FIELD_SEPARATOR.join(str(table.get(row, k, '')).lower() for k in fields)
+
+def _table_texts(table, fields):
+    columns = [
+        ['' if v is None else str(v).lower() for v in table.column(k)]
+        for k in fields
+    ]
+    return [FIELD_SEPARATOR.join(parts) for parts in zip(*columns)]
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class TrigramIndex:
+    """
+    Odwrócony indeks trigramów dla wyszukiwania podciągów.
+
+    Zapytanie >= 3 znaki: przecięcie list trafień trigramów zapytania,
+    a potem weryfikacja podciągu tylko na kandydatach.
+    Krótsze zapytania przeszukują teksty liniowo.
+
+    Budowa i wyszukiwanie działają w tle, edycje (update_row) w wątku GUI –
+    listy trafień zmieniane są pod blokadą, a edycje w trakcie budowy
+    czekają i są nanoszone na jej koniec.
+    """
+    CHECK_EVERY = 2048
+
+    def __init__(self, fields=SEARCH_FIELDS):
+        self.fields = fields
+        self._texts = []
+        self._postings = {}
+        self.ready = False
+        self._nbytes = None
+        self._lock = threading.Lock()
+        self._pending = set()  # wiersze edytowane w trakcie budowy
+
+    def build(self, table, is_cancelled=None):
+        texts = _table_texts(table, self.fields)
+        postings = {}
+        for row, text in enumerate(texts):
+            if is_cancelled and row % self.CHECK_EVERY == 0 and is_cancelled():
+                raise SearchCancelled()
+            for gram in _trigrams(text):
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = array('I', (row,))
+                else:
+                    posting.append(row)
+        with self._lock:
+            self._texts = texts
+            self._postings = postings
+            self._nbytes = None
+            # Teksty tych wierszy mogły zostać przeczytane przed edycją
+            for row in self._pending:
+                self._update_row(row, table)
+            self._pending.clear()
+            self.ready = True
+
+    def update_row(self, row, table):
+        """Aktualizuje indeks po edycji jednego wpisu."""
+        with self._lock:
+            if not self.ready:
+                self._pending.add(row)
+                return
+            self._update_row(row, table)
+
+    def _update_row(self, row, table):
+        old_text = self._texts[row]
+        new_text = _row_text(table, row, self.fields)
+        if old_text == new_text:
+            return
+        self._nbytes = None
+        old_grams = _trigrams(old_text)
+        new_grams = _trigrams(new_text)
+        for gram in old_grams - new_grams:
+            posting = self._postings[gram]
+            posting.remove(row)
+            if not posting:
+                del self._postings[gram]
+        for gram in new_grams - old_grams:
+            self._postings.setdefault(gram, array('I')).append(row)
+        self._texts[row] = new_text
+
+    def nbytes(self):
+        """Przybliżone zużycie pamięci indeksu (liczone raz po zbudowaniu)."""
+        if self._nbytes is None:
+            texts = sum(len(text) + 50 for text in self._texts)
+            postings = sum(4 * len(posting) + 120 for posting in self._postings.values())
+            self._nbytes = texts + postings
+        return self._nbytes
+
+    def _candidates(self, query):
+        grams = _trigrams(query)
+        with self._lock:
+            postings = []
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            result = set(postings[0])
+            for posting in postings[1:]:
+                result.intersection_update(posting)
+                if not result:
+                    break
+        return sorted(result)
+
+    def search(self, query, previous=None, is_cancelled=None):
+        """
+        Zwraca posortowane numery wierszy zawierających query (bez wielkości liter).
+
+        previous – (poprzednie zapytanie, jego wynik); jeśli nowe zapytanie
+        zawiera poprzednie, przeszukiwany jest tylko poprzedni wynik.
+        """
+        query = query.lower()
+        texts = self._texts
+        if previous is not None and previous[0] and previous[0] in query:
+            candidates = previous[1]
+        elif len(query) >= 3:
+            candidates = self._candidates(query)
+        else:
+            candidates = range(len(texts))
+        rows = []
+        for n, row in enumerate(candidates):
+            if is_cancelled and n % self.CHECK_EVERY == 0 and is_cancelled():
+                raise SearchCancelled()
+            if query in texts[row]:
+                rows.append(row)
+        return rows
+
+def linear_search(table, query, fields=SEARCH_FIELDS, is_cancelled=None):
+    """Wyszukiwanie bez indeksu (np. zanim indeks zostanie zbudowany)."""
+    query = query.lower()
+    rows = []
+    for row in range(len(table)):
+        if is_cancelled and row % TrigramIndex.CHECK_EVERY == 0 and is_cancelled():
+            raise SearchCancelled()
+        if any(query in str(table.get(row, k, '')).lower() for k in fields):
+            rows.append(row)
+    return rows
@@ -0,0 +1,107 @@
+"""
+Wykrywanie zawieszeń wątku GUI.
+
+Zegar w wątku GUI co HEARTBEAT_MS odnotowuje "bicie serca"; osobny wątek
+sprawdza, czy od ostatniego nie minęło więcej niż próg. Jeśli tak, zapisuje
+stos Pythona wątku GUI (sys._current_frames) do logu z rotacją, a po
+odwieszeniu – łączny czas zawieszenia.
+
+Uwaga: wątek nadzorcy potrzebuje GIL – gdy wątek GUI stoi w kodzie C bez
+zwalniania GIL, stos zostanie zapisany z opóźnieniem (ale nadal wskaże
+wywołanie Pythona, które do tego doprowadziło).
+"""
+import os
+import sys
+import time
+import logging
+import threading
+import traceback
+from logging.handlers import RotatingFileHandler
+
+from PyQt5.QtCore import QTimer
+
+HEARTBEAT_MS = 100
+CHECK_INTERVAL_S = 0.05
+DEFAULT_THRESHOLD_MS = 500
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+def default_log_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "stalls.log")
+
+def _make_logger(log_path):
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    logger = logging.getLogger("d2rtools.stalls")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    handler = RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+class StallWatchdog:
+    """Nadzorca pętli zdarzeń; tworzyć i uruchamiać w wątku GUI."""
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, log_path=None, parent=None):
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path or default_log_path()
+        self.logger = _make_logger(self.log_path)
+        self.stalls = 0
+        self._main_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stall = None  # (numer, czas ostatniego bicia) trwającego zawieszenia
+        self._timer = QTimer(parent)
+        self._timer.setInterval(HEARTBEAT_MS)
+        self._timer.timeout.connect(self._beat)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+
+    def start(self):
+        if self._stop.is_set():
+            return  # zatrzymany, zanim ruszyła pętla zdarzeń
+        self._last_beat = time.monotonic()
+        self._timer.start()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._timer.stop()
+
+    def set_threshold(self, threshold_ms):
+        """Próg w ms; 0 wyłącza wykrywanie."""
+        self.threshold_ms = threshold_ms
+
+    def _beat(self):
+        now = time.monotonic()
+        stall = self._stall
+        if stall is not None:
+            self._stall = None
+            number, since = stall
+            duration_ms = (now - since) * 1000 - HEARTBEAT_MS
+            self.logger.warning("Zawieszenie #%d zakończone po %.0f ms", number, duration_ms)
+            print(f"Interfejs nie odpowiadał przez {duration_ms:.0f} ms – szczegóły w {self.log_path}")
+        self._last_beat = now
+
+    def _watch(self):
+        while not self._stop.wait(CHECK_INTERVAL_S):
+            if self.threshold_ms <= 0 or self._stall is not None:
+                continue
+            since = self._last_beat
+            waited_ms = (time.monotonic() - since) * 1000 - HEARTBEAT_MS
+            if waited_ms < self.threshold_ms:
+                continue
+            self.stalls += 1
+            self._stall = (self.stalls, since)
+            self.logger.warning(
+                "Zawieszenie #%d: wątek GUI nie odpowiada od %.0f ms (próg %d ms)\n%s",
+                self.stalls, waited_ms, self.threshold_ms, self.main_stack()
+            )
+
+    def main_stack(self):
+        """Bieżący stos Pythona wątku GUI jako tekst."""
+        frame = sys._current_frames().get(self._main_id)
+        if frame is None:
+            return "(brak stosu wątku GUI)"
+        return "".join(traceback.format_stack(frame))
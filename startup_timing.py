@@ -0,0 +1,93 @@
+"""
+Pomiar czasu uruchamiania: fazy (z zagnieżdżeniem) z czasem i liczbą
+zaimportowanych modułów. Raport do podglądu w Opcje albo jako JSON.
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+import json_codec
+
+class StartupTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self._depth = 0
+        self._last_mark = self.t0
+        self._last_modules = set(sys.modules)
+
+    def _new_modules(self, before):
+        # Tylko pakiety najwyższego poziomu – czytelniej niż setki podmodułów
+        return sorted({name.split(".")[0] for name in set(sys.modules) - before})
+
+    def _token(self, name, start, modules):
+        return {"name": name, "depth": self._depth, "start": start, "modules": modules}
+
+    def begin(self, name):
+        """Rozpoczyna fazę zagnieżdżoną w bieżącej; zwraca token dla end()."""
+        token = self._token(name, time.perf_counter(), set(sys.modules))
+        token["nested"] = True
+        self._depth += 1
+        return token
+
+    def begin_async(self, name):
+        """Faza kończona później sygnałem (np. skan folderu) – nie zmienia zagnieżdżenia."""
+        token = self._token(name, time.perf_counter(), set(sys.modules))
+        token["async"] = True
+        return token
+
+    def end(self, token, **extra):
+        if token.get("done"):
+            return None
+        token["done"] = True
+        if token.get("nested"):
+            self._depth = token["depth"]
+        now = time.perf_counter()
+        before = token["modules"]
+        phase = {
+            "name": token["name"],
+            "depth": token["depth"],
+            "start_ms": round((token["start"] - self.t0) * 1000, 2),
+            "duration_ms": round((now - token["start"]) * 1000, 2),
+            "imports": len(set(sys.modules) - before),
+            "new_packages": self._new_modules(before),
+        }
+        if token.get("async"):
+            phase["async"] = True
+        phase.update(extra)
+        self.phases.append(phase)
+        if not token.get("async"):
+            self._last_mark = now
+            self._last_modules = set(sys.modules)
+        return phase
+
+    @contextmanager
+    def phase(self, name):
+        token = self.begin(name)
+        try:
+            yield token
+        finally:
+            self.end(token)
+
+    def mark(self, name):
+        """Faza od poprzedniego pomiaru (albo od startu) do teraz – np. importy modułu."""
+        return self.end(self._token(name, self._last_mark, self._last_modules))
+
+    def report(self):
+        phases = sorted(self.phases, key=lambda p: (p["start_ms"], p["depth"]))
+        return {
+            "python": sys.version.split()[0],
+            "json_backend": json_codec.BACKEND,
+            "modules_loaded": len(sys.modules),
+            "phases": phases,
+        }
+
+    def to_json(self):
+        return json_codec.dumps(self.report(), indent=2, ensure_ascii=False)
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+# Jeden licznik na proces – start liczony od pierwszego importu tego modułu
+startup_timer = StartupTimer()
@@ -0,0 +1,64 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QFileDialog, QMessageBox, QHeaderView
+)
+from PyQt5.QtCore import Qt
+
+from startup_timing import startup_timer
+
+class StartupTimingDialog(QDialog):
+    """Fazy uruchamiania programu: czas, liczba importów, nowe pakiety."""
+    def __init__(self, parent=None, timer=startup_timer):
+        super().__init__(parent)
+        self.setWindowTitle("Czas uruchamiania")
+        self.resize(900, 500)
+        self.timer = timer
+        report = timer.report()
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(
+            f"Python {report['python']}, parser JSON: {report['json_backend']}, "
+            f"załadowanych modułów: {report['modules_loaded']}"
+        ))
+
+        tree = QTreeWidget()
+        tree.setHeaderLabels(["Faza", "Start [ms]", "Czas [ms]", "Importy", "Nowe pakiety"])
+        parents = []
+        for phase in report["phases"]:
+            name = phase["name"] + (" (w tle)" if phase.get("async") else "")
+            item = QTreeWidgetItem([
+                name, f"{phase['start_ms']:.1f}", f"{phase['duration_ms']:.1f}",
+                str(phase["imports"]), ", ".join(phase["new_packages"])
+            ])
+            for col in (1, 2, 3):
+                item.setTextAlignment(col, Qt.AlignRight | Qt.AlignVCenter)
+            depth = phase["depth"]
+            del parents[depth:]
+            if parents:
+                parents[-1].addChild(item)
+            else:
+                tree.addTopLevelItem(item)
+            parents.append(item)
+        tree.expandAll()
+        tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        layout.addWidget(tree)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        save_btn = QPushButton("Zapisz JSON...")
+        save_btn.clicked.connect(self.save_json)
+        buttons.addWidget(save_btn)
+        close_btn = QPushButton("Zamknij")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+    def save_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Zapisz raport", "startup_timing.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.timer.dump(path)
+        except OSError as e:
+            print(f"Błąd zapisu raportu: {e}")
+            QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać raportu: {e}")
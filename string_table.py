@@ -0,0 +1,318 @@
+import sys
+from array import array
+
+ID_FIELD = "id"
+KEY_FIELD = "Key"
+
+# Wartość w tablicy ids oznaczająca brak pola "id"
+MISSING_ID = -(2 ** 63)
+
+_NOTHING = object()
+
+class TextColumn:
+    """
+    Jedna kolumna językowa: wszystkie teksty w jednym buforze UTF-8
+    z tablicą przesunięć zamiast osobnego obiektu str na każdy wpis.
+    Wartości nietekstowe i edytowane trzymane są w słowniku other; JSON null
+    to present=1 z None w other (brak pola to present=0).
+    """
+    __slots__ = ("blob", "offsets", "present", "other", "shared")
+
+    def __init__(self, rows=0):
+        self.blob = bytearray()
+        self.offsets = array('I', bytes(4 * (rows + 1)))
+        self.present = bytearray(rows)
+        self.other = {}  # wiersz -> wartość nietekstowa albo po edycji
+        self.shared = False  # blob i offsets wspólne z kopią z fork()
+
+    def __len__(self):
+        return len(self.present)
+
+    def fork(self):
+        """Kopia dzieląca blob i offsets – kopiowane dopiero przy dopisywaniu wierszy."""
+        column = TextColumn.__new__(TextColumn)
+        column.blob = self.blob
+        column.offsets = self.offsets
+        column.present = bytearray(self.present)
+        column.other = dict(self.other)
+        column.shared = self.shared = True
+        return column
+
+    def _own(self):
+        self.blob = bytearray(self.blob)
+        self.offsets = array('I', self.offsets)
+        self.shared = False
+
+    def append(self, value):
+        """Dopisuje wartość pola (None – JSON null); brak pola: append_missing."""
+        if self.shared:
+            self._own()
+        if type(value) is str:
+            self.blob += value.encode("utf-8")
+        else:
+            self.other[len(self.present)] = value
+        self.present.append(1)
+        self.offsets.append(len(self.blob))
+
+    def append_missing(self):
+        if self.shared:
+            self._own()
+        self.present.append(0)
+        self.offsets.append(len(self.blob))
+
+    def extend(self, column):
+        if self.shared:
+            self._own()
+        base = len(self.blob)
+        rows = len(self.present)
+        self.blob += column.blob
+        self.offsets.extend(base + offset for offset in column.offsets[1:])
+        self.present += column.present
+        for row, value in column.other.items():
+            self.other[rows + row] = value
+
+    def extend_missing(self, count):
+        if self.shared:
+            self._own()
+        self.offsets.extend(array('I', [len(self.blob)]) * count)
+        self.present += bytes(count)
+
+    def has(self, row):
+        """Czy wpis ma to pole (także z wartością null)."""
+        return bool(self.present[row])
+
+    def get(self, row):
+        if not self.present[row]:
+            return None
+        if self.other:
+            value = self.other.get(row, _NOTHING)
+            if value is not _NOTHING:
+                return value
+        return self.blob[self.offsets[row]:self.offsets[row + 1]].decode("utf-8")
+
+    def set(self, row, value):
+        # None usuwa pole (jak przy edycji wartości, której wcześniej nie było)
+        if value is None:
+            self.present[row] = 0
+            self.other.pop(row, None)
+        else:
+            self.present[row] = 1
+            self.other[row] = value
+
+    def values(self):
+        return [self.get(row) for row in range(len(self.present))]
+
+    def nbytes(self):
+        return (len(self.blob) + self.offsets.itemsize * len(self.offsets)
+                + len(self.present) + 100 * len(self.other))
+
+class StringTable:
+    """
+    Kolumnowy zapis tabeli stringów D2R (lista obiektów {id, Key, języki...}).
+
+    Zamiast słownika na każdy wpis: tablica id (array 'q'), lista
+    zinternowanych Key i jedna kolumna TextColumn na każdy język.
+    Brak id/Key i wartość null to w ids/keys to samo (None) – wiersze
+    z "id": null i "Key": null pamiętane są osobno.
+    """
+    def __init__(self):
+        self.columns = []       # nazwy kolumn językowych w kolejności wystąpienia
+        self.ids = array('q')
+        self.keys = []
+        self.values = {}        # kolumna -> TextColumn
+        self._generic_ids = None  # lista id, jeśli któreś nie jest liczbą całkowitą
+        self._row_index = None  # (id, Key) -> wiersz, budowany na żądanie
+        self._null_ids = set()  # wiersze z "id": null
+        self._null_keys = set() # wiersze z "Key": null
+
+    @classmethod
+    def from_entries(cls, entries):
+        table = cls()
+        table.append_entries(entries)
+        return table
+
+    def __len__(self):
+        return len(self.keys)
+
+    def fork(self):
+        """
+        Kopia do edycji (np. tabeli z DocumentCache): teksty kolumn są wspólne,
+        a set() i dopisywanie wierszy zmieniają tylko jedną ze stron.
+        """
+        table = StringTable()
+        table.columns = list(self.columns)
+        table.ids = array('q', self.ids)
+        table.keys = list(self.keys)
+        table.values = {name: column.fork() for name, column in self.values.items()}
+        if self._generic_ids is not None:
+            table._generic_ids = list(self._generic_ids)
+        table._null_ids = set(self._null_ids)
+        table._null_keys = set(self._null_keys)
+        return table
+
+    def to_state(self):
+        """Tabela jako bajty, listy i słowniki (marshal) – do cache na dysku."""
+        return {
+            "columns": list(self.columns),
+            "ids": self.ids.tobytes(),
+            "generic_ids": self._generic_ids,
+            "keys": self.keys,
+            "null_ids": self._null_ids,
+            "null_keys": self._null_keys,
+            "values": {
+                name: (bytes(c.blob), c.offsets.tobytes(), bytes(c.present), c.other)
+                for name, c in self.values.items()
+            },
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        intern = sys.intern
+        table = cls()
+        table.columns = [intern(name) for name in state["columns"]]
+        table.ids.frombytes(state["ids"])
+        table._generic_ids = state["generic_ids"]
+        table.keys = [intern(key) if type(key) is str else key for key in state["keys"]]
+        table._null_ids = set(state["null_ids"])
+        table._null_keys = set(state["null_keys"])
+        for name in table.columns:
+            blob, offsets, present, other = state["values"][name]
+            column = TextColumn.__new__(TextColumn)
+            column.blob = blob  # bytes – zamieniany na bytearray dopiero przy dopisywaniu
+            column.offsets = array('I')
+            column.offsets.frombytes(offsets)
+            column.present = bytearray(present)
+            column.other = other
+            column.shared = True
+            table.values[name] = column
+        return table
+
+    def _add_column(self, name, rows=None):
+        name = sys.intern(name)
+        self.columns.append(name)
+        self.values[name] = TextColumn(len(self.keys) if rows is None else rows)
+        return name
+
+    def _append_id(self, value):
+        if self._generic_ids is None:
+            if type(value) is int and MISSING_ID < value < 2 ** 63:
+                self.ids.append(value)
+                return
+            if value is None:
+                self.ids.append(MISSING_ID)
+                return
+            self._generic_ids = [None if v == MISSING_ID else v for v in self.ids]
+            self.ids = array('q')
+        self._generic_ids.append(value)
+
+    def append_entries(self, entries):
+        values = self.values
+        intern = sys.intern
+        for entry in entries:
+            row = len(self.keys)
+            entry_id = entry.get(ID_FIELD)
+            if entry_id is None and ID_FIELD in entry:
+                self._null_ids.add(row)
+            self._append_id(entry_id)
+            key = entry.get(KEY_FIELD)
+            if key is None and KEY_FIELD in entry:
+                self._null_keys.add(row)
+            self.keys.append(intern(key) if type(key) is str else key)
+            for name, value in entry.items():
+                if name == ID_FIELD or name == KEY_FIELD:
+                    continue
+                column = values.get(name)
+                if column is None:
+                    column = values[self._add_column(name, row)]
+                column.append(value)
+            for name in self.columns:
+                column = values[name]
+                if len(column) == row:
+                    column.append_missing()
+        self._row_index = None
+
+    def extend(self, other):
+        """Dopisuje wiersze innej tabeli (np. porcji wczytanej w tle)."""
+        start = len(self)
+        for name in other.columns:
+            if name not in self.values:
+                self._add_column(name)
+        for row in range(len(other)):
+            self._append_id(other.get_id(row))
+        self.keys.extend(other.keys)
+        self._null_ids.update(start + row for row in other._null_ids)
+        self._null_keys.update(start + row for row in other._null_keys)
+        for name in self.columns:
+            column = other.values.get(name)
+            if column is not None:
+                self.values[name].extend(column)
+            else:
+                self.values[name].extend_missing(len(other))
+        self._row_index = None
+        return start
+
+    def get_id(self, row):
+        if self._generic_ids is not None:
+            return self._generic_ids[row]
+        value = self.ids[row]
+        return None if value == MISSING_ID else value
+
+    def get(self, row, field, default=None):
+        if field == ID_FIELD:
+            value = self.get_id(row)
+        elif field == KEY_FIELD:
+            value = self.keys[row]
+        else:
+            column = self.values.get(field)
+            value = column.get(row) if column is not None else None
+        return default if value is None else value
+
+    def set(self, row, field, value):
+        if field == ID_FIELD or field == KEY_FIELD:
+            raise ValueError("Pola id i Key nie są edytowalne")
+        column = self.values.get(field)
+        if column is None:
+            column = self.values[self._add_column(field)]
+        column.set(row, value)
+
+    def column(self, field):
+        """Lista wartości kolumny (None = brak pola)."""
+        if field == ID_FIELD:
+            return [self.get_id(row) for row in range(len(self))]
+        if field == KEY_FIELD:
+            return self.keys
+        column = self.values.get(field)
+        return column.values() if column is not None else [None] * len(self)
+
+    def entry(self, row):
+        """Wpis jako słownik (kolejność pól: id, Key, języki)."""
+        result = {}
+        entry_id = self.get_id(row)
+        if entry_id is not None or row in self._null_ids:
+            result[ID_FIELD] = entry_id
+        key = self.keys[row]
+        if key is not None or row in self._null_keys:
+            result[KEY_FIELD] = key
+        for name in self.columns:
+            column = self.values[name]
+            if column.has(row):
+                result[name] = column.get(row)
+        return result
+
+    def iter_entries(self):
+        for row in range(len(self)):
+            yield self.entry(row)
+
+    def row_of(self, entry_id, key):
+        """Wiersz wpisu o danym (id, Key) albo None."""
+        if self._row_index is None:
+            self._row_index = {(self.get_id(row), k): row for row, k in enumerate(self.keys)}
+        return self._row_index.get((entry_id, key))
+
+    def nbytes(self):
+        """Przybliżone zużycie pamięci tabeli (bez samych Key – są zinternowane)."""
+        if self._generic_ids is not None:
+            ids = 32 * len(self._generic_ids)
+        else:
+            ids = self.ids.itemsize * len(self.ids)
+        return ids + 8 * len(self.keys) + sum(c.nbytes() for c in self.values.values())
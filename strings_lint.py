@@ -0,0 +1,157 @@
+"""
+Sprawdzanie wszystkich plików strings JSON moda bez GUI.
+
+Użycie:
+    python strings_lint.py <folder moda> [-o wynik.json] [-j PROCESY] [--strict]
+
+Reguły są te same co w oknie edycji (d2r_text): tekst dłuższy niż
+MAX_TEXT_LEN to błąd, niepusta linia bez kodu koloru "ÿc" to ostrzeżenie.
+Kod wyjścia: 0 – brak błędów, 1 – są błędy (z --strict także ostrzeżenia),
+2 – nie znaleziono plików.
+"""
+import os
+import sys
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import json_codec
+from d2r_text import MAX_TEXT_LEN, text_length, missing_color_code
+
+STRINGS_DIR = os.path.join("local", "lng", "strings")
+
+# Pola, które nie są tekstami do sprawdzenia
+SKIP_FIELDS = ("id", "Key")
+
+ERROR = "error"
+WARNING = "warning"
+
+def find_strings_files(folder):
+    """
+    Pliki *.json z folderów local/lng/strings w folderze moda.
+    Jeśli sam folder zawiera pliki JSON (np. podano od razu strings), zwraca je.
+    """
+    found = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        if root.endswith(STRINGS_DIR) or os.path.samefile(root, folder):
+            found.extend(
+                os.path.join(root, name) for name in sorted(files)
+                if name.lower().endswith(".json")
+            )
+    return found
+
+def lint_entries(entries):
+    """
+    Sprawdza wpisy jednego pliku.
+
+    Returns:
+        lista słowników problemów (bez pola "file")
+    """
+    issues = []
+    for row, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            issues.append({"row": row, "rule": "not_object", "severity": ERROR,
+                           "message": "Wpis nie jest obiektem JSON"})
+            continue
+        for field, text in entry.items():
+            if field in SKIP_FIELDS or type(text) is not str:
+                continue
+            length = text_length(text)
+            if length > MAX_TEXT_LEN:
+                issues.append({
+                    "row": row, "id": entry.get("id"), "Key": entry.get("Key"),
+                    "field": field, "rule": "too_long", "severity": ERROR,
+                    "message": f"Tekst ma {length} znaków (limit {MAX_TEXT_LEN})",
+                })
+            if "\n" in text:
+                lines = [i for i, line in enumerate(text.split("\n"), 1) if missing_color_code(line)]
+            elif text.startswith("ÿc"):
+                continue
+            else:
+                lines = [1] if missing_color_code(text) else []
+            if lines:
+                issues.append({
+                    "row": row, "id": entry.get("id"), "Key": entry.get("Key"),
+                    "field": field, "rule": "missing_color", "severity": WARNING,
+                    "message": "Brak kodu koloru w linii/liniach: " + ", ".join(map(str, lines)),
+                    "lines": lines,
+                })
+    return issues
+
+def lint_file(path):
+    """
+    Returns:
+        (ścieżka, liczba wpisów, lista problemów)
+    """
+    try:
+        entries = json_codec.load_path(path)
+    except (OSError, ValueError) as e:
+        return path, 0, [{"rule": "invalid_json", "severity": ERROR, "message": str(e)}]
+    if not isinstance(entries, list):
+        return path, 0, [{"rule": "not_array", "severity": ERROR,
+                          "message": "Plik nie zawiera tablicy JSON"}]
+    return path, len(entries), lint_entries(entries)
+
+def lint_files(paths, jobs=None, pool=None):
+    """
+    Sprawdza pliki równolegle (jeden plik = jedno zadanie) – w podanej `pool`
+    albo (w programie) we wspólnej puli procesów z jobs.
+
+    Returns:
+        słownik z podsumowaniem i listą problemów (gotowy do json.dump)
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and len(paths) > 1:
+        if pool is None:
+            from jobs import job_service  # tutaj – procesy puli importują ten moduł bez Qt
+            pool = job_service().process_pool()
+        # Największe pliki najpierw – lepiej rozkładają się na procesy
+        order = sorted(paths, key=os.path.getsize, reverse=True)
+        results = {path: result for path, *result in pool.map(lint_file, order)}
+        results = [(path, *results[path]) for path in paths]
+    else:
+        results = [lint_file(path) for path in paths]
+
+    report = {"files": len(paths), "entries": 0, "errors": 0, "warnings": 0, "issues": []}
+    for path, count, issues in results:
+        report["entries"] += count
+        for issue in issues:
+            report["errors" if issue["severity"] == ERROR else "warnings"] += 1
+            report["issues"].append({"file": path, **issue})
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sprawdza pliki strings JSON moda D2R.")
+    parser.add_argument("folder", help="folder moda (np. mod.mpq/data) albo folder strings")
+    parser.add_argument("-o", "--output", help="plik wyniku JSON (domyślnie standardowe wyjście)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="liczba procesów")
+    parser.add_argument("--strict", action="store_true", help="ostrzeżenia też kończą się kodem 1")
+    args = parser.parse_args(argv)
+
+    paths = find_strings_files(args.folder)
+    if not paths:
+        print(f"Nie znaleziono plików strings JSON w: {args.folder}", file=sys.stderr)
+        return 2
+
+    # Własna pula procesów – bez jobs/PyQt5, działa bez Qt i bez ekranu
+    with ProcessPoolExecutor(max_workers=args.jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+        report = lint_files(paths, args.jobs, pool)
+    data = json_codec.dumps(report, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data)
+    else:
+        print(data)
+    print(
+        f"Plików: {report['files']}, wpisów: {report['entries']}, "
+        f"błędów: {report['errors']}, ostrzeżeń: {report['warnings']}",
+        file=sys.stderr
+    )
+    if report["errors"] or (args.strict and report["warnings"]):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
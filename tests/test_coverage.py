@@ -0,0 +1,51 @@
+import json
+import os
+
+import coverage
+from coverage import (
+    EMPTY, MISSING, SAME, CoverageCache, all_languages, coverage_rows, language_counts, table_coverage
+)
+from string_table import StringTable
+
+ENTRIES = [
+    {"id": 1, "Key": "a", "enUS": "Sword", "plPL": "Miecz", "deDE": "Sword"},
+    {"id": 2, "Key": "b", "enUS": "Shield", "plPL": ""},
+    {"id": 3, "Key": "c", "enUS": "Helm", "plPL": "Helm", "deDE": None},
+]
+
+def write(path, entries):
+    path.write_text(json.dumps(entries), encoding="utf-8")
+    return str(path)
+
+def test_coverage_matrix():
+    table = StringTable.from_entries(ENTRIES)
+    result = table_coverage(table)
+    assert result["entries"] == 3
+    assert result["languages"]["enUS"] == {MISSING: 0, EMPTY: 0, SAME: 0}
+    assert result["languages"]["plPL"] == {MISSING: 0, EMPTY: 1, SAME: 1}
+    assert result["languages"]["deDE"] == {MISSING: 2, EMPTY: 0, SAME: 1}
+    assert coverage_rows(table, "plPL", SAME) == [2]
+    assert coverage_rows(table, "deDE", MISSING) == [1, 2]
+    assert language_counts(result, "frFR") == {MISSING: 3, EMPTY: 0, SAME: 0}
+    assert all_languages({"x": result, "y": {"entries": 0, "languages": {"esES": {}}}}) == \
+        ["enUS", "deDE", "esES", "plPL"]
+
+def test_scan_recomputes_only_changed_files(tmp_path, monkeypatch):
+    a = write(tmp_path / "a.json", ENTRIES)
+    b = write(tmp_path / "b.json", ENTRIES[:1])
+    broken = tmp_path / "c.json"
+    broken.write_text("{", encoding="utf-8")
+    loaded = []
+    load_table = coverage.load_table
+    monkeypatch.setattr(coverage, "load_table", lambda path: loaded.append(path) or load_table(path))
+    cache = CoverageCache()
+    results = cache.scan([a, b, str(broken)])
+    assert set(results) == {a, b}
+    write(tmp_path / "b.json", ENTRIES[:2])
+    loaded.clear()
+    results = cache.scan([a, b])
+    assert loaded == [b]
+    assert results[b]["entries"] == 2
+    os.remove(a)
+    assert cache.update_file(a) is True
+    assert cache.paths() == [b]
@@ -0,0 +1,38 @@
+import random
+
+from d2r_text import IncrementalD2RText, text_length, missing_color_code, render_d2r_html
+
+PIECES = ["ÿc4", "ÿc1", "ÿcx", "Miecz", " ", "", "ąę", "ÿc"]
+
+def random_line(rng):
+    return "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 4)))
+
+def assert_matches(state, text):
+    fresh = IncrementalD2RText(text)
+    assert state.lines == text.split("\n")
+    assert state.length == text_length(text)
+    assert state.missing_color_lines() == [
+        i for i, line in enumerate(text.split("\n"), 1) if missing_color_code(line)
+    ]
+    assert [state.line_html(i) for i in range(len(state.lines))] == \
+        [fresh.line_html(i) for i in range(len(fresh.lines))]
+    assert state.html("F") == render_d2r_html(text, "F")
+
+def test_replace_lines_matches_full_tokenize():
+    rng = random.Random(8)
+    state = IncrementalD2RText("")
+    for _ in range(2000):
+        lines = list(state.lines)
+        start = rng.randint(0, len(lines))
+        removed = rng.randint(0, len(lines) - start)
+        new_lines = [random_line(rng) for _ in range(rng.randint(0, 3))]
+        if len(lines) - removed + len(new_lines) == 0:
+            new_lines = [""]
+        first, stop = state.replace_lines(start, removed, new_lines)
+        assert first <= start and stop == start + len(new_lines)
+        assert_matches(state, "\n".join(lines[:start] + new_lines + lines[start + removed:]))
+
+def test_update_with_whole_text():
+    state = IncrementalD2RText("ÿc4a\nb")
+    state.update("ÿc4a\nÿc1b\nc")
+    assert_matches(state, "ÿc4a\nÿc1b\nc")
@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Plugins", "data_diff"))
+
+import diff_txt_popup
+from disk_cache import DiskCache
+from jobs import JobCancelled
+
+ROWS = 3000
+
+@pytest.fixture
+def txt_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(diff_txt_popup, "disk_cache", DiskCache(str(tmp_path / "cache"), min_file_size=0))
+    path = tmp_path / "skills.txt"
+    path.write_text("".join(f"skill{i}\t{i}\n" for i in range(ROWS)), encoding="utf-8")
+    return str(path)
+
+def test_cancelled_load_is_not_cached(txt_file):
+    def cancel(read, size):
+        raise JobCancelled()
+    with pytest.raises(JobCancelled):
+        diff_txt_popup.load_txt_as_list(txt_file, cancel)
+    rows = diff_txt_popup.load_txt_as_list(txt_file)
+    assert len(rows) == ROWS
+    assert rows[-1] == ["skill2999", "2999"]
+    assert diff_txt_popup.disk_cache.misses == 2
+
+def test_failed_encodings_reset_rows(txt_file):
+    # Pierwsze kodowanie pada w połowie pliku – wiersze nie mogą się zdublować
+    with open(txt_file, "ab") as f:
+        f.write(b"caf\xe9\t1\n")
+    rows = diff_txt_popup.load_txt_as_list(txt_file)
+    assert len(rows) == ROWS + 1
+    assert rows[-1] == ["café", "1"]
+
+def test_unreadable_file_is_not_cached(txt_file, monkeypatch):
+    def no_access(*args, **kwargs):
+        raise OSError("brak dostępu")
+    monkeypatch.setattr(diff_txt_popup, "open", no_access, raising=False)
+    with pytest.raises(ValueError):
+        diff_txt_popup.load_txt_as_list(txt_file)
+    monkeypatch.delattr(diff_txt_popup, "open")
+    assert len(diff_txt_popup.load_txt_as_list(txt_file)) == ROWS
@@ -0,0 +1,80 @@
+import os
+import struct
+
+from disk_cache import CACHE_VERSION, INDEX_NAME, MAGIC, DiskCache
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def counting_parse(calls):
+    def parse(path):
+        calls.append(path)
+        with open(path, encoding="utf-8") as f:
+            return f.read().splitlines()
+    return parse
+
+def test_hit_until_file_changes(tmp_path):
+    path = write(tmp_path / "a.txt", "a\nb\n")
+    calls = []
+    cache = DiskCache(str(tmp_path / "cache"), min_file_size=0)
+    assert cache.load(path, "txt-1", counting_parse(calls)) == ["a", "b"]
+    # Nowa instancja (ponowne uruchomienie) czyta index.bin z dysku
+    cache = DiskCache(str(tmp_path / "cache"), min_file_size=0)
+    assert cache.load(path, "txt-1", counting_parse(calls)) == ["a", "b"]
+    assert len(calls) == 1 and cache.hits == 1
+    write(tmp_path / "a.txt", "a\nb\nc\n")
+    assert cache.load(path, "txt-1", counting_parse(calls)) == ["a", "b", "c"]
+    assert len(calls) == 2
+
+def test_same_content_elsewhere_is_a_hit(tmp_path):
+    calls = []
+    cache = DiskCache(str(tmp_path / "cache"), min_file_size=0)
+    cache.load(write(tmp_path / "a.txt", "x\n"), "txt-1", counting_parse(calls))
+    assert cache.load(write(tmp_path / "b.txt", "x\n"), "txt-1", counting_parse(calls)) == ["x"]
+    assert len(calls) == 1
+
+def test_corrupt_or_stale_index_is_ignored(tmp_path):
+    directory = tmp_path / "cache"
+    path = write(tmp_path / "a.txt", "a\n")
+    calls = []
+    DiskCache(str(directory), min_file_size=0).load(path, "txt-1", counting_parse(calls))
+    index = directory / INDEX_NAME
+    index.write_bytes(b"\x00garbage")
+    assert DiskCache(str(directory), min_file_size=0).load(path, "txt-1", counting_parse(calls)) == ["a"]
+    assert len(calls) == 1  # bez indeksu wynik znaleziony po odcisku zawartości
+    # Indeks z innej wersji cache – wpisy pomijane, wynik liczony od nowa
+    raw = index.read_bytes()
+    index.write_bytes(struct.pack("<4sHH", MAGIC, CACHE_VERSION + 1, 0) + raw[8:])
+    for name in os.listdir(directory):
+        if name != INDEX_NAME:
+            (directory / name).write_bytes(b"\x00")  # uszkodzony plik wyniku
+    cache = DiskCache(str(directory), min_file_size=0)
+    assert cache.get(path, "txt-1") is None
+    assert cache.load(path, "txt-1", counting_parse(calls)) == ["a"]
+    assert len(calls) == 2
+
+def test_put_ignores_changed_file_and_small_files_skip_cache(tmp_path):
+    path = write(tmp_path / "a.txt", "a\n")
+    cache = DiskCache(str(tmp_path / "cache"), min_file_size=0)
+    st = os.stat(path)
+    assert not cache.put(path, "txt-1", ["old"], (st.st_size + 1, st.st_mtime_ns))
+    assert cache.put(path, "txt-1", ["a"], (st.st_size, st.st_mtime_ns))
+    assert cache.get(path, "txt-1") == ["a"]
+    calls = []
+    small = DiskCache(str(tmp_path / "other"), min_file_size=1024)
+    small.load(path, "txt-1", counting_parse(calls))
+    assert not os.path.exists(tmp_path / "other") and len(calls) == 1
+
+def test_size_limit_removes_oldest_results(tmp_path):
+    directory = tmp_path / "cache"
+    cache = DiskCache(str(directory), max_bytes=1500, min_file_size=0)
+    paths = [write(tmp_path / f"{n}.txt", f"{n}\n" * 100) for n in range(4)]
+    for path in paths:
+        cache.load(path, "txt-1", counting_parse([]))
+    blobs = [name for name in os.listdir(directory) if name != INDEX_NAME]
+    assert 0 < len(blobs) < 4
+    assert cache.size() <= 1500 + os.path.getsize(directory / INDEX_NAME)
+    calls = []
+    cache.load(paths[-1], "txt-1", counting_parse(calls))
+    assert calls == []  # najnowszy wynik został
@@ -0,0 +1,44 @@
+import json
+import os
+
+from document_cache import JSON_SIZE_FACTOR, DocumentCache
+
+def write(path, entries):
+    path.write_text(json.dumps(entries), encoding="utf-8")
+    return str(path)
+
+def entries(text):
+    return [{"id": 1, "Key": "a", "enUS": text}]
+
+def test_entry_invalidated_by_file_change(tmp_path):
+    path = write(tmp_path / "a.json", entries("Sword"))
+    cache = DocumentCache()
+    first = cache.json(path)
+    assert cache.json(path) is first and cache.hits == 1
+    write(tmp_path / "a.json", entries("Long sword"))
+    assert cache.json(path)[0]["enUS"] == "Long sword"
+    assert cache.misses == 2
+
+def test_least_recently_used_is_evicted(tmp_path):
+    paths = [write(tmp_path / f"{name}.json", entries("x")) for name in "abc"]
+    size = JSON_SIZE_FACTOR * os.path.getsize(paths[0])
+    cache = DocumentCache(max_bytes=2 * size)
+    a = cache.json(paths[0])
+    cache.json(paths[1])
+    assert cache.json(paths[0]) is a  # a używany ostatnio – usunięty zostanie b
+    cache.json(paths[2])
+    assert cache.nbytes == 2 * size
+    assert cache.json(paths[0]) is a
+    hits = cache.hits
+    cache.json(paths[1])
+    assert cache.hits == hits  # b trzeba było wczytać ponownie
+
+def test_strings_copies_are_independent(tmp_path):
+    path = write(tmp_path / "a.json", entries("Sword"))
+    cache = DocumentCache()
+    table, offsets, signature = cache.strings(path)
+    table.set(0, "enUS", "Edited")
+    assert cache.strings(path)[0].get(0, "enUS") == "Sword"
+    assert signature == (os.path.getsize(path), os.stat(path).st_mtime_ns)
+    cache.invalidate(path)
+    assert cache.nbytes == 0 and cache.cached_strings(path) is None
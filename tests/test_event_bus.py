@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+from PyQt5 import sip
+from PyQt5.QtCore import QCoreApplication, QObject
+
+from event_bus import Event, EventBus, FileOpened, FileSaved, FolderChanged, TabClosed
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+@pytest.fixture
+def bus(app):
+    return EventBus()
+
+def test_events_for_same_file_are_coalesced(bus):
+    got = []
+    bus.subscribe(Event, got.append)
+    for _ in range(5):
+        bus.publish(FileSaved("/mod/a.json"))
+    bus.publish(FileSaved("/mod/b.json"))
+    bus.publish(FolderChanged("/mod", ["/mod/1"]))
+    bus.publish(FolderChanged("/mod", ["/mod/2"]))
+    assert got == []  # dostarczane dopiero po COALESCE_MS
+    bus.flush()
+    assert [type(e) for e in got] == [FileSaved, FileSaved, FolderChanged]
+    assert got[2].paths == {"/mod/1", "/mod/2"}
+
+def test_folder_change_without_paths_wins(bus):
+    got = []
+    bus.subscribe(FolderChanged, got.append)
+    bus.publish(FolderChanged("/mod", ["/mod/1"]))
+    bus.publish(FolderChanged("/mod"))
+    bus.flush()
+    assert len(got) == 1 and got[0].paths is None
+
+def test_reopened_file_is_delivered_last(bus):
+    got = []
+    bus.subscribe(Event, lambda e: got.append(type(e).__name__))
+    bus.publish(FileOpened("/mod/a.json"))
+    bus.publish(TabClosed("/mod/a.json"))
+    bus.publish(FileOpened("/mod/a.json"))
+    bus.flush()
+    assert got == ["TabClosed", "FileOpened"]
+
+def test_timer_delivers_and_failing_handler_does_not_stop_others(app, bus):
+    got = []
+    bus.subscribe(FileSaved, lambda e: 1 / 0)
+    bus.subscribe(FileSaved, got.append)
+    bus.publish(FileSaved("/mod/a.json"))
+    end = time.monotonic() + 5
+    while not got and time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.01)
+    assert [e.path for e in got] == ["/mod/a.json"]
+
+def test_publish_from_thread_and_owner_unsubscribe(app, bus):
+    got, owned = [], []
+    owner = QObject()
+    bus.subscribe(FileSaved, got.append)
+    bus.subscribe(FileSaved, owned.append, owner=owner)
+    thread = threading.Thread(target=lambda: bus.publish(FileSaved("/mod/t.json")))
+    thread.start()
+    thread.join()
+    end = time.monotonic() + 5
+    while not bus._pending and time.monotonic() < end:
+        app.processEvents()
+    bus.flush()
+    assert [e.path for e in got] == ["/mod/t.json"] and len(owned) == 1
+    sip.delete(owner)
+    bus.publish(FileSaved("/mod/a.json"))
+    bus.flush()
+    assert len(got) == 2 and len(owned) == 1
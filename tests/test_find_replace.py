@@ -0,0 +1,61 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from find_replace import apply_matches, group_by_file, iter_find
+
+ENTRIES = [
+    {"id": 1, "Key": "Sword", "enUS": "Sword of Fire", "plPL": "Miecz Ognia"},
+    {"id": 2, "Key": "Shield", "enUS": "Fire Shield", "plPL": "Tarcza", "count": 5},
+    {"id": 3, "Key": "Helm", "enUS": "Helm", "plPL": "Hełm"},
+]
+
+def write(tmp_path, name, entries=ENTRIES):
+    path = tmp_path / name
+    path.write_text(json.dumps(entries, indent=2, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+def read_json(path):
+    with open(path, "rb") as f:
+        return json.loads(f.read().decode("utf-8-sig"))
+
+def find_all(paths, *args, **kwargs):
+    return {path: (matches, error) for path, matches, error in iter_find(paths, *args, **kwargs)}
+
+def test_regex_replace_skips_ids_and_other_fields(tmp_path):
+    path = write(tmp_path, "a.json")
+    (matches, error), = find_all([path], r"(\w+) Shield", r"\1 Buckler", jobs=1).values()
+    assert error is None
+    assert [(m.row, m.field, m.old, m.new, m.count) for m in matches] == [
+        (1, "enUS", "Fire Shield", "Fire Buckler", 1)
+    ]
+    (matches, _), = find_all([path], "fire", "Ice", re.IGNORECASE, fields=["enUS"], jobs=1).values()
+    assert [m.new for m in matches] == ["Sword of Ice", "Ice Shield"]
+
+def test_pool_search_reports_each_file(tmp_path):
+    good = write(tmp_path, "a.json")
+    broken = tmp_path / "b.json"
+    broken.write_text("[{", encoding="utf-8")
+    with ThreadPoolExecutor(2) as pool:
+        results = find_all([good, str(broken)], "Hełm", "Kask", jobs=2, pool=pool)
+    assert [m.new for m in results[good][0]] == ["Kask"]
+    assert results[str(broken)][0] == [] and results[str(broken)][1]
+
+def test_invalid_pattern_fails_before_search(tmp_path):
+    with pytest.raises(re.error):
+        list(iter_find([write(tmp_path, "a.json")], "(", "x", jobs=1))
+    with pytest.raises(re.error):
+        list(iter_find([write(tmp_path, "a.json")], "a", r"\9", jobs=1))
+
+def test_apply_skips_values_changed_on_disk(tmp_path):
+    path = write(tmp_path, "a.json")
+    (matches, _), = find_all([path], "Fire", "Ice", jobs=1).values()
+    changed = [dict(e) for e in ENTRIES]
+    changed[1]["enUS"] = "Fire Shield (zmienione)"
+    write(tmp_path, "a.json", changed)
+    assert apply_matches(path, group_by_file(matches)[path]) == (1, 1)
+    data = read_json(path)
+    assert data[0]["enUS"] == "Sword of Ice"
+    assert data[1]["enUS"] == "Fire Shield (zmienione)"
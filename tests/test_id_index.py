@@ -0,0 +1,30 @@
+import json
+
+from id_index import IdIndex
+
+def write_strings(tmp_path, name, ids):
+    path = tmp_path / name
+    path.write_text(json.dumps([{"id": i, "Key": f"k{n}"} for n, i in enumerate(ids)]), encoding="utf-8")
+    return str(path)
+
+def test_counts_survive_overflow(tmp_path):
+    many = write_strings(tmp_path, "many.json", [5] * 300)
+    one = write_strings(tmp_path, "one.json", [5])
+    index = IdIndex()
+    index.refresh([many, one])
+    assert 5 in index.duplicate_ids()
+    index.remove_file(many)
+    assert index.is_id_used(5)
+    assert index.next_free_range(1, start=5) == 6
+    assert 5 not in index.duplicate_ids()
+    index.remove_file(one)
+    assert not index.is_id_used(5)
+
+def test_locate_id_outside_bitmap(tmp_path):
+    path = write_strings(tmp_path, "other.json", [1, "abc", 10 ** 9, "abc"])
+    index = IdIndex()
+    index.refresh([path])
+    assert index.locate_id("abc") == [(path, 1), (path, 3)]
+    assert index.locate_id(10 ** 9) == [(path, 2)]
+    assert index.locate_id(1) == [(path, 0)]
+    assert "abc" in index.duplicate_ids()
@@ -0,0 +1,109 @@
+import math
+import threading
+import time
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+
+from jobs import JobService, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+@pytest.fixture
+def service(app):
+    services = []
+
+    def make(**kwargs):
+        services.append(JobService(**kwargs))
+        return services[-1]
+    yield make
+    for s in services:
+        s.shutdown(wait=True)
+
+def pump(app, condition, timeout=10):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+def test_queue_runs_by_priority(app, service):
+    jobs = service(max_threads=1)
+    gate = threading.Event()
+    order = []
+    jobs.submit(lambda job: gate.wait(5))
+    started = [jobs.submit(lambda job, p=p: order.append(p), priority=p)
+               for p in (PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH)]
+    gate.set()
+    assert pump(app, lambda: all(job.is_finished() for job in started))
+    assert order == [PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW]
+
+def test_high_priority_thread_is_reserved(app, service):
+    jobs = service(max_threads=2)
+    gate = threading.Event()
+    low = [jobs.submit(lambda job: gate.wait(5), priority=PRIORITY_LOW) for _ in range(2)]
+    high = jobs.submit(lambda job: "szukaj", priority=PRIORITY_HIGH)
+    assert high.wait(5)
+    assert jobs.pending() == [low[1]]  # drugie tło czeka mimo wolnego wątku
+    gate.set()
+    assert all(job.wait(5) for job in low)
+
+def test_single_thread_runs_background_jobs(app, service):
+    jobs = service(max_threads=1)
+    results = []
+    job = jobs.submit(lambda job: 42, priority=PRIORITY_LOW, on_done=results.append)
+    assert job.wait(5)
+    assert pump(app, lambda: results == [42])
+
+def test_check_cancelled_emits_cancelled(app, service):
+    jobs = service(max_threads=1)
+    running = threading.Event()
+    signals = []
+
+    def work(job):
+        running.set()
+        while True:
+            job.check_cancelled()
+            time.sleep(0.001)
+    job = jobs.create(work)
+    job.done.connect(lambda result: signals.append("done"))
+    job.cancelled.connect(lambda: signals.append("cancelled"))
+    job.finished.connect(lambda: signals.append("finished"))
+    job.start()
+    assert running.wait(5)
+    job.cancel()
+    assert pump(app, lambda: "finished" in signals)
+    assert signals == ["cancelled", "finished"]
+
+def test_cancel_pending_job_never_runs(app, service):
+    jobs = service(max_threads=1)
+    gate = threading.Event()
+    ran = []
+    signals = []
+    blocker = jobs.submit(lambda job: gate.wait(5))
+    job = jobs.create(lambda job: ran.append(1))
+    job.cancelled.connect(lambda: signals.append("cancelled"))
+    job.start()
+    job.cancel()
+    assert job.is_finished() and jobs.pending() == []
+    gate.set()
+    assert blocker.wait(5)
+    assert pump(app, lambda: signals == ["cancelled"])
+    assert ran == []
+
+def test_failure_emits_failed(app, service):
+    jobs = service(max_threads=1)
+    errors = []
+    job = jobs.submit(lambda job: 1 / 0, on_failed=errors.append)
+    assert job.wait(5)
+    assert pump(app, lambda: errors)
+    assert "division" in errors[0]
+
+def test_map_processes(app, service):
+    jobs = service(max_threads=1, max_processes=2)
+    partial, done = [], []
+    jobs.map_processes(math.sqrt, [1, 4, 9], on_partial=partial.append, on_done=done.append)
+    assert pump(app, lambda: done, timeout=60)
+    assert done == [3] and sorted(partial) == [(1, 1.0), (4, 2.0), (9, 3.0)]
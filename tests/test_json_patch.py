@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from json_patch import (
+    BOM, EntryOffsets, FileChangedError, PatchError, dump_entries, file_signature, patch_file,
+    save_edits
+)
+from json_stream import read_strings_file
+from string_table import StringTable
+
+ENTRIES = [
+    {"id": 1, "Key": "a", "enUS": "ÿc4Miecz", "plPL": "Żółć"},
+    {"id": 2, "Key": "b", "enUS": "Shield", "plPL": "Tarcza"},
+    {"id": 3, "Key": "c", "enUS": "ÿc1Helm", "plPL": "Hełm \"zł\""},
+]
+
+def write_entries(tmp_path, entries, bom=True, ensure_ascii=False):
+    path = tmp_path / "strings.json"
+    text = json.dumps(entries, indent=2, ensure_ascii=ensure_ascii)
+    path.write_bytes((BOM if bom else b"") + text.encode("utf-8"))
+    return str(path)
+
+def read_json(path):
+    with open(path, "rb") as f:
+        return json.loads(f.read().decode("utf-8-sig"))
+
+def test_dump_entries_matches_json_dumps():
+    raw, offsets = dump_entries(ENTRIES)
+    assert raw == BOM + json.dumps(ENTRIES, indent=2, ensure_ascii=False).encode("utf-8")
+    for row, entry in enumerate(ENTRIES):
+        obj = raw[offsets.bases[row]:offsets.bases[row] + offsets.sizes[row]]
+        assert json.loads(obj) == entry
+
+def test_dump_entries_empty():
+    assert dump_entries([], bom=False)[0] == b"[]"
+
+def test_shift_moves_following_entries():
+    offsets = EntryOffsets()
+    for base in (10, 20, 30, 40):
+        offsets.append(base, 5)
+    offsets._shift([(0, 3), (2, -1)])
+    assert list(offsets.bases) == [10, 23, 33, 42]
+    assert list(offsets.sizes) == [8, 5, 4, 5]
+
+@pytest.mark.parametrize("bom", [True, False])
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_patch_longer_value_shifts_offsets(tmp_path, bom, ensure_ascii):
+    path = write_entries(tmp_path, ENTRIES, bom, ensure_ascii)
+    _, offsets, signature = read_strings_file(path)
+    signature = patch_file(path, offsets, [(0, "plPL", "Żółć", "Żółć – dłuższy")], signature)
+    # Kolejna łatka korzysta z pozycji przesuniętych przez poprzednią
+    signature = patch_file(path, offsets, [(2, "enUS", "ÿc1Helm", "ÿc8Hełm")], signature)
+    expected = [dict(e) for e in ENTRIES]
+    expected[0]["plPL"] = "Żółć – dłuższy"
+    expected[2]["enUS"] = "ÿc8Hełm"
+    assert read_json(path) == expected
+    assert signature == file_signature(path)
+    with open(path, "rb") as f:
+        raw = f.read()
+    assert raw.startswith(BOM) == bom
+    for row, entry in enumerate(expected):
+        assert json.loads(raw[offsets.bases[row]:offsets.bases[row] + offsets.sizes[row]]) == entry
+
+def test_patch_same_length_non_ascii(tmp_path):
+    path = write_entries(tmp_path, ENTRIES)
+    _, offsets, signature = read_strings_file(path)
+    patch_file(path, offsets, [(0, "enUS", "ÿc4Miecz", "ÿc8Miecz"), (2, "plPL", "Hełm \"zł\"", "Hełm \"źł\"")], signature)
+    data = read_json(path)
+    assert data[0]["enUS"] == "ÿc8Miecz"
+    assert data[2]["plPL"] == "Hełm \"źł\""
+    assert data[1] == ENTRIES[1]
+
+def test_patch_rejects_changed_file(tmp_path):
+    path = write_entries(tmp_path, ENTRIES)
+    _, offsets, signature = read_strings_file(path)
+    with pytest.raises(FileChangedError):
+        patch_file(path, offsets, [(1, "enUS", "Shield", "Tarcza")], (signature[0] + 1, signature[1]))
+    with pytest.raises(FileChangedError):
+        patch_file(path, offsets, [(1, "enUS", "Inna wartość", "Tarcza")], signature)
+    assert read_json(path) == ENTRIES
+
+def test_save_edits_does_not_overwrite_changed_file(tmp_path):
+    path = write_entries(tmp_path, ENTRIES)
+    table, offsets, signature = read_strings_file(path)
+    table.set(1, "enUS", "Buckler")
+    edits = [(1, "enUS", "Shield", "Buckler")]
+    stale = (signature[0] + 1, signature[1])
+    with pytest.raises(FileChangedError):
+        save_edits(path, table, offsets, stale, edits)
+    with pytest.raises(FileChangedError):
+        save_edits(path, table, None, stale, edits)
+    assert read_json(path) == ENTRIES
+
+def test_save_edits_full_write_without_offsets(tmp_path):
+    path = write_entries(tmp_path, ENTRIES)
+    table = StringTable.from_entries(ENTRIES)
+    table.set(1, "enUS", "Buckler")
+    signature, offsets = save_edits(path, table, None, file_signature(path), [(1, "enUS", "Shield", "Buckler")])
+    assert read_json(path)[1]["enUS"] == "Buckler"
+    assert len(offsets) == len(ENTRIES)
+    assert signature == file_signature(path)
+
+def test_patch_rejects_overlapping_edits(tmp_path):
+    path = write_entries(tmp_path, ENTRIES)
+    _, offsets, signature = read_strings_file(path)
+    edits = [(1, "plPL", "Tarcza", "AAA"), (1, "plPL", "Tarcza", "BBB")]
+    with pytest.raises(PatchError) as error:
+        patch_file(path, offsets, edits, signature)
+    assert error.type is PatchError  # nie FileChangedError – save_edits zapisze cały plik
+    assert read_json(path) == ENTRIES
+
+def test_save_edits_falls_back_on_overlapping_edits(tmp_path):
+    path = write_entries(tmp_path, ENTRIES)
+    table, offsets, signature = read_strings_file(path)
+    table.set(1, "plPL", "BBB")
+    edits = [(1, "plPL", "Tarcza", "AAA"), (1, "plPL", "Tarcza", "BBB")]
+    save_edits(path, table, offsets, signature, edits)
+    assert read_json(path)[1]["plPL"] == "BBB"
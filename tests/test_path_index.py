@@ -0,0 +1,20 @@
+from path_index import PathIndex
+
+def test_scan_and_apply_new_and_removed_directories(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "x.txt").write_text("")
+    index = PathIndex().build(str(tmp_path))
+    (tmp_path / "a" / "new" / "deep").mkdir(parents=True)
+    (tmp_path / "a" / "new" / "deep" / "y.json").write_text("[]")
+    (tmp_path / "a" / "z.txt").write_text("")
+    directory = str(tmp_path / "a")
+    scan = index.scan_directory(directory, index.known_subdirs(directory))
+    assert index.files == {"a/x.txt"}  # skan nie zmienia indeksu
+    assert index.apply_scan(scan) == {"a/new", "a/new/deep"}
+    assert index.files == {"a/x.txt", "a/z.txt", "a/new/deep/y.json"}
+    (tmp_path / "a" / "new" / "deep" / "y.json").unlink()
+    (tmp_path / "a" / "new" / "deep").rmdir()
+    (tmp_path / "a" / "new").rmdir()
+    assert index.update_directory(directory) == set()
+    assert index.files == {"a/x.txt", "a/z.txt"}
+    assert index.dirs == {"", "a"}
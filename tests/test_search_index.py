@@ -0,0 +1,55 @@
+import threading
+
+from search_index import TrigramIndex, linear_search
+from string_table import StringTable
+
+def make_table(count=5000):
+    return StringTable.from_entries(
+        [{"id": i, "Key": f"key{i}", "enUS": f"Sword {i}", "plPL": f"Miecz {i}"} for i in range(count)]
+    )
+
+def test_edit_during_build_is_applied():
+    table = make_table()
+    index = TrigramIndex()
+    edited = []
+
+    def is_cancelled():
+        # Teksty tabeli są już przeczytane – edycja jak z wątku GUI w trakcie budowy
+        if not edited:
+            table.set(10, "plPL", "Tarcza zmieniona")
+            index.update_row(10, table)
+            edited.append(10)
+        return False
+
+    index.build(table, is_cancelled)
+    assert index.ready
+    assert index.search("tarcza") == [10]
+    assert index.search("miecz 10") == linear_search(table, "miecz 10")
+
+def test_search_while_rows_change():
+    table = make_table()
+    index = TrigramIndex()
+    index.build(table)
+    errors = []
+    stop = threading.Event()
+
+    def search_loop():
+        try:
+            while not stop.is_set():
+                index.search("mie")
+                index.search("tar")
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=search_loop)
+    thread.start()
+    try:
+        for n in range(3000):
+            row = n % len(table)
+            table.set(row, "plPL", "Tarcza" if n % 2 else "Miecz")
+            index.update_row(row, table)
+    finally:
+        stop.set()
+        thread.join()
+    assert not errors
+    assert index.search("tarcza") == linear_search(table, "tarcza")
@@ -0,0 +1,57 @@
+import json
+
+from json_patch import BOM, dump_entries, save_edits
+from json_stream import read_strings_file
+from string_table import StringTable
+
+ENTRIES = [
+    {"id": 1, "Key": "a", "enUS": "Sword", "plPL": None},
+    {"id": 2, "Key": "b", "enUS": "Shield"},
+    {"id": 3, "Key": "c", "enUS": None, "plPL": "Hełm", "deDE": 7},
+]
+
+def test_null_values_round_trip():
+    table = StringTable.from_entries(ENTRIES)
+    assert table.get(0, "plPL") is None
+    assert list(table.iter_entries()) == ENTRIES
+    raw, _ = dump_entries(table.iter_entries())
+    assert json.loads(raw[len(BOM):]) == ENTRIES
+
+def test_null_values_survive_fork_state_and_extend():
+    table = StringTable.from_entries(ENTRIES)
+    assert list(StringTable.from_state(table.to_state()).iter_entries()) == ENTRIES
+    fork = table.fork()
+    fork.set(1, "plPL", "Tarcza")
+    assert fork.entry(1)["plPL"] == "Tarcza"
+    assert "plPL" not in table.entry(1)
+    combined = StringTable.from_entries(ENTRIES[:1])
+    combined.extend(StringTable.from_entries(ENTRIES[1:]))
+    assert list(combined.iter_entries()) == ENTRIES
+
+NULL_KEYS = [
+    {"id": None, "Key": "a", "enUS": "Sword"},
+    {"Key": "b", "enUS": "Shield"},
+    {"id": 3, "Key": None, "enUS": "Helm"},
+    {"id": 4, "enUS": "Boots"},
+]
+
+def test_null_id_and_key_kept_apart_from_missing():
+    table = StringTable.from_entries(NULL_KEYS)
+    assert list(table.iter_entries()) == NULL_KEYS
+    assert list(StringTable.from_state(table.to_state()).iter_entries()) == NULL_KEYS
+    assert list(table.fork().iter_entries()) == NULL_KEYS
+    combined = StringTable.from_entries(NULL_KEYS[:2])
+    combined.extend(StringTable.from_entries(NULL_KEYS[2:]))
+    assert list(combined.iter_entries()) == NULL_KEYS
+    generic = StringTable.from_entries(NULL_KEYS + [{"id": "x1", "Key": None}])
+    assert list(generic.iter_entries()) == NULL_KEYS + [{"id": "x1", "Key": None}]
+
+def test_full_save_keeps_null_id_and_key(tmp_path):
+    path = tmp_path / "strings.json"
+    path.write_text(json.dumps(NULL_KEYS, indent=2), encoding="utf-8")
+    table, _, signature = read_strings_file(str(path))
+    table.set(1, "enUS", "Buckler")
+    save_edits(str(path), table, None, signature, [(1, "enUS", "Shield", "Buckler")])
+    expected = [dict(e) for e in NULL_KEYS]
+    expected[1]["enUS"] = "Buckler"
+    assert json.loads(path.read_bytes().decode("utf-8-sig")) == expected
@@ -0,0 +1,68 @@
+import csv
+import json
+
+import pytest
+
+from translation_io import export_file, import_file, merge_translations, read_csv
+from string_table import StringTable
+
+ENTRIES = [
+    {"id": 1, "Key": "a", "enUS": "Sword", "plPL": "Miecz"},
+    {"id": 2, "Key": "b", "enUS": "Shield", "plPL": ""},
+    {"id": 3, "Key": "c", "enUS": "ÿc4Helm", "plPL": "ÿc4Hełm"},
+]
+
+def write_json(tmp_path, entries=ENTRIES):
+    path = tmp_path / "strings.json"
+    path.write_text(json.dumps(entries, indent=2, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+def write_csv(tmp_path, header, rows):
+    path = tmp_path / "plPL.csv"
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+def read_json(path):
+    with open(path, "rb") as f:
+        return json.loads(f.read().decode("utf-8-sig"))
+
+def test_duplicate_rows_make_one_edit():
+    table = StringTable.from_entries(ENTRIES)
+    rows = [(2, "b", "AAA"), (2, "b", "BBB"), (None, "a", "Miecz"), (None, "a", "Ostrze")]
+    edits, unmatched = merge_translations(table, "plPL", rows)
+    assert edits == [(1, "plPL", "", "BBB"), (0, "plPL", "Miecz", "Ostrze")]
+    assert unmatched == 0
+
+def test_import_duplicate_rows_writes_valid_json(tmp_path):
+    json_path = write_json(tmp_path)
+    csv_path = write_csv(tmp_path, ["id", "Key", "enUS", "plPL"],
+                         [["2", "b", "Shield", "AAA"], ["2", "b", "Shield", "BBB"], ["9", "zz", "", "X"]])
+    assert import_file(json_path, "plPL", csv_path) == (1, 1)
+    data = read_json(json_path)
+    assert data[1]["plPL"] == "BBB"
+    assert data[0] == ENTRIES[0] and data[2] == ENTRIES[2]
+
+def test_missing_language_column(tmp_path):
+    csv_path = write_csv(tmp_path, ["id", "Key", "enUS", "deDE"], [["1", "a", "Sword", "Schwert"]])
+    with pytest.raises(ValueError):
+        list(read_csv(csv_path, "plPL"))
+
+def test_csv_round_trip(tmp_path):
+    json_path = write_json(tmp_path)
+    csv_path = str(tmp_path / "out.csv")
+    assert export_file(json_path, "plPL", csv_path) == len(ENTRIES)
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id", "Key", "enUS", "plPL"]
+    assert rows[3] == ["3", "c", "ÿc4Helm", "ÿc4Hełm"]
+    rows[2][3] = "Tarcza"
+    rows[1][3] = "Miecz \"długi\""
+    csv_path = write_csv(tmp_path, rows[0], rows[1:])
+    assert import_file(json_path, "plPL", csv_path) == (2, 0)
+    expected = [dict(e) for e in ENTRIES]
+    expected[0]["plPL"] = "Miecz \"długi\""
+    expected[1]["plPL"] = "Tarcza"
+    assert read_json(json_path) == expected
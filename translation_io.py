@@ -0,0 +1,207 @@
+"""
+Eksport kolumny językowej pliku strings do CSV/XLIFF i import z powrotem.
+
+Użycie:
+    python translation_io.py export plik.json plPL wynik.csv|wynik.xliff
+    python translation_io.py import plik.json plPL tłumaczenie.csv|tłumaczenie.xliff
+
+Import łączy wiersze z wpisami po (id, Key) – słownikiem w jednym przejściu –
+i zapisuje plik atomowo (łatki na zmienionych wartościach albo pełny zapis).
+Puste tłumaczenia są pomijane.
+"""
+import os
+import sys
+import csv
+import argparse
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+
+from coverage import BASE_LANG
+from json_patch import PatchError, save_edits
+from document_cache import document_cache
+
+CSV = "csv"
+XLIFF = "xliff"
+
+XLIFF_NS = "urn:oasis:names:tc:xliff:document:1.2"
+
+def format_of(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlf", ".xliff"):
+        return XLIFF
+    if ext == ".csv":
+        return CSV
+    raise ValueError(f"Nieobsługiwany format pliku: {path} (CSV albo XLIFF)")
+
+def _bcp47(lang):
+    # enUS -> en-US
+    return f"{lang[:2]}-{lang[2:]}" if len(lang) == 4 else lang
+
+def _cell(value):
+    return "" if value is None else str(value)
+
+def _parse_id(value):
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+def export_rows(table, lang, base=BASE_LANG):
+    """Wiersze (id, Key, tekst bazowy, tłumaczenie) – po jednym, bez budowania listy."""
+    for row in range(len(table)):
+        yield table.get_id(row), table.get(row, "Key"), table.get(row, base), table.get(row, lang)
+
+def write_csv(rows, out_path, lang, base=BASE_LANG):
+    # utf-8-sig – Excel poprawnie rozpoznaje polskie znaki i ÿ
+    with open(out_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "Key", base, lang])
+        for entry_id, key, source, target in rows:
+            writer.writerow([_cell(entry_id), _cell(key), _cell(source), _cell(target)])
+
+def write_xliff(rows, out_path, lang, original, base=BASE_LANG):
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(f'<xliff version="1.2" xmlns="{XLIFF_NS}">\n')
+        f.write(f'  <file original={quoteattr(original)} datatype="plaintext" '
+                f'source-language="{_bcp47(base)}" target-language="{_bcp47(lang)}">\n')
+        f.write('    <body>\n')
+        for entry_id, key, source, target in rows:
+            unit_id = _cell(entry_id) or _cell(key)
+            f.write(f'      <trans-unit id={quoteattr(unit_id)} resname={quoteattr(_cell(key))} xml:space="preserve">\n')
+            f.write(f'        <source>{escape(_cell(source))}</source>\n')
+            if target is not None:
+                f.write(f'        <target>{escape(_cell(target))}</target>\n')
+            f.write('      </trans-unit>\n')
+        f.write('    </body>\n  </file>\n</xliff>\n')
+
+def export_table(table, lang, out_path, original="", base=BASE_LANG):
+    rows = export_rows(table, lang, base)
+    if format_of(out_path) == XLIFF:
+        write_xliff(rows, out_path, lang, original, base)
+    else:
+        write_csv(rows, out_path, lang, base)
+
+def read_csv(path, lang):
+    """
+    Yields:
+        (id, Key, tekst) z kolumny lang
+
+    Raises:
+        ValueError – brak kolumny Key albo kolumny lang w nagłówku
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or "Key" not in header:
+            raise ValueError("Brak nagłówka z kolumną Key w pliku CSV")
+        key_col = header.index("Key")
+        id_col = header.index("id") if "id" in header else None
+        if lang not in header:
+            raise ValueError(f"Brak kolumny {lang} w pliku CSV")
+        text_col = header.index(lang)
+        for record in reader:
+            if len(record) <= max(key_col, text_col):
+                continue
+            entry_id = _parse_id(record[id_col]) if id_col is not None else None
+            yield entry_id, record[key_col], record[text_col]
+
+def read_xliff(path):
+    """
+    Yields:
+        (id, Key, tekst docelowy) kolejnych trans-unit (iterparse – bez wczytywania całego drzewa)
+    """
+    unit_tag = f"{{{XLIFF_NS}}}trans-unit"
+    target_tag = f"{{{XLIFF_NS}}}target"
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag != unit_tag:
+            continue
+        target = elem.find(target_tag)
+        if target is not None:
+            key = elem.get("resname") or elem.get("id")
+            entry_id = _parse_id(elem.get("id")) if elem.get("resname") else None
+            yield entry_id, key, "".join(target.itertext())
+        elem.clear()
+
+def read_translations(path, lang):
+    if format_of(path) == XLIFF:
+        return read_xliff(path)
+    return read_csv(path, lang)
+
+def merge_translations(table, lang, rows):
+    """
+    Łączy wiersze tłumaczeń z tabelą po (id, Key); bez id – po samym Key.
+    Kilka wierszy dla tego samego wpisu – wygrywa ostatni.
+
+    Returns:
+        (lista zmian (wiersz, język, stara wartość, nowa), liczba niedopasowanych wierszy)
+    """
+    key_rows = None
+    texts = {}  # wiersz tabeli -> tekst, po jednej zmianie na wpis
+    unmatched = 0
+    for entry_id, key, text in rows:
+        if not text:
+            continue
+        row = table.row_of(entry_id, key) if entry_id is not None else None
+        if row is None:
+            if key_rows is None:
+                key_rows = {}
+                for n, k in enumerate(table.keys):
+                    key_rows.setdefault(k, n)
+            row = key_rows.get(key)
+        if row is None:
+            unmatched += 1
+            continue
+        texts[row] = text
+    edits = []
+    for row, text in texts.items():
+        old = table.get(row, lang)
+        if old != text:
+            edits.append((row, lang, old, text))
+    return edits, unmatched
+
+def apply_edits(table, edits):
+    for row, lang, _, new in edits:
+        table.set(row, lang, new)
+
+def import_file(json_path, lang, in_path):
+    """
+    Returns:
+        (liczba zmienionych wpisów, liczba niedopasowanych wierszy)
+    """
+    table, offsets, signature = document_cache.strings(json_path)
+    edits, unmatched = merge_translations(table, lang, read_translations(in_path, lang))
+    apply_edits(table, edits)
+    save_edits(json_path, table, offsets, signature, edits)
+    return len(edits), unmatched
+
+def export_file(json_path, lang, out_path):
+    table, _, _ = document_cache.strings(json_path, copy=False)
+    export_table(table, lang, out_path, os.path.basename(json_path))
+    return len(table)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eksport/import tłumaczeń plików strings D2R (CSV, XLIFF).")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("json", help="plik strings JSON")
+    parser.add_argument("lang", help="kolumna językowa, np. plPL")
+    parser.add_argument("file", help="plik CSV albo XLIFF")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "export":
+            count = export_file(args.json, args.lang, args.file)
+            print(f"Wyeksportowano wpisów: {count}", file=sys.stderr)
+        else:
+            changed, unmatched = import_file(args.json, args.lang, args.file)
+            print(f"Zmienionych wpisów: {changed}, niedopasowanych wierszy: {unmatched}", file=sys.stderr)
+    except (OSError, ValueError, ET.ParseError, PatchError) as e:
+        print(f"Błąd: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
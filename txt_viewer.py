@@ -0,0 +1,260 @@
+"""
+Podgląd plików TXT z data/global/excel (tabele rozdzielone tabulatorami), tylko do odczytu.
+"""
+import os
+
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTableView,
+    QAbstractItemView, QProgressBar
+)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QPoint, QTimer, pyqtSignal
+
+from jobs import Job
+from json_patch import file_signature
+from disk_cache import disk_cache
+
+TXT_ENCODINGS = ("utf-8-sig", "cp1252")
+TXT_DISK_KIND = "txt-table-1"
+
+def read_txt_table(path):
+    """
+    Wczytuje plik TXT D2R.
+
+    Returns:
+        (nagłówek, wiersze) – listy pól rozdzielonych tabulatorami; puste linie pominięte.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    for encoding in TXT_ENCODINGS:
+        try:
+            text = raw.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        text = raw.decode("latin-1")
+    lines = [line.rstrip("\r") for line in text.split("\n")]
+    rows = [line.split("\t") for line in lines if line.strip()]
+    if not rows:
+        return [], []
+    return rows[0], rows[1:]
+
+class TxtTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.header = []
+        self.rows = []
+        self.visible = range(0)
+
+    def set_table(self, header, rows):
+        self.beginResetModel()
+        self.header = header
+        self.rows = rows
+        self.visible = range(len(rows))
+        self.endResetModel()
+
+    def set_visible(self, visible):
+        self.beginResetModel()
+        self.visible = visible
+        self.endResetModel()
+
+    def table_row(self, row):
+        return self.visible[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.header)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        row = self.rows[self.visible[index.row()]]
+        return row[index.column()] if index.column() < len(row) else ""
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.header[section] if section < len(self.header) else ""
+        # Numer linii w pliku (nagłówek to linia 1)
+        return str(self.visible[section] + 2) if section < len(self.visible) else ""
+
+class TxtViewer(QWidget):
+    """
+    Zakładka z plikiem TXT. Ma ten sam interfejs co JsonLangViewer, którego
+    używają zakładki (json_path, view_state, memory_usage, release...).
+    """
+    SEARCH_DELAY_MS = 200
+
+    dirty_changed = pyqtSignal(bool)  # nigdy – podgląd jest tylko do odczytu
+    loaded = pyqtSignal()
+    saved = pyqtSignal(str)  # nigdy
+
+    def __init__(self):
+        super().__init__()
+        self.json_path = None  # nazwa jak w JsonLangViewer – zakładki szukają po niej
+        self._load_task = None
+        self._tasks = set()
+        self._pending_top_row = None
+        self._nbytes = 0
+        self.file_signature = None
+
+        layout = QVBoxLayout(self)
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Szukaj w wierszach...")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.filter_rows)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        search_layout.addWidget(self.search_input)
+        self.count_label = QLabel("")
+        search_layout.addWidget(self.count_label)
+        layout.addLayout(search_layout)
+
+        self.file_label = QLabel("Brak wczytanego pliku")
+        layout.addWidget(self.file_label)
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 0)
+        self.load_progress.hide()
+        layout.addWidget(self.load_progress)
+
+        self.model = TxtTableModel(self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.setWordWrap(False)
+        self.table_view.verticalHeader().setDefaultSectionSize(22)
+        layout.addWidget(self.table_view)
+
+    def load_txt(self, path=None):
+        if path:
+            self.json_path = path
+        path = self.json_path
+        self.shutdown()
+        self.model.set_table([], [])
+        self._nbytes = 0
+        self._pending_top_row = None
+        self.file_label.setText(f"Wczytywanie pliku: {path}")
+        self.load_progress.show()
+
+        def load(task):
+            signature = file_signature(path)
+            return signature, disk_cache.load(path, TXT_DISK_KIND, read_txt_table)
+
+        task = Job(load, self, name="Wczytywanie TXT")
+        task.done.connect(lambda result: self.on_load_finished(task, result))
+        task.failed.connect(lambda error: self.on_load_failed(task, error))
+        task.finished.connect(lambda t=task: self._tasks.discard(t))
+        task.finished.connect(task.deleteLater)
+        self._tasks.add(task)
+        self._load_task = task
+        task.start()
+
+    # Zakładki wczytują pliki przez load_json – TXT tak samo
+    load_json = load_txt
+
+    def on_load_finished(self, task, result):
+        if task is not self._load_task:
+            return
+        self._load_task = None
+        self.file_signature, (header, rows) = result
+        self.model.set_table(header, rows)
+        self._nbytes = sum(60 * len(row) + sum(len(cell) for cell in row) for row in rows)
+        self.load_progress.hide()
+        self.file_label.setText(f"Plik: {os.path.basename(self.json_path)} (tylko do odczytu)")
+        if self.search_input.text():
+            self.filter_rows()
+        else:
+            self._update_count()
+            self._apply_pending_scroll()
+        self.loaded.emit()
+
+    def on_load_failed(self, task, error):
+        if task is not self._load_task:
+            return
+        self._load_task = None
+        self.load_progress.hide()
+        print(f"Błąd: {error}")
+        self.file_label.setText(f"Błąd wczytywania pliku: {self.json_path} ({error})")
+
+    def filter_rows(self):
+        if self.is_loading():
+            return
+        query = self.search_input.text().lower()
+        rows = self.model.rows
+        if query:
+            visible = [i for i, row in enumerate(rows) if query in "\t".join(row).lower()]
+        else:
+            visible = range(len(rows))
+        self.model.set_visible(visible)
+        self._update_count()
+        self._apply_pending_scroll()
+
+    def _update_count(self):
+        self.count_label.setText(f"Wierszy: {self.model.rowCount()} / {len(self.model.rows)}")
+
+    def top_row(self):
+        index = self.table_view.indexAt(QPoint(0, 0))
+        return self.model.table_row(index.row()) if index.isValid() else None
+
+    def view_state(self):
+        return {
+            "path": self.json_path,
+            "query": self.search_input.text(),
+            "top_row": self.top_row() if self._pending_top_row is None else self._pending_top_row,
+        }
+
+    def restore_view_state(self, state):
+        self.search_input.blockSignals(True)
+        self.search_input.setText(state.get("query") or "")
+        self.search_input.blockSignals(False)
+        self.load_txt(state["path"])
+        self._pending_top_row = state.get("top_row")
+
+    def _apply_pending_scroll(self):
+        top_row = self._pending_top_row
+        self._pending_top_row = None
+        if top_row is None:
+            return
+        visible = self.model.visible
+        for position, row in enumerate(visible):
+            if row >= top_row:
+                self.table_view.scrollTo(self.model.index(position, 0), QAbstractItemView.PositionAtTop)
+                break
+
+    def has_unsaved_changes(self):
+        return False
+
+    def reload_if_changed(self):
+        """Jak w JsonLangViewer: wczytuje ponownie plik zmieniony na dysku."""
+        try:
+            signature = file_signature(self.json_path)
+        except OSError:
+            self.file_label.setText(f"Plik usunięty z dysku: {self.json_path}")
+            return False
+        if signature == self.file_signature and not self.is_loading():
+            return False
+        self.restore_view_state(self.view_state())
+        return True
+
+    def is_loading(self):
+        return self._load_task is not None
+
+    def memory_usage(self):
+        return self._nbytes
+
+    def shutdown(self):
+        self.search_timer.stop()
+        for task in list(self._tasks):
+            task.cancel()
+        self._load_task = None
+
+    def release(self):
+        self.shutdown()
+        for task in self._tasks:
+            task.detach()
+        self._tasks.clear()